@@ -0,0 +1,23 @@
+"""add indexes for keyset pagination
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Лента новостей: ORDER BY publication_date DESC, id DESC и курсор по той же паре.
+    # Комментарии и пользователи листаются по id — его покрывает первичный ключ.
+    op.create_index('ix_news_publication_date_id', 'news', ['publication_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_publication_date_id', table_name='news')
@@ -0,0 +1,59 @@
+"""add full-text search over news
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+JSON_STRINGS = "(SELECT group_concat(value, ' ') FROM json_tree({row}.content) WHERE type = 'text')"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Генерируемая колонка пересчитывается при каждом INSERT/UPDATE строки,
+        # GIN-индекс по ней обслуживает search_vector @@ websearch_to_tsquery(...)
+        op.execute("""
+            ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+                setweight(json_to_tsvector('russian', coalesce(content, '{}'::json), '["string"]'), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_news_search_vector ON news USING GIN (search_vector)")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE news_fts USING fts5(title, content)")
+        op.execute(f"""
+            CREATE TRIGGER news_fts_ai AFTER INSERT ON news BEGIN
+                INSERT INTO news_fts(rowid, title, content) VALUES (new.id, new.title, {JSON_STRINGS.format(row='new')});
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER news_fts_ad AFTER DELETE ON news BEGIN
+                DELETE FROM news_fts WHERE rowid = old.id;
+            END
+        """)
+        op.execute(f"""
+            CREATE TRIGGER news_fts_au AFTER UPDATE OF title, content ON news BEGIN
+                DELETE FROM news_fts WHERE rowid = old.id;
+                INSERT INTO news_fts(rowid, title, content) VALUES (new.id, new.title, {JSON_STRINGS.format(row='new')});
+            END
+        """)
+        op.execute(f"INSERT INTO news_fts(rowid, title, content) SELECT id, title, {JSON_STRINGS.format(row='news')} FROM news")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_news_search_vector")
+        op.execute("ALTER TABLE news DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('news_fts_ai', 'news_fts_ad', 'news_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS news_fts")
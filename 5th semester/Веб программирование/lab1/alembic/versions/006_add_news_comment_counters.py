@@ -0,0 +1,32 @@
+"""add comment counters to news
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('news', sa.Column('comments_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('news', sa.Column('last_comment_at', sa.DateTime(), nullable=True))
+    # Дальше счётчики поддерживает приложение при добавлении и удалении комментариев
+    op.execute("""
+        UPDATE news SET
+            comments_count = (SELECT count(*) FROM comments WHERE comments.news_id = news.id),
+            last_comment_at = (SELECT max(publication_date) FROM comments WHERE comments.news_id = news.id)
+    """)
+    op.create_index('ix_comments_news_id_id', 'comments', ['news_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_comments_news_id_id', table_name='comments')
+    op.drop_column('news', 'last_comment_at')
+    op.drop_column('news', 'comments_count')
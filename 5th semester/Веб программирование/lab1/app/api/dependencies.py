@@ -7,6 +7,7 @@ from app.db.session import get_db_session
 from app.repositories.sqlalchemy.user import UserRepository
 from app.repositories.sqlalchemy.news import NewsRepository
 from app.repositories.sqlalchemy.comment import CommentRepository
+from app.repositories.sqlalchemy.unit_of_work import UnitOfWork
 from app.services.users import UserService
 from app.services.news import NewsService
 from app.services.comments import CommentService
@@ -16,27 +17,32 @@ DBSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 
  
 
-def get_user_repo(session: DBSessionDep) -> UserRepository:
-    return UserRepository(session)
+def get_unit_of_work(session: DBSessionDep) -> UnitOfWork:
+    return UnitOfWork(session)
 
-def get_news_repo(session: DBSessionDep) -> NewsRepository:
-    return NewsRepository(session)
+UnitOfWorkDep = Annotated[UnitOfWork, Depends(get_unit_of_work)]
 
-def get_comment_repo(session: DBSessionDep) -> CommentRepository:
-    return CommentRepository(session)
+def get_user_repo(uow: UnitOfWorkDep) -> UserRepository:
+    return uow.users
+
+def get_news_repo(uow: UnitOfWorkDep) -> NewsRepository:
+    return uow.news
+
+def get_comment_repo(uow: UnitOfWorkDep) -> CommentRepository:
+    return uow.comments
 
 UserRepoDep = Annotated[UserRepository, Depends(get_user_repo)]
 NewsRepoDep = Annotated[NewsRepository, Depends(get_news_repo)]
 CommentRepoDep = Annotated[CommentRepository, Depends(get_comment_repo)]
 
-def get_user_service(user_repo: UserRepoDep) -> UserService:
-    return UserService(user_repo)
+def get_user_service(uow: UnitOfWorkDep) -> UserService:
+    return UserService(uow)
 
-def get_news_service(news_repo: NewsRepoDep, user_repo: UserRepoDep) -> NewsService:
-    return NewsService(news_repo, user_repo)
+def get_news_service(uow: UnitOfWorkDep) -> NewsService:
+    return NewsService(uow)
 
-def get_comment_service(comment_repo: CommentRepoDep, user_repo: UserRepoDep, news_repo: NewsRepoDep) -> CommentService:
-    return CommentService(comment_repo, user_repo, news_repo)
+def get_comment_service(uow: UnitOfWorkDep) -> CommentService:
+    return CommentService(uow)
 
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 NewsServiceDep = Annotated[NewsService, Depends(get_news_service)]
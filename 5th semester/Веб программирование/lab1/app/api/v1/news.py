@@ -1,8 +1,10 @@
 import uuid
 from typing import List
-from fastapi import APIRouter, status, Query
+from fastapi import APIRouter, Response, status, Query
+from app.core.config import settings
 from app.schemas.news import NewsCreate, NewsResponse, NewsUpdate
 from app.api.dependencies import NewsServiceDep, NewsRepoDep
+from src.fast_json import dumps
 
 router = APIRouter(prefix="/news", tags=["news"])
 
@@ -12,6 +14,10 @@ async def create_news(news_data: NewsCreate, service: NewsServiceDep):
 
 @router.get("/", response_model=List[NewsResponse])
 async def list_news(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000), news_repo: NewsRepoDep = None):
+    if settings.FAST_JSON_LISTS:
+        # Готовые байты: FastAPI не прогоняет их через response_model
+        rows = await news_repo.get_multi_rows(skip=skip, limit=limit)
+        return Response(content=dumps(rows), media_type="application/json")
     return await news_repo.get_multi(skip=skip, limit=limit)
 
 @router.get("/{news_id}", response_model=NewsResponse)
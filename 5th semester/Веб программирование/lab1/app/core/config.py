@@ -3,6 +3,17 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     DATABASE_URL: str
     SYNC_DATABASE_URL: str | None = None
+    DATABASE_REPLICA_URLS: str = ""  # read replicas, comma-separated
+    REPLICA_HEALTH_INTERVAL: float = 5.0  # seconds between replica checks
+    REPLICA_MAX_LAG: float = 10.0  # replica is skipped when lagging more, seconds
+    # Pool per process: up to workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections in total
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # wait for a free connection, seconds
+    DB_POOL_RECYCLE: int = 1800  # reconnect connections older than this, seconds
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection, 0 behind PgBouncer
+    FAST_JSON_LISTS: bool = False  # list endpoints return pre-serialized JSON, skipping response_model
     REDIS_URL: str = "redis://localhost:6379"
     NEWS_CACHE_TTL: int = 300  # 5 minutes in seconds
     USER_CACHE_TTL: int = 600  # 10 minutes for users
@@ -1,14 +1,75 @@
+from contextvars import ContextVar
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
+from src.db_pool import InstrumentedPool, pool_stats as engine_pool_stats
+from src.replicas import BaseRoutingSession, ReplicaSet
 
 Base = declarative_base()
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def _create_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+engine = _create_engine(settings.DATABASE_URL)
+replica_engines = [_create_engine(url.strip()) for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+# Здоровье реплик проверяет lifespan в app/main.py
+replicas = ReplicaSet(
+    replica_engines, health_interval=settings.REPLICA_HEALTH_INTERVAL, max_lag=settings.REPLICA_MAX_LAG
+)
+
+def pool_stats() -> dict:
+    return {
+        "primary": engine_pool_stats(engine),
+        "replicas": [engine_pool_stats(replica) for replica in replica_engines],
+    }
+
+# Счётчик SQL-запросов текущего HTTP-запроса (см. middleware в app/main.py)
+statement_count: ContextVar[list[int] | None] = ContextVar("statement_count", default=None)
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+for _engine in (engine, *replica_engines):
+    event.listen(_engine.sync_engine, "before_cursor_execute", _count_statement)
+
+class RoutingSession(BaseRoutingSession):
+    """
+    SELECT с опцией replica=True (чтения репозиториев) уходят в реплику, всё остальное —
+    в основную БД; правила маршрутизации общие с src/ (src/replicas.py).
+    """
+
+    def primary_engine(self) -> AsyncEngine:
+        return engine
+
+    def replica_set(self) -> ReplicaSet:
+        return replicas
+
+async_session_maker = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
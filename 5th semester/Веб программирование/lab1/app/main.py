@@ -1,17 +1,52 @@
+import asyncio
+import contextlib
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from .api.router import api_router
+from .db.session import engine, pool_stats, replicas, statement_count
 
 # Настройка логирования
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="News CRUD API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    health_checks = asyncio.create_task(replicas.run_health_checks()) if replicas.engines else None
+    yield
+    if health_checks:
+        health_checks.cancel()
+        # Проверка могла держать соединение реплики: дожидаемся отмены до dispose()
+        with contextlib.suppress(asyncio.CancelledError):
+            await health_checks
+    await engine.dispose()
+    await replicas.dispose()
+
+app = FastAPI(title="News CRUD API", lifespan=lifespan)
+
+@app.middleware("http")
+async def count_sql_statements(request: Request, call_next):
+    # Список, а не int: зависимости FastAPI выполняются в копиях контекста,
+    # изменения внутри общего объекта видны middleware
+    counter = [0]
+    token = statement_count.set(counter)
+    try:
+        response = await call_next(request)
+    finally:
+        statement_count.reset(token)
+    response.headers["X-SQL-Statements"] = str(counter[0])
+    logger.debug("%s %s: %d SQL statements", request.method, request.url.path, counter[0])
+    return response
 
 @app.get("/")
 async def root():
     return {"status": "ok", "message": "Welcome to News CRUD API"}
 
+@app.get("/metrics")
+async def metrics():
+    return {"db_pool": pool_stats()}
+
 app.include_router(api_router)
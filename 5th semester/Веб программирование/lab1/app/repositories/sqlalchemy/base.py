@@ -1,10 +1,11 @@
 from __future__ import annotations
-from typing import Generic, Sequence, Type, TypeVar
+from typing import Any, Generic, Sequence, Type, TypeVar
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import insert, inspect, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Load
+from sqlalchemy.orm.attributes import set_committed_value
 
 from pydantic import BaseModel
 from app.db.session import Base
@@ -14,46 +15,73 @@ CreateSchemaT = TypeVar("CreateSchemaT", bound=BaseModel)
 UpdateSchemaT = TypeVar("UpdateSchemaT", bound=BaseModel)
 
 class SQLAlchemyRepository(Generic[ModelT, CreateSchemaT, UpdateSchemaT]):
+    """
+    Репозитории не фиксируют транзакцию: запись выполняется в сессии запроса,
+    commit делает сервис через UnitOfWork один раз в конце операции.
+    """
     model: Type[ModelT] = None
     _load_options: Sequence[Load] = ()
+    # Связи, которые нужны в ответе API; при записи их передаёт сервис
+    _relations: Sequence[str] = ()
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    # Чтения помечены replica=True: RoutingSession отправляет их в реплику, если сессия ещё не писала
     async def get_by_id(self, obj_id: uuid.UUID) -> ModelT | None:
-        query = select(self.model).where(self.model.id == obj_id)
+        query = select(self.model).where(self.model.id == obj_id).execution_options(replica=True)
         if self._load_options:
             query = query.options(*self._load_options)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
     async def get_multi(self, skip: int = 0, limit: int = 100) -> list[ModelT]:
-        query = select(self.model).order_by(self.model.id).offset(skip).limit(limit)
+        query = select(self.model).order_by(self.model.id).offset(skip).limit(limit).execution_options(replica=True)
         if self._load_options:
             query = query.options(*self._load_options)
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def create(self, obj_in: CreateSchemaT) -> ModelT:
-        data = obj_in.model_dump()
-        db_obj = self.model(**data)  # type: ignore[arg-type]
-        self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
-        # reload with relations if needed
-        refetched = await self.get_by_id(db_obj.id)
-        return refetched or db_obj
+    async def create(self, obj_in: CreateSchemaT, **related: Any) -> ModelT:
+        """
+        INSERT ... RETURNING: серверные значения (id, даты) приходят в том же запросе.
+        Связанные объекты, которые сервис уже загрузил (author, news), передаются
+        в related и подставляются без повторного SELECT.
+        """
+        stmt = insert(self.model).values(**obj_in.model_dump()).returning(self.model)
+        db_obj = (await self.session.scalars(stmt)).one()
+        await self._populate_relations(db_obj, related)
+        return db_obj
 
     async def update(self, db_obj: ModelT, update_data: UpdateSchemaT) -> ModelT:
+        """
+        UPDATE ... RETURNING по уже загруженному объекту: изменённые и серверные
+        значения возвращаются тем же запросом, загруженные связи остаются на месте.
+        """
         data = update_data.model_dump(exclude_none=True)
-        for field, value in data.items():
-            setattr(db_obj, field, value)
-        self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
-        refetched = await self.get_by_id(db_obj.id)
-        return refetched or db_obj
+        if not data:
+            return db_obj
+        columns = list(self.model.__table__.columns)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**data)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.session.execute(stmt)).one()
+        mapper = inspect(self.model)
+        for column, value in zip(columns, row):
+            set_committed_value(db_obj, mapper.get_property_by_column(column).key, value)
+        return db_obj
 
     async def delete(self, db_obj: ModelT) -> None:
         await self.session.delete(db_obj)
-        await self.session.commit()
+
+    async def _populate_relations(self, db_obj: ModelT, related: dict[str, Any]) -> None:
+        for name, value in related.items():
+            set_committed_value(db_obj, name, value)
+        missing = [name for name in self._relations if name not in related]
+        if missing:
+            # Запасной путь для вызовов без известных связей: один SELECT на недостающие
+            await self.session.refresh(db_obj, attribute_names=missing)
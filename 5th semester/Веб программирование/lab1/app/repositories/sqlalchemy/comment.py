@@ -1,13 +1,27 @@
+import uuid
+
+from sqlalchemy import select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.models.comment import Comment
+from app.models.news import News
+from app.models.user import User
 from app.schemas.comment import CommentCreate, CommentUpdate
 from .base import SQLAlchemyRepository
 
 class CommentRepository(SQLAlchemyRepository[Comment, CommentCreate, CommentUpdate]):
     model = Comment
     _load_options = (joinedload(Comment.author), joinedload(Comment.news))
+    _relations = ("author", "news")
 
     def __init__(self, session: AsyncSession):
         super().__init__(session)
+
+    async def get_author_and_news(self, author_id: uuid.UUID, news_id: uuid.UUID) -> tuple[User, News] | None:
+        """Автор и новость для нового комментария одним запросом; None, если нет хотя бы одного."""
+        # Обе строки ищутся по первичному ключу, декартово произведение — не больше одной строки
+        query = select(User, News).join(News, true()).where(User.id == author_id, News.id == news_id)
+        result = await self.session.execute(query)
+        row = result.first()
+        return (row[0], row[1]) if row else None
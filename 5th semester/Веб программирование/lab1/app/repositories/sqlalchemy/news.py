@@ -1,13 +1,53 @@
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.models.news import News
+from app.models.user import User
 from app.schemas.news import NewsCreate, NewsUpdate
 from .base import SQLAlchemyRepository
 
 class NewsRepository(SQLAlchemyRepository[News, NewsCreate, NewsUpdate]):
     model = News
     _load_options = (joinedload(News.author),)
+    _relations = ("author",)
 
     def __init__(self, session: AsyncSession):
         super().__init__(session)
+
+    async def get_multi_rows(self, skip: int = 0, limit: int = 100) -> list[dict]:
+        """
+        Страница новостей словарями в форме NewsResponse — колонки новости и автора
+        одним JOIN, без ORM-объектов; для быстрого пути списка.
+        """
+        query = (
+            select(
+                News.title, News.content, News.cover_image_url, News.id, News.published_at,
+                User.name, User.email, User.avatar_url, User.id.label("author_id"),
+                User.registered_at, User.is_verified_author,
+            )
+            .join(User, News.author_id == User.id)
+            .order_by(News.id)
+            .offset(skip)
+            .limit(limit)
+            .execution_options(replica=True)
+        )
+        result = await self.session.execute(query)
+        return [
+            {
+                "title": row.title,
+                "content": row.content,
+                "cover_image_url": row.cover_image_url,
+                "id": row.id,
+                "published_at": row.published_at,
+                "author": {
+                    "name": row.name,
+                    "email": row.email,
+                    "avatar_url": row.avatar_url,
+                    "id": row.author_id,
+                    "registered_at": row.registered_at,
+                    "is_verified_author": row.is_verified_author,
+                },
+            }
+            for row in result
+        ]
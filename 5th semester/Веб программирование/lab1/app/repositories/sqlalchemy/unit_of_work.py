@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.replicas import stick_to_primary
+from .comment import CommentRepository
+from .news import NewsRepository
+from .user import UserRepository
+
+class UnitOfWork:
+    """
+    Репозитории одного запроса над общей сессией. Сервис вызывает commit один раз
+    после всех изменений; незафиксированное откатывается при закрытии сессии.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.users = UserRepository(session)
+        self.news = NewsRepository(session)
+        self.comments = CommentRepository(session)
+
+    def use_primary(self) -> None:
+        """Дальнейшие чтения — из основной БД: данные проверяются перед записью."""
+        stick_to_primary(self.session)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
@@ -1,29 +1,37 @@
 import uuid
 from fastapi import HTTPException, status
-from app.repositories.sqlalchemy.comment import CommentRepository
-from app.repositories.sqlalchemy.user import UserRepository
-from app.repositories.sqlalchemy.news import NewsRepository
+from app.repositories.sqlalchemy.unit_of_work import UnitOfWork
 from app.schemas.comment import CommentCreate, CommentUpdate
 from app.models.comment import Comment
 from .base import BaseService
 
 class CommentService(BaseService):
-    def __init__(self, comment_repo: CommentRepository, user_repo: UserRepository, news_repo: NewsRepository):
-        super().__init__(comment_repo)
-        self.user_repo = user_repo
-        self.news_repo = news_repo
+    def __init__(self, uow: UnitOfWork):
+        super().__init__(uow.comments)
+        self.uow = uow
 
     async def create_comment(self, comment_data: CommentCreate) -> Comment:
-        if not await self.user_repo.get_by_id(comment_data.author_id):
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment author not found")
-        if not await self.news_repo.get_by_id(comment_data.news_id):
+        self.uow.use_primary()
+        found = await self.repository.get_author_and_news(comment_data.author_id, comment_data.news_id)
+        if not found:
+            # Какой из двух нет — выясняем только на пути ошибки
+            if not await self.uow.users.get_by_id(comment_data.author_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment author not found")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="News for commenting not found")
-        return await self.repository.create(comment_data)
+        author, news = found
+        comment = await self.repository.create(comment_data, author=author, news=news)
+        await self.uow.commit()
+        return comment
 
     async def update_comment(self, comment_id: uuid.UUID, comment_data: CommentUpdate) -> Comment:
+        self.uow.use_primary()
         comment_to_update = await self.get_by_id(comment_id)
-        return await self.repository.update(db_obj=comment_to_update, update_data=comment_data)
+        comment = await self.repository.update(db_obj=comment_to_update, update_data=comment_data)
+        await self.uow.commit()
+        return comment
 
     async def delete_comment(self, comment_id: uuid.UUID) -> None:
+        self.uow.use_primary()
         comment_to_delete = await self.get_by_id(comment_id)
         await self.repository.delete(db_obj=comment_to_delete)
+        await self.uow.commit()
@@ -1,18 +1,18 @@
 import uuid
 from fastapi import HTTPException, status
-from app.repositories.sqlalchemy.news import NewsRepository
-from app.repositories.sqlalchemy.user import UserRepository
+from app.repositories.sqlalchemy.unit_of_work import UnitOfWork
 from app.schemas.news import NewsCreate, NewsUpdate
 from app.models.news import News
 from .base import BaseService
 
 class NewsService(BaseService):
-    def __init__(self, news_repo: NewsRepository, user_repo: UserRepository):
-        super().__init__(news_repo)
-        self.user_repo = user_repo
+    def __init__(self, uow: UnitOfWork):
+        super().__init__(uow.news)
+        self.uow = uow
 
     async def create_news(self, news_data: NewsCreate) -> News:
-        author = await self.user_repo.get_by_id(news_data.author_id)
+        self.uow.use_primary()
+        author = await self.uow.users.get_by_id(news_data.author_id)
         if not author:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Author not found")
         if not author.is_verified_author:
@@ -20,13 +20,19 @@ class NewsService(BaseService):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="The user is not verified as an author and cannot post news",
             )
-        news = await self.repository.create(news_data)
+        news = await self.repository.create(news_data, author=author)
+        await self.uow.commit()
         return news
 
     async def update_news(self, news_id: uuid.UUID, news_data: NewsUpdate) -> News:
+        self.uow.use_primary()
         news_to_update = await self.get_by_id(news_id)
-        return await self.repository.update(db_obj=news_to_update, update_data=news_data)
+        news = await self.repository.update(db_obj=news_to_update, update_data=news_data)
+        await self.uow.commit()
+        return news
 
     async def delete_news(self, news_id: uuid.UUID) -> None:
+        self.uow.use_primary()
         news_to_delete = await self.get_by_id(news_id)
         await self.repository.delete(db_obj=news_to_delete)
+        await self.uow.commit()
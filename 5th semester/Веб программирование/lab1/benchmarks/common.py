@@ -0,0 +1,32 @@
+"""
+Общие утилиты для бенчмарков: перцентили и печать сводки.
+"""
+import math
+from typing import Dict, Iterable, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Перцентиль методом ближайшего ранга (samples должны быть отсортированы)."""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(samples)))
+    return samples[rank - 1]
+
+
+def summarize(latencies_ms: Iterable[float]) -> Dict[str, float]:
+    samples = sorted(latencies_ms)
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": samples[-1] if samples else 0.0,
+    }
+
+
+def print_summary(title: str, stats: Dict[str, float]) -> None:
+    print(f"=== {title} ===")
+    print(f"   запросов: {int(stats['count'])}")
+    for key in ("mean", "p50", "p95", "p99", "max"):
+        print(f"   {key:>4}: {stats[key]:.2f} ms")
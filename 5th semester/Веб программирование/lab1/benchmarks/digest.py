@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк еженедельного дайджеста: сколько пользователей в секунду проходит рассылка.
+
+Запускает send_weekly_digest в процессе (Celery в eager-режиме: планирование
+диапазонов, подзадачи по NOTIFY_CHUNK_SIZE пользователей и итоговый callback).
+По умолчанию — dry run: пользователи читаются из БД, но дайджест не отправляется
+и отметки идемпотентности не ставятся. С --send выполняется полная рассылка
+(отметки в Redis, записи в logs/notifications.log).
+
+Нужны Redis (REDIS_URL) и БД (DATABASE_URL) с применёнными миграциями.
+Если пользователей меньше --users, недостающие генерируются.
+
+    python -m benchmarks.digest --users 100000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func, select, text
+
+from src.celery_app import celery_app
+from src.database import SessionLocal, engine
+from src.models.user import User
+from src.tasks.notifications import NOTIFY_CHUNK_SIZE, send_weekly_digest
+
+_SEED_SQL = {
+    "postgresql": """
+        INSERT INTO users (name, email, registration_date, is_verified_author, role)
+        SELECT 'bench ' || g, 'bench-' || :tag || '-' || g || '@example.com', now(), false, 'USER'
+        FROM generate_series(1, :rows) AS g
+    """,
+    "sqlite": """
+        INSERT INTO users (name, email, registration_date, is_verified_author, role)
+        WITH RECURSIVE g(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM g WHERE x < :rows)
+        SELECT 'bench ' || x, 'bench-' || :tag || '-' || x || '@example.com', datetime('now'), 0, 'USER'
+        FROM g
+    """,
+}
+
+
+async def _seed(users: int) -> int:
+    async with SessionLocal() as db:
+        existing = await db.scalar(select(func.count()).select_from(User))
+        if existing < users:
+            print(f"наполнение: добавляем {users - existing} пользователей...")
+            await db.execute(text(_SEED_SQL[engine.dialect.name]), {"rows": users - existing, "tag": time.time_ns()})
+            await db.commit()
+    await engine.dispose()
+    return max(users, existing)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000, help="сколько пользователей должно быть в БД")
+    parser.add_argument("--send", action="store_true", help="полная рассылка вместо dry run")
+    args = parser.parse_args()
+
+    total = asyncio.run(_seed(args.users))
+    celery_app.conf.task_always_eager = True
+    started = time.perf_counter()
+    chunks = send_weekly_digest.apply(kwargs={"dry_run": not args.send}).get()
+    elapsed = time.perf_counter() - started
+
+    print(f"=== дайджест ({'рассылка' if args.send else 'dry run'}) ===")
+    print(f"   пользователей: {total}, подзадач: {chunks} по {NOTIFY_CHUNK_SIZE}")
+    print(f"   время: {elapsed:.2f} s")
+    print(f"   пользователей/с: {total / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
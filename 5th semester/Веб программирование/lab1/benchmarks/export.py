@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Пиковая память выгрузки новостей: весь список сразу против потоковой выгрузки.
+
+  list    — SELECT всех новостей в ORM-объекты и сборка NDJSON целиком (как
+            выглядела бы выгрузка через NewsService.list без limit);
+  stream  — NewsService.export + ndjson_stream, как GET /news/export.
+
+Память считается tracemalloc (только Python-объекты). При потоковой выгрузке
+пик определяется --fetch-size и не растёт с размером таблицы. Нужна БД
+(DATABASE_URL); --seed добавляет новости перед замером.
+
+    python -m benchmarks.export --seed 100000 --fetch-size 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from sqlalchemy import func, select
+
+from src.database import SessionLocal
+from src.models.news import News
+from src.models.user import User
+from src.services.news_service import NewsService, _news_payload
+from src.streaming import ndjson_stream
+
+
+async def seed(count: int) -> None:
+    async with SessionLocal() as db:
+        author = User(name="Export Bench", email=f"export-bench-{time.time_ns()}@example.com")
+        db.add(author)
+        await db.flush()
+        for start in range(0, count, 5000):
+            db.add_all(
+                News(title=f"News {i}", content={"text": "x" * 500}, author_id=author.id)
+                for i in range(start, min(start + 5000, count))
+            )
+            await db.flush()
+        await db.commit()
+
+
+async def export_list() -> int:
+    async with SessionLocal() as db:
+        items = (await db.execute(select(News).order_by(News.id))).scalars().all()
+        body = "".join(json.dumps(_news_payload(n), default=str) + "\n" for n in items).encode()
+        return len(body)
+
+
+async def export_stream(fetch_size: int) -> int:
+    async with SessionLocal() as db:
+        size = 0
+        async for chunk in ndjson_stream(NewsService(db, None).export(fetch_size)):
+            size += len(chunk)
+        return size
+
+
+async def run(seed_count: int, fetch_size: int) -> None:
+    if seed_count:
+        await seed(seed_count)
+    async with SessionLocal() as db:
+        total = await db.scalar(select(func.count()).select_from(News))
+    print(f"новостей: {total}, fetch_size: {fetch_size}")
+
+    for title, export in (("list", export_list), ("stream", lambda: export_stream(fetch_size))):
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = await export()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"=== {title} ===")
+        print(f"   выгружено: {size / 2**20:.1f} MiB за {elapsed:.2f} s, пик памяти: {peak / 2**20:.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="сколько новостей добавить перед замером")
+    parser.add_argument("--fetch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.seed, args.fetch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Стоимость проверки access-токена на запрос, мкс CPU.
+
+  jose    — python-jose: разбор JSON и проверка HMAC на каждый запрос (как раньше);
+  pyjwt   — PyJWT, если установлен (JWT_BACKEND=pyjwt);
+  cached  — AuthService.decode_access_token: повторный токен берётся из кэша
+            проверенных claims (sha256 токена + словарь в памяти).
+
+Для каждого варианта печатается доля одного ядра CPU, которую проверка токенов
+занимает при --rps запросах в секунду, и экономия относительно jose.
+
+    python -m benchmarks.jwt_decode --iterations 50000 --rps 5000
+"""
+import argparse
+import time
+from typing import Callable
+
+from jose import jwt
+
+from src.services.auth_service import ALGORITHM, SECRET_KEY, AuthService, pyjwt
+
+
+def measure_us(fn: Callable[[], object], iterations: int) -> float:
+    fn()  # прогрев
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--rps", type=int, default=5000, help="запросов в секунду для пересчёта в долю CPU")
+    args = parser.parse_args()
+
+    token = AuthService.create_access_token({"sub": "1"})
+    variants = {"jose": lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])}
+    if pyjwt is not None:
+        variants["pyjwt"] = lambda: pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    else:
+        print("PyJWT не установлен — вариант pyjwt пропущен (pip install PyJWT)")
+    variants["cached"] = lambda: AuthService.decode_access_token(token)
+
+    baseline = None
+    for title, fn in variants.items():
+        us = measure_us(fn, args.iterations)
+        baseline = baseline or us
+        cpu = us * args.rps / 1e6 * 100
+        print(f"=== {title} ===")
+        print(f"   {us:.1f} мкс/запрос, при {args.rps} RPS: {cpu:.1f}% ядра, "
+              f"экономия {baseline - us:.1f} мкс/запрос ({(baseline - us) * args.rps / 1e6 * 100:.1f}% ядра)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Задержка GET /news/ во время шторма логинов.
+
+Сначала замеряет /news/ без фоновой нагрузки, затем — пока --logins клиентов
+непрерывно вызывают POST /auth/login (Argon2 на каждый запрос). Если хэширование
+блокирует event loop, p99 /news/ во время шторма вырастает на порядки.
+
+Сервер должен быть запущен (uvicorn main:app). Пользователь для логина создаётся
+через /auth/register, если его ещё нет.
+
+    python -m benchmarks.login_storm --logins 50 --clients 20 --duration 10
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.common import print_summary, summarize
+
+
+async def _reader(http: httpx.AsyncClient, deadline: float, latencies: List[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await http.get("/news/", params={"limit": 10})
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def _login(http: httpx.AsyncClient, deadline: float, credentials: dict, statuses: List[int]) -> None:
+    while time.perf_counter() < deadline:
+        response = await http.post("/auth/login", json=credentials)
+        statuses.append(response.status_code)
+
+
+async def _measure(http: httpx.AsyncClient, clients: int, logins: int, duration: float, credentials: dict) -> None:
+    latencies: List[float] = []
+    statuses: List[int] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(_reader(http, deadline, latencies) for _ in range(clients)),
+        *(_login(http, deadline, credentials, statuses) for _ in range(logins)),
+    )
+    title = f"GET /news/ при {logins} параллельных логинах" if logins else "GET /news/ без нагрузки"
+    print_summary(title, summarize(latencies))
+    if logins:
+        print(f"   логинов: {len(statuses)} ({len(statuses) / duration:.0f}/s), "
+              f"200: {statuses.count(200)}, 503: {statuses.count(503)}")
+
+
+async def run(base_url: str, clients: int, logins: int, duration: float) -> None:
+    credentials = {"email": "login-storm@example.com", "password": "login-storm-password"}
+    limits = httpx.Limits(max_connections=clients + logins + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as http:
+        await http.post("/auth/register", json={"name": "Login Storm", **credentials})
+        await _measure(http, clients, 0, duration, credentials)
+        await _measure(http, clients, logins, duration, credentials)
+        metrics = (await http.get("/metrics")).json()
+        print("password_hasher:", metrics.get("password_hasher"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=20, help="клиентов, читающих /news/")
+    parser.add_argument("--logins", type=int, default=50, help="клиентов, непрерывно логинящихся")
+    parser.add_argument("--duration", type=float, default=10.0, help="длительность каждого замера, сек")
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.clients, args.logins, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк задержки GET /news/{id} под конкурентной нагрузкой.
+
+Сервер должен быть запущен (uvicorn main:app), Redis и БД — доступны.
+Для сравнения "до/после" запустите скрипт на двух ревизиях и сравните p99:
+
+    python -m benchmarks.news_latency --clients 500 --requests 20 --news-id 1
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.common import print_summary, summarize
+
+
+async def _client(http: httpx.AsyncClient, url: str, requests: int, latencies: List[float], errors: List[int]) -> None:
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            response = await http.get(url)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run(base_url: str, news_id: int, clients: int, requests: int) -> None:
+    url = f"{base_url}/news/{news_id}"
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as http:
+        # Прогрев: первый запрос кладёт новость в кэш
+        await http.get(url)
+        started = time.perf_counter()
+        await asyncio.gather(*(_client(http, url, requests, latencies, errors) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    print_summary(f"GET /news/{news_id}, клиентов: {clients}", summarize(latencies))
+    print(f"   RPS: {len(latencies) / elapsed:.0f}")
+    print(f"   ошибок: {len(errors)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--news-id", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20, help="запросов на одного клиента")
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.news_id, args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк пагинации ленты новостей: OFFSET против курсора на большой таблице.
+
+Для каждой глубины страницы замеряет время запроса OFFSET/LIMIT (как в
+NewsService.list) и keyset-запроса NewsService.list_after с курсором, указывающим
+на ту же позицию. Время OFFSET растёт с глубиной, время курсора — нет.
+
+Нужна БД (DATABASE_URL) с применёнными миграциями (индекс ix_news_publication_date_id).
+Если в таблице news меньше --rows строк, недостающие генерируются одним
+INSERT ... SELECT (на 10M строк это занимает несколько минут).
+
+    python -m benchmarks.pagination --rows 10000000 --limit 20
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from sqlalchemy import func, select, text
+
+from benchmarks.common import print_summary, summarize
+from src.database import SessionLocal, engine
+from src.models.news import News
+from src.models.user import User
+from src.services.news_service import NewsService, _ordered, news_cursor
+
+_SEED_SQL = {
+    "postgresql": """
+        INSERT INTO news (title, content, publication_date, author_id)
+        SELECT 'News ' || g, '{"text": "bench"}'::json, now() - g * interval '1 second', :author_id
+        FROM generate_series(1, :rows) AS g
+    """,
+    "sqlite": """
+        INSERT INTO news (title, content, publication_date, author_id)
+        WITH RECURSIVE g(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM g WHERE x < :rows)
+        SELECT 'News ' || x, '{"text": "bench"}', datetime('now', '-' || x || ' seconds'), :author_id
+        FROM g
+    """,
+}
+
+
+async def _seed(rows: int) -> int:
+    async with SessionLocal() as db:
+        existing = await db.scalar(select(func.count()).select_from(News))
+        missing = rows - existing
+        if missing > 0:
+            print(f"наполнение: добавляем {missing} новостей...")
+            author = User(name="Bench Author", email=f"bench-{time.time_ns()}@example.com", is_verified_author=True)
+            db.add(author)
+            await db.flush()
+            await db.execute(text(_SEED_SQL[engine.dialect.name]), {"rows": missing, "author_id": author.id})
+            await db.commit()
+        return max(rows, existing)
+
+
+async def _timed(samples: List[float], query) -> list:
+    started = time.perf_counter()
+    result = await query
+    samples.append((time.perf_counter() - started) * 1000)
+    return result
+
+
+async def run(rows: int, limit: int, repeats: int) -> None:
+    total = await _seed(rows)
+    depths = [d for d in (0, 1_000, 100_000, 1_000_000, total // 2, total - limit) if 0 <= d <= total - limit]
+    try:
+        async with SessionLocal() as db:
+            service = NewsService(db, cache=None)  # list_after не обращается к кэшу
+            for depth in sorted(set(depths)):
+                # Курсор на ту же позицию: последняя строка предыдущей страницы
+                cursor = None
+                if depth:
+                    previous = await db.execute(_ordered().offset(depth - limit).limit(limit))
+                    cursor = news_cursor([{"publication_date": n.publication_date, "id": n.id} for n in previous.scalars()], limit)
+
+                offset_ms: List[float] = []
+                keyset_ms: List[float] = []
+                for _ in range(repeats):
+                    await _timed(offset_ms, db.execute(_ordered().offset(depth).limit(limit)))
+                    if cursor:
+                        await _timed(keyset_ms, service.list_after(cursor, limit))
+                    db.expunge_all()
+
+                print_summary(f"OFFSET {depth}", summarize(offset_ms))
+                if cursor:
+                    print_summary(f"курсор на позиции {depth}", summarize(keyset_ms))
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="сколько новостей должно быть в таблице")
+    parser.add_argument("--limit", type=int, default=20, help="размер страницы")
+    parser.add_argument("--repeats", type=int, default=20, help="замеров на каждую глубину")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
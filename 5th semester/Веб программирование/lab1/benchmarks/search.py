@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Задержка полнотекстового поиска (NewsService.search, как GET /news/search).
+
+--seed добавляет новости из случайных слов словаря размером --vocabulary; частота
+слова убывает по закону Ципфа, поэтому в запросах есть и редкие, и частые слова.
+Для каждого запроса печатаются p50/p99 первой страницы (--limit). В PostgreSQL
+используется GIN-индекс по tsvector, в SQLite — FTS5. Нужна БД (DATABASE_URL).
+
+    python -m benchmarks.search --seed 1000000 --queries 200
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select
+
+from benchmarks.common import print_summary, summarize
+from src.database import SessionLocal
+from src.models.news import News
+from src.models.user import User
+from src.services.news_service import NewsService
+
+BATCH = 5000
+
+
+def word(rank: int) -> str:
+    return f"слово{rank}"
+
+
+def zipf_rank(vocabulary: int) -> int:
+    return min(vocabulary, int(random.paretovariate(1.0)))
+
+
+async def seed(count: int, vocabulary: int) -> None:
+    async with SessionLocal() as db:
+        author = User(name="Search Bench", email=f"search-bench-{time.time_ns()}@example.com")
+        db.add(author)
+        await db.flush()
+        for start in range(0, count, BATCH):
+            db.add_all(
+                News(
+                    title=" ".join(word(zipf_rank(vocabulary)) for _ in range(6)),
+                    content={"text": " ".join(word(zipf_rank(vocabulary)) for _ in range(80))},
+                    author_id=author.id,
+                )
+                for _ in range(start, min(start + BATCH, count))
+            )
+            await db.flush()
+        await db.commit()
+
+
+async def run(seed_count: int, vocabulary: int, queries: int, limit: int) -> None:
+    if seed_count:
+        started = time.perf_counter()
+        await seed(seed_count, vocabulary)
+        print(f"добавлено {seed_count} новостей за {time.perf_counter() - started:.0f} s")
+    async with SessionLocal() as db:
+        total = await db.scalar(select(func.count()).select_from(News))
+        print(f"новостей: {total}")
+        service = NewsService(db, None)
+        for title, q in (("частое слово", word(1)), ("среднее слово", word(50)), ("редкое слово", word(vocabulary // 2)),
+                         ("два слова", f"{word(2)} {word(20)}")):
+            latencies = []
+            for _ in range(queries):
+                started = time.perf_counter()
+                await service.search(q, limit)
+                latencies.append((time.perf_counter() - started) * 1000)
+            print_summary(f"{title}: «{q}»", summarize(latencies))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="сколько новостей добавить перед замером")
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=100, help="повторов каждого запроса")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.seed, args.vocabulary, args.queries, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Стоимость сериализации одной страницы GET /news/ (--page новостей), мкс CPU.
+
+  response_model      — как раньше: страница из кэша разбирается json.loads,
+                        FastAPI проверяет её по List[NewsResponse] (serialize_response)
+                        и JSONResponse снова кодирует в JSON;
+  fast: промах        — FAST_JSON_LISTS, страницы нет в кэше: строки сериализуются
+                        один раз (orjson);
+  fast: попадание L2  — значение из Redis: json.loads разбирает только короткий
+                        заголовок, тело после него уже готовые байты ответа;
+  fast: попадание L1  — страница уже в памяти процесса, байты отдаются как есть.
+
+БД и Redis не нужны: замеряется только CPU на сериализацию.
+
+    python -m benchmarks.serialization --page 100 --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src import fast_json
+from src.schemas.news import NewsResponse
+from src.services.cache import _pack_raw, _unpack_raw
+
+
+def make_page(size: int) -> List[dict]:
+    published = datetime(2025, 1, 1, 12, 0, 0, 123456)
+    return [
+        {
+            "id": 100000 - i,
+            "title": f"Новость номер {i}",
+            "content": {"text": "Текст новости. " * 30, "tags": ["python", "fastapi"], "views": i * 7},
+            "publication_date": published - timedelta(minutes=i),
+            "author_id": i % 50 + 1,
+            "cover": f"https://cdn.example.com/{i}.jpg" if i % 3 else None,
+        }
+        for i in range(size)
+    ]
+
+
+async def measure_us(fn: Callable, iterations: int) -> float:
+    await fn()  # прогрев
+    started = time.process_time()
+    for _ in range(iterations):
+        await fn()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+async def run(page_size: int, iterations: int) -> None:
+    items = make_page(page_size)
+    field = create_response_field(name="Response_Get_All_News", type_=List[NewsResponse])
+    # Обёртки get_or_load в Redis: обычная страница и страница быстрого пути
+    cached_list = json.dumps({"v": items, "d": 0.01, "e": time.time()}, default=str)
+    body = fast_json.dumps(items)
+    cached_json = _pack_raw({"v": {"body": body, "next_cursor": "x"}, "d": 0.01, "e": time.time()})
+    local_json = _unpack_raw(cached_json)
+
+    async def response_model() -> bytes:
+        content = await serialize_response(field=field, response_content=json.loads(cached_list)["v"])
+        return JSONResponse(content).body
+
+    async def fast_miss() -> bytes:
+        return fast_json.dumps(items)
+
+    async def fast_l2() -> bytes:
+        return _unpack_raw(cached_json)["v"]["body"]
+
+    async def fast_l1() -> bytes:
+        return local_json["v"]["body"]
+
+    # Быстрый путь отдаёт те же данные, что и response_model
+    assert json.loads(await fast_miss()) == json.loads(await response_model())
+    assert await fast_l2() == body
+
+    print(f"страница: {page_size} новостей, {len(body) / 1024:.0f} KiB JSON")
+    baseline = None
+    for title, fn in (("response_model", response_model), ("fast: промах", fast_miss),
+                      ("fast: попадание L2", fast_l2), ("fast: попадание L1", fast_l1)):
+        us = await measure_us(fn, iterations)
+        baseline = baseline or us
+        print(f"=== {title} ===")
+        print(f"   {us:.1f} мкс на страницу, в {baseline / us:.1f} раза быстрее response_model")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", type=int, default=100, help="новостей на странице")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.page, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
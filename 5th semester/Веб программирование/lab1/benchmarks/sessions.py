@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Список сессий пользователя при большом числе ключей в Redis.
+
+  scan   — как раньше: SCAN MATCH session:{user_id}:* по всему keyspace + MGET;
+  index  — AsyncCacheService.list_sessions: хэш и sorted set пользователя.
+
+Сначала Redis заполняется --keys посторонними ключами (bench:filler:*), затем у
+одного пользователя создаётся --sessions сессий в обоих форматах. Нужен
+отдельный Redis (REDIS_URL): 10M ключей занимают около 1 ГБ памяти.
+
+    python -m benchmarks.sessions --keys 10000000 --sessions 5
+    python -m benchmarks.sessions --cleanup
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from redis import asyncio as aioredis
+
+from benchmarks.common import print_summary, summarize
+from src.services.cache import REDIS_URL, AsyncCacheService
+
+USER_ID = 999999999
+FILLER_PREFIX = "bench:filler:"
+BATCH = 10000
+
+
+async def populate(client: aioredis.Redis, keys: int) -> None:
+    existing = await client.dbsize()
+    if existing >= keys:
+        print(f"в Redis уже {existing} ключей, заполнение пропущено")
+        return
+    started = time.perf_counter()
+    for offset in range(existing, keys, BATCH):
+        async with client.pipeline(transaction=False) as pipe:
+            for i in range(offset, min(offset + BATCH, keys)):
+                pipe.set(f"{FILLER_PREFIX}{i}", "x")
+            await pipe.execute()
+    print(f"заполнено {keys - existing} ключей за {time.perf_counter() - started:.0f} s")
+
+
+async def scan_sessions(client: aioredis.Redis, user_id: int) -> list:
+    keys = [key async for key in client.scan_iter(match=f"session:{user_id}:*", count=1000)]
+    return await client.mget(keys) if keys else []
+
+
+async def run(keys: int, sessions: int, repeat: int) -> None:
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    cache = AsyncCacheService(client)
+    await populate(client, keys)
+
+    data = {"user_id": USER_ID, "user_agent": "bench", "created_at": "2024-01-01T00:00:00"}
+    for i in range(sessions):
+        await client.set(f"session:{USER_ID}:{i:016d}", json.dumps(data))
+        await cache.set_session(USER_ID, f"{i:032d}", data)
+    print(f"ключей в Redis: {await client.dbsize()}, сессий пользователя: {sessions}")
+
+    for title, list_sessions in (
+        ("scan", lambda: scan_sessions(client, USER_ID)),
+        ("index", lambda: cache.list_sessions(USER_ID)),
+    ):
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = await list_sessions()
+            latencies.append((time.perf_counter() - started) * 1000)
+        assert len(found) == sessions, (title, len(found))
+        print_summary(f"GET /auth/sessions ({title})", summarize(latencies))
+
+    await client.delete(*(f"session:{USER_ID}:{i:016d}" for i in range(sessions)))
+    await cache.delete_sessions_for_user(USER_ID)
+    await client.aclose()
+
+
+async def cleanup() -> None:
+    client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
+    deleted = 0
+    async for key in client.scan_iter(match=f"{FILLER_PREFIX}*", count=BATCH):
+        deleted += await client.unlink(key)
+    print(f"удалено {deleted} ключей")
+    await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=10_000_000, help="посторонних ключей в Redis")
+    parser.add_argument("--sessions", type=int, default=5, help="сессий у пользователя")
+    parser.add_argument("--repeat", type=int, default=20, help="замеров на вариант")
+    parser.add_argument("--cleanup", action="store_true", help="удалить ключи бенчмарка и выйти")
+    args = parser.parse_args()
+    if args.cleanup:
+        asyncio.run(cleanup())
+    else:
+        asyncio.run(run(args.keys, args.sessions, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест cache stampede: что происходит с БД в момент истечения TTL.
+
+Поднимает несколько "воркеров" (отдельные AsyncCacheService со своими пулами
+к одному Redis), сбрасывает страницу списка новостей, как будто истёк TTL,
+и одновременно отправляет --concurrency запросов NewsService.list.
+Считает, сколько SQL-запросов к таблице news дошло до БД:
+
+  naive      — старое поведение: get из кэша, при промахе запрос в БД и set;
+  protected  — get_or_load: single-flight в воркере + блокировка в Redis.
+
+Нужны Redis (REDIS_URL) и БД (DATABASE_URL); если таблица news пуста,
+скрипт создаст схему и наполнит её тестовыми данными.
+
+    python -m benchmarks.stampede --concurrency 2000 --workers 4
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from redis import asyncio as aioredis
+from sqlalchemy import event, func, select
+
+from benchmarks.common import print_summary, summarize
+from src.database import Base, SessionLocal, engine
+from src.models.news import News
+from src.models.user import User
+from src.services.cache import NEWS_CACHE_TTL, AsyncCacheService, _create_pool
+from src.services.news_service import NewsService, _news_payload
+
+
+class QueryCounter:
+    """Считает SQL-запросы к таблице news через события движка."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if "FROM news" in statement:
+            self.count += 1
+
+
+async def _seed(rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as db:
+        if await db.scalar(select(func.count()).select_from(News)):
+            return
+        author = User(name="Bench Author", email="bench-author@example.com", is_verified_author=True)
+        db.add(author)
+        await db.flush()
+        db.add_all(News(title=f"News {i}", content={"text": "x" * 200}, author_id=author.id) for i in range(rows))
+        await db.commit()
+
+
+async def _naive_list(cache: AsyncCacheService, skip: int, limit: int) -> list:
+    key = await cache.news_list_key(skip, limit)
+    cached = await cache.get(key)
+    if cached is not None:
+        return cached
+    async with SessionLocal() as db:
+        result = await db.execute(select(News).offset(skip).limit(limit))
+        payload = [_news_payload(n) for n in result.scalars().all()]
+    await cache.set(key, payload, NEWS_CACHE_TTL)
+    return payload
+
+
+async def _protected_list(cache: AsyncCacheService, skip: int, limit: int) -> list:
+    async with SessionLocal() as db:
+        return await NewsService(db, cache).list(skip, limit)
+
+
+async def _run_mode(mode: str, workers: List[AsyncCacheService], concurrency: int, skip: int, limit: int) -> None:
+    handler = _naive_list if mode == "naive" else _protected_list
+    await workers[0].client.delete(await workers[0].news_list_key(skip, limit))
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        started = time.perf_counter()
+        await handler(workers[i % len(workers)], skip, limit)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    try:
+        await asyncio.gather(*(one(i) for i in range(concurrency)))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+    print_summary(f"{mode}: {concurrency} запросов после истечения TTL, воркеров: {len(workers)}", summarize(latencies))
+    print(f"   SQL-запросов к news: {counter.count}")
+
+
+async def run(concurrency: int, workers_count: int, rows: int, skip: int, limit: int) -> None:
+    await _seed(rows)
+    workers = [AsyncCacheService(aioredis.Redis(connection_pool=_create_pool())) for _ in range(workers_count)]
+    try:
+        for mode in ("naive", "protected"):
+            await _run_mode(mode, workers, concurrency, skip, limit)
+        stats = [w.stats()["stampede"] for w in workers]
+        print("stampede-счётчики (protected):", {k: sum(s[k] for s in stats) for k in stats[0]})
+    finally:
+        for w in workers:
+            await w.client.aclose()
+            await w.client.connection_pool.disconnect()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=2000, help="одновременных запросов в момент промаха")
+    parser.add_argument("--workers", type=int, default=4, help="сколько воркеров приложения имитировать")
+    parser.add_argument("--rows", type=int, default=1000, help="новостей при наполнении пустой БД")
+    parser.add_argument("--skip", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.workers, args.rows, args.skip, args.limit))
+
+
+if __name__ == "__main__":
+    main()
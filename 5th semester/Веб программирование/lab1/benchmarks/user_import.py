@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Скорость массового импорта пользователей (UserBulkService), строк в секунду.
+
+NDJSON генерируется на лету и подаётся в сервис кусками, как тело запроса
+POST /users/import. По умолчанию строки содержат готовый password_hash (перенос
+из другой системы); --plain-passwords — открытые пароли, которые хэшируются
+Argon2 в пуле процессов. Печатается оценка времени для 1M пользователей.
+Нужна БД (DATABASE_URL), в PostgreSQL используется COPY.
+
+    python -m benchmarks.user_import --users 100000
+    python -m benchmarks.user_import --users 2000 --plain-passwords
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import AsyncIterator
+
+from src.database import SessionLocal
+from src.services.auth_service import pwd_context
+from src.services.user_bulk_service import UserBulkService, close_hash_pool
+
+CHUNK_LINES = 1000
+
+
+async def generate(users: int, plain_passwords: bool) -> AsyncIterator[bytes]:
+    run = uuid.uuid4().hex[:8]
+    password_hash = pwd_context.hash("benchmark")
+    for start in range(0, users, CHUNK_LINES):
+        lines = []
+        for i in range(start, min(start + CHUNK_LINES, users)):
+            user = {"name": f"User {i}", "email": f"bench-{run}-{i}@example.com"}
+            if plain_passwords:
+                user["password"] = f"password-{i}"
+            else:
+                user["password_hash"] = password_hash
+            lines.append(json.dumps(user))
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def run(users: int, plain_passwords: bool) -> None:
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        report = await UserBulkService(db).import_users(generate(users, plain_passwords), "ndjson")
+        elapsed = time.perf_counter() - started
+    close_hash_pool()
+    rate = report["imported"] / elapsed if elapsed else 0.0
+    print(f"=== импорт ({'открытые пароли' if plain_passwords else 'готовые хэши'}) ===")
+    print(f"   импортировано: {report['imported']}, пропущено: {report['skipped']}, отклонено: {report['rejected']}")
+    print(f"   время: {elapsed:.2f} s, строк/с: {rate:.0f}")
+    if rate:
+        print(f"   оценка для 1M пользователей: {1_000_000 / rate / 60:.1f} мин")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--plain-passwords", action="store_true", help="хэшировать пароли при импорте")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.plain_passwords))
+
+
+if __name__ == "__main__":
+    main()
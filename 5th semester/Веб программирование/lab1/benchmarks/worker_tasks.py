@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк накладных расходов Celery-задачи с обращением к БД (SELECT 1), задач в секунду.
+
+  per-task  — как раньше: asyncio.run() на задачу, новый event loop и движок
+              (свой пул соединений), закрываемые после каждой задачи;
+  runtime   — src.tasks.runtime: один event loop и пул на процесс воркера.
+
+Задачи выполняются в текущем процессе подряд, как их выполнял бы один процесс воркера.
+Нужна БД (DATABASE_URL).
+
+    python -m benchmarks.worker_tasks --tasks 2000
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database import DATABASE_URL
+from src.tasks import runtime
+
+
+def per_task() -> None:
+    async def _run() -> None:
+        engine = create_async_engine(DATABASE_URL)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+
+def with_runtime() -> None:
+    async def _run() -> None:
+        async with runtime.session() as session:
+            await session.execute(text("SELECT 1"))
+
+    runtime.run(_run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    args = parser.parse_args()
+
+    for title, task in (("per-task", per_task), ("runtime", with_runtime)):
+        task()  # прогрев
+        started = time.perf_counter()
+        for _ in range(args.tasks):
+            task()
+        elapsed = time.perf_counter() - started
+        print(f"=== {title} ===")
+        print(f"   задач: {args.tasks}, время: {elapsed:.2f} s, задач/с: {args.tasks / elapsed:.0f}")
+    runtime.stop()
+
+
+if __name__ == "__main__":
+    main()
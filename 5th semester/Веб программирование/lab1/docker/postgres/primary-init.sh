@@ -0,0 +1,8 @@
+#!/bin/sh
+# Роль для потоковой репликации и доступ к ней из сети docker-compose
+set -e
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<SQL
+CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD}';
+SELECT pg_create_physical_replication_slot('replica1');
+SQL
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,13 @@
+#!/bin/sh
+# Реплика: при пустом каталоге данных снимает базовую копию с primary
+# (pg_basebackup -R пишет standby.signal и primary_conninfo) и запускает hot standby
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_basebackup -h postgres -U replicator -D "$PGDATA" -S replica1 -R -X stream; do
+    echo "waiting for primary..."
+    rm -rf "${PGDATA:?}"/*
+    sleep 2
+  done
+  chmod 0700 "$PGDATA"
+fi
+exec postgres -c hot_standby=on
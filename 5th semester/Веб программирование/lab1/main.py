@@ -1,19 +1,49 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from src.routers import users_router, news_router, comments_router, auth_router
+from src.database import engine, replicas
+from src.routers import users_router, news_router, comments_router, auth_router, system_router
+from src.services.auth_service import password_hasher
+from src.services.cache import close_cache, init_cache
+from src.services.user_bulk_service import close_hash_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Пул соединений Redis живёт столько же, сколько процесс приложения
+    await init_cache()
+    # Проверка реплик для чтения (DATABASE_REPLICA_URLS), если они заданы
+    health_checks = asyncio.create_task(replicas.run_health_checks()) if replicas.engines else None
+    yield
+    if health_checks:
+        health_checks.cancel()
+        # Проверка могла держать соединение реплики: дожидаемся отмены до dispose()
+        with contextlib.suppress(asyncio.CancelledError):
+            await health_checks
+    await engine.dispose()
+    await replicas.dispose()
+    await close_cache()
+    password_hasher.close()
+    close_hash_pool()
+
 
 app = FastAPI(
     title="News API",
     description="CRUD API для управления пользователями, новостями и комментариями с авторизацией",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(news_router)
 app.include_router(comments_router)
+app.include_router(system_router)
 
 @app.get("/")
 def root():
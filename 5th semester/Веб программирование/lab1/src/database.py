@@ -1,24 +1,91 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+import logging
 import os
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
 from dotenv import load_dotenv
 
+from src.db_pool import InstrumentedPool, pool_stats
+from src.replicas import BaseRoutingSession, ReplicaSet, on_replica
+from src.metrics import register_collector
+
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./test_news.db")
+logger = logging.getLogger(__name__)
+
+
+def _async_url(url: str) -> str:
+    # Автоматическая адаптация драйвера к async
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+DATABASE_URL = _async_url(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./test_news.db"))
+# Реплики для чтения через запятую; без них все запросы идут в основную БД
+DATABASE_REPLICA_URLS = [_async_url(u.strip()) for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "10"))
+# Пул соединений на процесс: всего к БД до workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) соединений
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # ожидание свободного соединения, сек
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # пересоздавать соединения старше, сек
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Кэш подготовленных запросов asyncpg на соединение; 0 — за PgBouncer в режиме transaction
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
 
-# Автоматическая адаптация драйвера к async
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
-if DATABASE_URL.startswith("sqlite://"):
-    DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+def engine_options(url: str) -> dict:
+    """Параметры create_async_engine: размер пула, recycle, pre-ping и кэш запросов asyncpg."""
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
+    options = {
+        "poolclass": InstrumentedPool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        # statement_cache_size — кэш самого asyncpg, prepared_statement_cache_size — кэш диалекта SQLAlchemy
+        options["connect_args"] = {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
 
-engine = create_async_engine(DATABASE_URL, future=True)
-SessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+engine = create_async_engine(DATABASE_URL, future=True, **engine_options(DATABASE_URL))
+
+replicas = ReplicaSet(
+    [create_async_engine(url, future=True, **engine_options(url)) for url in DATABASE_REPLICA_URLS],
+    health_interval=REPLICA_HEALTH_INTERVAL,
+    max_lag=REPLICA_MAX_LAG,
+)
+register_collector("db_pool", lambda: pool_stats(engine))
+register_collector("db_replicas", lambda: replicas.stats())
+
+
+class RoutingSession(BaseRoutingSession):
+    """Сессия приложения: основная БД — engine, реплики — replicas (см. src/replicas.py)."""
+
+    def primary_engine(self) -> AsyncEngine:
+        return engine
+
+    def replica_set(self) -> ReplicaSet:
+        return replicas
+
+
+SessionLocal = async_sessionmaker(
+    autocommit=False, autoflush=False, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
 
 Base = declarative_base()
 
 async def get_db():
     async with SessionLocal() as session:
         yield session
-
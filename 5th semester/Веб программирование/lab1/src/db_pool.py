@@ -0,0 +1,57 @@
+"""
+Пул соединений SQLAlchemy со счётчиками выдачи. Общий для src/database.py и
+слоистого приложения app/ (app/db/session.py): модуль не создаёт движков и не
+читает настройки, параметры пула задаёт каждый потребитель сам.
+"""
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул SQLAlchemy со счётчиками: сколько раз выдавалось соединение, сколько запрос
+    ждал выдачи (свободного соединения, открытия нового и pre-ping) и сколько раз
+    не дождался за pool_timeout.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+def pool_stats(db_engine: AsyncEngine) -> dict:
+    # После dispose() у движка новый пул, поэтому пул берётся при каждом снимке
+    pool = db_engine.pool
+    return pool.stats() if isinstance(pool, InstrumentedPool) else {}
@@ -12,7 +12,8 @@ from src.models.comment import Comment
 from src.models.news import News
 from src.models.user import User, UserRole
 from src.services.auth_service import AuthService
-from src.services.cache import SyncCacheService
+from src.services.cache import AsyncCacheService, get_cache
+from src.services.user_service import cached_user_payload
 
 security = HTTPBearer()
 
@@ -55,26 +56,13 @@ def _context_from_cache(payload: dict) -> UserContext:
     )
 
 
-def _cache_user_safe(user: User) -> dict:
-    return {
-        "id": user.id,
-        "name": user.name,
-        "email": user.email,
-        "role": user.role.value,
-        "is_verified_author": user.is_verified_author,
-        "avatar": user.avatar,
-        "registration_date": user.registration_date.isoformat()
-        if user.registration_date
-        else None,
-    }
-
-
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    cache: AsyncCacheService = Depends(get_cache),
 ) -> UserContext:
     token = credentials.credentials
-    payload = AuthService.decode_token(token)
+    payload = AuthService.decode_access_token(token)
     
     user_id: str = payload.get("sub")
     token_type: str = payload.get("type")
@@ -85,8 +73,7 @@ async def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    cache = SyncCacheService()
-    cached = cache.get_user(int(user_id))
+    cached = await cache.get_user(int(user_id))
     if cached:
         return _context_from_cache(cached)
     
@@ -98,7 +85,7 @@ async def get_current_user(
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    cache.set_user(user.id, _cache_user_safe(user))
+    await cache.set_user(user.id, cached_user_payload(user))
     return _context_from_user(user)
 
 
@@ -176,28 +163,28 @@ async def get_comment_with_permission(
 
 async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    cache: AsyncCacheService = Depends(get_cache),
 ) -> Optional[UserContext]:
     if not credentials:
         return None
     
     try:
         token = credentials.credentials
-        payload = AuthService.decode_token(token)
+        payload = AuthService.decode_access_token(token)
         
         user_id: str = payload.get("sub")
         token_type: str = payload.get("type")
         
         if user_id is None or token_type != "access":
             return None
-        cache = SyncCacheService()
-        cached = cache.get_user(int(user_id))
+        cached = await cache.get_user(int(user_id))
         if cached:
             return _context_from_cache(cached)
         result = await db.execute(select(User).where(User.id == int(user_id)))
         user = result.scalar_one_or_none()
         if user:
-            cache.set_user(user.id, _cache_user_safe(user))
+            await cache.set_user(user.id, cached_user_payload(user))
             return _context_from_user(user)
         return None
     except:
@@ -0,0 +1,30 @@
+"""
+Быстрый путь для горячих списков: ответ отдаётся готовыми JSON-байтами, без
+повторной валидации словарей через response_model. Включается FAST_JSON_LISTS.
+Общий для src/ и слоистого приложения app/.
+
+Сериализует orjson. Даты выводятся в ISO 8601, как у Pydantic (UTC — с суффиксом Z),
+UUID — строкой, поэтому ответ совпадает с обычным.
+"""
+import os
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+
+FAST_JSON_LISTS = os.getenv("FAST_JSON_LISTS", "false").lower() in ("1", "true", "yes")
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _default(value: Any) -> str:
+    # datetime, date и UUID orjson кодирует сам; остальное (Decimal, Enum-подобное) — строкой
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    """Ответ из уже сериализованного JSON: FastAPI не проверяет его по response_model."""
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,15 @@
+"""
+Простейший реестр метрик процесса: модули регистрируют функции-сборщики,
+эндпоинт /metrics отдаёт их снимок в JSON.
+"""
+from typing import Callable, Dict
+
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+
+def register_collector(name: str, collector: Callable[[], dict]) -> None:
+    _collectors[name] = collector
+
+
+def collect() -> Dict[str, dict]:
+    return {name: collector() for name, collector in _collectors.items()}
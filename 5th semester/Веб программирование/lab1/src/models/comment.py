@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, event, func, select, update
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.database import Base
+from src.models.news import News
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Комментарии новости по порядку: WHERE news_id = ? AND id > ? ORDER BY id
+        Index("ix_comments_news_id_id", "news_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     text = Column(String, nullable=False)
@@ -15,3 +20,32 @@ class Comment(Base):
     news = relationship("News", back_populates="comments")
     author = relationship("User", back_populates="comments")
 
+
+# news.comments_count и news.last_comment_at обновляются в той же транзакции, что и
+# вставка или удаление комментария через ORM (включая каскадное удаление вместе с
+# пользователем). Массовый DELETE комментариев при удалении новости их не трогает:
+# новость удаляется следом.
+@event.listens_for(Comment, "after_insert")
+def _count_inserted_comment(mapper, connection, target: Comment) -> None:
+    news = News.__table__
+    connection.execute(
+        update(news)
+        .where(news.c.id == target.news_id)
+        .values(comments_count=news.c.comments_count + 1, last_comment_at=target.publication_date)
+    )
+
+
+@event.listens_for(Comment, "after_delete")
+def _count_deleted_comment(mapper, connection, target: Comment) -> None:
+    news, comments = News.__table__, Comment.__table__
+    # Как в бэкфилле миграции 006: самый поздний по дате, а не по id
+    latest = (
+        select(func.max(comments.c.publication_date))
+        .where(comments.c.news_id == target.news_id)
+        .scalar_subquery()
+    )
+    connection.execute(
+        update(news)
+        .where(news.c.id == target.news_id)
+        .values(comments_count=news.c.comments_count - 1, last_comment_at=latest)
+    )
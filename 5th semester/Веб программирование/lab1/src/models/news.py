@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, DDL, Integer, String, DateTime, ForeignKey, JSON, Index, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.database import Base
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        # Ключ курсорной пагинации ленты (publication_date DESC, id DESC)
+        Index("ix_news_publication_date_id", "publication_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -12,7 +16,53 @@ class News(Base):
     publication_date = Column(DateTime, default=datetime.utcnow)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     cover = Column(String, nullable=True)
+    # Поддерживаются обработчиками событий Comment (src/models/comment.py)
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_comment_at = Column(DateTime, nullable=True)
 
     author = relationship("User", back_populates="news")
     comments = relationship("Comment", back_populates="news", cascade="all, delete-orphan")
 
+
+
+# Полнотекстовый поиск (NewsService.search). В модели колонки нет: в PostgreSQL это
+# генерируемый tsvector (заголовок — вес A, строки из content — вес B) с GIN-индексом,
+# в SQLite — FTS5-таблица news_fts, которую заполняют триггеры. Для существующих
+# баз те же объекты создаёт миграция 005, здесь — для create_all.
+SEARCH_CONFIG = "russian"
+
+
+def _json_strings(row: str) -> str:
+    return f"(SELECT group_concat(value, ' ') FROM json_tree({row}.content) WHERE type = 'text')"
+
+
+_SEARCH_DDL = {
+    "postgresql": [
+        f"""ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(json_to_tsvector('{SEARCH_CONFIG}', coalesce(content, '{{}}'::json), '["string"]'), 'B')
+        ) STORED""",
+        "CREATE INDEX ix_news_search_vector ON news USING GIN (search_vector)",
+    ],
+    "sqlite": [
+        # Отдельная копия текста: JSON в SQLite хранится с \u-экранированием кириллицы,
+        # поэтому индексируются строковые значения content, извлечённые json_tree
+        "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(title, content)",
+        f"""CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON news BEGIN
+            INSERT INTO news_fts(rowid, title, content) VALUES (new.id, new.title, {_json_strings("new")});
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON news BEGIN
+            DELETE FROM news_fts WHERE rowid = old.id;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE OF title, content ON news BEGIN
+            DELETE FROM news_fts WHERE rowid = old.id;
+            INSERT INTO news_fts(rowid, title, content) VALUES (new.id, new.title, {_json_strings("new")});
+        END""",
+    ],
+}
+
+for _dialect, _statements in _SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(News.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+# Триггеры удаляются вместе с news, FTS5-таблица — нет
+event.listen(News.__table__, "before_drop", DDL("DROP TABLE IF EXISTS news_fts").execute_if(dialect="sqlite"))
@@ -0,0 +1,50 @@
+"""
+Курсорная (keyset) пагинация.
+
+Курсор — непрозрачная для клиента строка: base64 от JSON-списка значений
+ключа сортировки последней строки страницы. Следующая страница строится
+условием вида WHERE (k1, k2) < (:k1, :k2) по индексу, поэтому её стоимость
+не зависит от глубины, в отличие от OFFSET.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, List, Optional, Sequence
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+BATCH_MAX_IDS = 100  # максимум id в пакетном запросе ?ids=1,2,3
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Значения курсора; ValueError, если строка повреждена или не того формата."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def next_cursor(items: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> Optional[str]:
+    """Курсор следующей страницы или None, если страница последняя."""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(*key(items[-1]))
+
+
+def parse_ids(ids: str) -> List[int]:
+    """Список id из параметра ?ids=1,2,3 без повторов; ValueError, если он некорректен."""
+    try:
+        values = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError as exc:
+        raise ValueError("Invalid ids") from exc
+    if not values or len(values) > BATCH_MAX_IDS:
+        raise ValueError("Invalid ids")
+    return list(dict.fromkeys(values))
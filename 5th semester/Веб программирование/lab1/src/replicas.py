@@ -0,0 +1,148 @@
+"""
+Чтение из реплик: набор реплик с проверкой здоровья и сессия, которая
+отправляет помеченные SELECT в реплику. Общий для src/database.py и
+слоистого приложения app/ (app/db/session.py); движки и настройки задаёт
+каждый потребитель сам.
+"""
+import asyncio
+import itertools
+import logging
+from typing import List, Optional
+
+from sqlalchemy import Delete, Insert, Update, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from src.db_pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики в секундах; 0, если весь полученный WAL уже применён
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """
+    Реплики для чтения: выбор по кругу среди здоровых. Здоровье проверяет
+    фоновая задача (run_health_checks); обрыв соединения выводит реплику из
+    ротации сразу, до следующей проверки.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], health_interval: float = 5.0, max_lag: float = 10.0) -> None:
+        self.engines = engines
+        self.health_interval = health_interval
+        self.max_lag = max_lag
+        self._healthy = set(range(len(engines)))
+        self._next = itertools.count()
+        self._stats = {"picks": 0, "fallbacks": 0, "marked_down": 0}
+        for index, replica in enumerate(engines):
+            event.listen(replica.sync_engine, "handle_error", self._on_error(index))
+
+    def _on_error(self, index: int):
+        def handle_error(context) -> None:
+            if context.is_disconnect:
+                self.mark_down(index)
+        return handle_error
+
+    def mark_down(self, index: int) -> None:
+        if index in self._healthy:
+            self._healthy.discard(index)
+            self._stats["marked_down"] += 1
+            logger.warning("replica_down index=%s", index)
+
+    def choose(self) -> Optional[AsyncEngine]:
+        """Следующая здоровая реплика или None, если читать нужно из основной БД."""
+        if not self.engines:
+            return None
+        for _ in range(len(self.engines)):
+            index = next(self._next) % len(self.engines)
+            if index in self._healthy:
+                self._stats["picks"] += 1
+                return self.engines[index]
+        self._stats["fallbacks"] += 1
+        return None
+
+    async def check(self) -> None:
+        for index, replica in enumerate(self.engines):
+            if await self._is_healthy(replica):
+                if index not in self._healthy:
+                    logger.info("replica_up index=%s", index)
+                self._healthy.add(index)
+            else:
+                self.mark_down(index)
+
+    async def _is_healthy(self, replica: AsyncEngine) -> bool:
+        try:
+            lag = await asyncio.wait_for(_replica_lag(replica), timeout=self.health_interval)
+        except Exception:
+            return False
+        return lag <= self.max_lag
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": len(self.engines),
+            "healthy": len(self._healthy),
+            **self._stats,
+            "pools": [pool_stats(replica) for replica in self.engines],
+        }
+
+
+async def _replica_lag(replica: AsyncEngine) -> float:
+    async with replica.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+        return float(await conn.scalar(_REPLICA_LAG_SQL))
+
+
+class BaseRoutingSession(Session):
+    """
+    Сессия с разделением чтения и записи. В реплику уходят только SELECT,
+    помеченные on_replica(); остальное (в том числе чтение перед изменением)
+    выполняется в основной БД. После первой записи или stick_to_primary()
+    сессия до конца запроса читает только из основной БД, чтобы видеть свои
+    изменения. Подкласс указывает основной движок и набор реплик.
+    """
+
+    def primary_engine(self) -> AsyncEngine:
+        raise NotImplementedError
+
+    def replica_set(self) -> ReplicaSet:
+        raise NotImplementedError
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["primary"] = True
+        elif (
+            clause is not None
+            and clause.get_execution_options().get("replica")
+            and not self.info.get("primary")
+        ):
+            # Одна реплика на всю сессию: чтения запроса не перескакивают между репликами с разным отставанием
+            if "replica" not in self.info:
+                self.info["replica"] = self.replica_set().choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"].sync_engine
+        return self.primary_engine().sync_engine
+
+
+def on_replica(stmt):
+    """Помечает SELECT как допускающий чтение из реплики."""
+    return stmt.execution_options(replica=True)
+
+
+def stick_to_primary(session: AsyncSession) -> None:
+    """Дальнейшие чтения сессии — только из основной БД."""
+    session.info["primary"] = True
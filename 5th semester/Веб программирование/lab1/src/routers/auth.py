@@ -16,6 +16,7 @@ from src.schemas.auth import (
     UserRegister,
 )
 from src.services.auth_service import AuthApplicationService
+from src.services.cache import AsyncCacheService, get_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -30,8 +31,11 @@ github_sso = GithubSSO(
     allow_insecure_http=True
 )
 
-def get_auth_app_service(db: AsyncSession = Depends(get_db)) -> AuthApplicationService:
-    return AuthApplicationService(db)
+def get_auth_app_service(
+    db: AsyncSession = Depends(get_db),
+    cache: AsyncCacheService = Depends(get_cache),
+) -> AuthApplicationService:
+    return AuthApplicationService(db, cache)
 
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
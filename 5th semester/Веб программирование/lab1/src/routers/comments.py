@@ -1,24 +1,32 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
 from src.dependencies.auth import (
     get_comment_with_permission,
+    get_current_admin,
     get_current_user,
     get_optional_current_user,
     UserContext,
 )
 from src.models.comment import Comment
+from src.pagination import BATCH_MAX_IDS, NEXT_CURSOR_HEADER, next_cursor, parse_ids
 from src.schemas.comment import CommentCreate, CommentResponse, CommentUpdate
+from src.services.cache import AsyncCacheService, get_cache
 from src.services.comment_service import CommentService
+from src.streaming import EXPORT_FETCH_SIZE, NDJSON_MEDIA_TYPE, ndjson_stream
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
 
-def get_comment_service(db: AsyncSession = Depends(get_db)) -> CommentService:
-    return CommentService(db)
+def get_comment_service(
+    db: AsyncSession = Depends(get_db),
+    cache: AsyncCacheService = Depends(get_cache),
+) -> CommentService:
+    return CommentService(db, cache)
 
 
 @router.post("/", response_model=CommentResponse, status_code=201)
@@ -33,21 +41,58 @@ async def create_comment(
 
 @router.get("/", response_model=List[CommentResponse])
 async def get_comments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    ids: Optional[str] = Query(None, description=f"id через запятую, не больше {BATCH_MAX_IDS}"),
     _current_user: UserContext | None = Depends(get_optional_current_user),
     service: CommentService = Depends(get_comment_service),
 ):
-    return await service.get_comments(skip, limit)
+    if ids is not None:
+        try:
+            return await service.get_many(parse_ids(ids))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid ids")
+    if cursor:
+        try:
+            comments = await service.get_comments_after(cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        comments = await service.get_comments(skip, limit)
+    next_page = next_cursor(comments, limit, lambda c: (c.id,))
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return comments
 
 
 @router.get("/news/{news_id}", response_model=List[CommentResponse])
 async def get_comments_by_news(
     news_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     _current_user: UserContext | None = Depends(get_optional_current_user),
     service: CommentService = Depends(get_comment_service),
 ):
-    return await service.get_comments_by_news(news_id)
+    try:
+        comments = await service.get_comments_by_news(news_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    next_page = next_cursor(comments, limit, lambda c: (c.id,))
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return comments
+
+
+@router.get("/export")
+async def export_comments(
+    fetch_size: int = Query(EXPORT_FETCH_SIZE, ge=1, le=10000),
+    _current_user: UserContext = Depends(get_current_admin),
+    service: CommentService = Depends(get_comment_service),
+):
+    return StreamingResponse(ndjson_stream(service.export(fetch_size)), media_type=NDJSON_MEDIA_TYPE)
 
 
 @router.get("/{comment_id}", response_model=CommentResponse)
@@ -69,10 +114,7 @@ async def update_comment(
     comment: Comment = Depends(get_comment_with_permission),
     service: CommentService = Depends(get_comment_service),
 ):
-    updated = await service.update_comment(comment.id, comment_update)
-    if not updated:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    return updated
+    return await service.update_comment(comment, comment_update)
 
 
 @router.delete("/{comment_id}", status_code=204)
@@ -80,7 +122,5 @@ async def delete_comment(
     comment: Comment = Depends(get_comment_with_permission),
     service: CommentService = Depends(get_comment_service),
 ):
-    deleted = await service.delete_comment(comment.id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Comment not found")
+    await service.delete_comment(comment)
 
@@ -1,22 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
-from src.schemas.news import NewsCreate, NewsUpdate, NewsResponse
-from src.services.news_service import NewsService
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from src.schemas.news import NewsCreate, NewsFeedItem, NewsUpdate, NewsResponse, NewsSearchResult
+from src.pagination import BATCH_MAX_IDS, NEXT_CURSOR_HEADER, parse_ids
+from src.services.news_service import NewsService, news_cursor, search_cursor
 from src.dependencies.auth import (
     UserContext,
+    get_current_admin,
     get_current_verified_author,
     get_news_with_permission,
     get_optional_current_user,
 )
 from src.models.news import News
-from typing import List
+from src.streaming import EXPORT_FETCH_SIZE, NDJSON_MEDIA_TYPE, ndjson_stream
+from src import fast_json
+from typing import List, Optional
 
 router = APIRouter(prefix="/news", tags=["news"])
 
 from src.database import get_db
+from src.services.cache import AsyncCacheService, get_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 
-def get_news_service(db: AsyncSession = Depends(get_db)) -> NewsService:
-    return NewsService(db)
+def get_news_service(
+    db: AsyncSession = Depends(get_db),
+    cache: AsyncCacheService = Depends(get_cache),
+) -> NewsService:
+    return NewsService(db, cache)
 
 @router.post("/", response_model=NewsResponse, status_code=201)
 async def create_news(
@@ -32,12 +41,82 @@ async def create_news(
 
 @router.get("/", response_model=List[NewsResponse])
 async def get_all_news(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    ids: Optional[str] = Query(None, description=f"id через запятую, не больше {BATCH_MAX_IDS}"),
     _current_user: UserContext | None = Depends(get_optional_current_user),
     service: NewsService = Depends(get_news_service)
 ):
-    return await service.list(skip, limit)
+    # ?ids=1,2,3 — новости по списку id (кэш + один запрос за промахами)
+    if ids is not None:
+        try:
+            return await service.get_many(parse_ids(ids))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid ids")
+    # Быстрый путь: закэшированные JSON-байты страницы без проверки по response_model
+    if fast_json.FAST_JSON_LISTS and not cursor:
+        page = await service.list_json(skip, limit)
+        next_page = page["next_cursor"]
+        return fast_json.json_response(page["body"], {NEXT_CURSOR_HEADER: next_page} if next_page else None)
+    # С cursor страница строится по ключу (publication_date, id), skip игнорируется
+    if cursor:
+        try:
+            items = await service.list_after(cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        items = await service.list(skip, limit)
+    next_page = news_cursor(items, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return items
+
+# /feed, /search и /export объявлены до /{news_id}, иначе разбирались бы как id
+@router.get("/feed", response_model=List[NewsFeedItem])
+async def get_feed(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    _current_user: UserContext | None = Depends(get_optional_current_user),
+    service: NewsService = Depends(get_news_service)
+):
+    try:
+        items = await service.feed(limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    next_page = news_cursor(items, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return items
+
+@router.get("/search", response_model=List[NewsSearchResult])
+async def search_news(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    _current_user: UserContext | None = Depends(get_optional_current_user),
+    service: NewsService = Depends(get_news_service)
+):
+    try:
+        items = await service.search(q, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    next_page = search_cursor(items, limit)
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return items
+
+@router.get("/export")
+async def export_news(
+    fetch_size: int = Query(EXPORT_FETCH_SIZE, ge=1, le=10000),
+    _current_user: UserContext = Depends(get_current_admin),
+    service: NewsService = Depends(get_news_service)
+):
+    # NDJSON из серверного курсора: память не зависит от размера таблицы
+    return StreamingResponse(ndjson_stream(service.export(fetch_size)), media_type=NDJSON_MEDIA_TYPE)
 
 @router.get("/{news_id}", response_model=NewsResponse)
 async def get_news(
@@ -56,15 +135,12 @@ async def update_news(
     news: News = Depends(get_news_with_permission),
     service: NewsService = Depends(get_news_service)
 ):
-    updated = await service.update(news.id, news_update)
-    if not updated:
-        raise HTTPException(status_code=404, detail="News not found")
-    return updated
+    return await service.update(news, news_update)
 
 @router.delete("/{news_id}", status_code=204)
 async def delete_news(
     news: News = Depends(get_news_with_permission),
     service: NewsService = Depends(get_news_service)
 ):
-    await service.delete(news.id)
+    await service.delete(news)
 
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+
+from src.metrics import collect
+from src.services.cache import AsyncCacheService, get_cache
+
+router = APIRouter(tags=["system"])
+
+
+@router.get("/health")
+async def health(cache: AsyncCacheService = Depends(get_cache)):
+    # Кэш работает в режиме fail-open, поэтому недоступный Redis — деградация, а не отказ
+    redis_ok = await cache.ping()
+    return {"status": "ok" if redis_ok else "degraded", "redis": redis_ok}
+
+
+@router.get("/metrics")
+def metrics():
+    return collect()
@@ -1,18 +1,30 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db
 from src.dependencies.auth import UserContext, get_current_admin, get_optional_current_user
-from src.schemas.user import UserCreate, UserResponse, UserUpdate
+from src.pagination import BATCH_MAX_IDS, NEXT_CURSOR_HEADER, next_cursor, parse_ids
+from src.schemas.user import UserCreate, UserImportResult, UserResponse, UserUpdate
+from src.services.cache import AsyncCacheService, get_cache
+from src.services.user_bulk_service import EXPORT_COLUMNS, UserBulkService
 from src.services.user_service import UserService
+from src.streaming import CSV_MEDIA_TYPE, EXPORT_FETCH_SIZE, NDJSON_MEDIA_TYPE, csv_stream, ndjson_stream
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
-    return UserService(db)
+def get_user_service(
+    db: AsyncSession = Depends(get_db),
+    cache: AsyncCacheService = Depends(get_cache),
+) -> UserService:
+    return UserService(db, cache)
+
+
+def get_user_bulk_service(db: AsyncSession = Depends(get_db)) -> UserBulkService:
+    return UserBulkService(db)
 
 
 @router.post("/", response_model=UserResponse, status_code=201)
@@ -26,12 +38,54 @@ async def create_user(
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    ids: Optional[str] = Query(None, description=f"id через запятую, не больше {BATCH_MAX_IDS}"),
     _current_user: UserContext | None = Depends(get_optional_current_user),
     service: UserService = Depends(get_user_service),
 ):
-    return await service.get_users(skip, limit)
+    if ids is not None:
+        try:
+            return await service.get_many(parse_ids(ids))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid ids")
+    if cursor:
+        try:
+            users = await service.get_users_after(cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        users = await service.get_users(skip, limit)
+    next_page = next_cursor(users, limit, lambda u: (u.id,))
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    return users
+
+
+@router.post("/import", response_model=UserImportResult)
+async def import_users(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    _current_user: UserContext = Depends(get_current_admin),
+    service: UserBulkService = Depends(get_user_bulk_service),
+):
+    # Тело читается потоком: NDJSON (объект на строку) или CSV с заголовком
+    return await service.import_users(request.stream(), fmt)
+
+
+@router.get("/export")
+async def export_users(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    fetch_size: int = Query(EXPORT_FETCH_SIZE, ge=1, le=10000),
+    _current_user: UserContext = Depends(get_current_admin),
+    service: UserBulkService = Depends(get_user_bulk_service),
+):
+    partitions = service.export_users(fetch_size)
+    if fmt == "csv":
+        return StreamingResponse(csv_stream(partitions, EXPORT_COLUMNS), media_type=CSV_MEDIA_TYPE)
+    return StreamingResponse(ndjson_stream(partitions), media_type=NDJSON_MEDIA_TYPE)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
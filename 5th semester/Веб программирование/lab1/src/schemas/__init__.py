@@ -1,5 +1,5 @@
-from src.schemas.user import UserCreate, UserUpdate, UserResponse
-from src.schemas.news import NewsCreate, NewsUpdate, NewsResponse
+from src.schemas.user import UserCreate, UserUpdate, UserResponse, UserImport, UserImportResult
+from src.schemas.news import NewsCreate, NewsUpdate, NewsResponse, NewsSearchResult, NewsFeedItem
 from src.schemas.comment import CommentCreate, CommentUpdate, CommentResponse
 from src.schemas.auth import (
     UserRegister, UserLogin, Token, TokenRefresh, 
@@ -7,8 +7,8 @@ from src.schemas.auth import (
 )
 
 __all__ = [
-    "UserCreate", "UserUpdate", "UserResponse",
-    "NewsCreate", "NewsUpdate", "NewsResponse",
+    "UserCreate", "UserUpdate", "UserResponse", "UserImport", "UserImportResult",
+    "NewsCreate", "NewsUpdate", "NewsResponse", "NewsSearchResult", "NewsFeedItem",
     "CommentCreate", "CommentUpdate", "CommentResponse",
     "UserRegister", "UserLogin", "Token", "TokenRefresh",
     "RefreshSessionResponse", "UserMe"
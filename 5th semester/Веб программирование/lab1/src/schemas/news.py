@@ -23,3 +23,10 @@ class NewsResponse(NewsBase):
     class Config:
         from_attributes = True
 
+
+class NewsSearchResult(NewsResponse):
+    rank: float  # релевантность: чем больше, тем выше в выдаче
+
+class NewsFeedItem(NewsResponse):
+    comments_count: int
+    last_comment_at: Optional[datetime] = None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from src.models.user import UserRole
 
 class UserBase(BaseModel):
     name: str
@@ -24,3 +25,15 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+
+class UserImport(UserBase):
+    # Открытый пароль хэшируется при импорте; готовый password_hash сохраняется как есть
+    password: Optional[str] = None
+    password_hash: Optional[str] = None
+    role: UserRole = UserRole.USER
+
+class UserImportResult(BaseModel):
+    imported: int
+    skipped: int  # email уже зарегистрирован
+    rejected: int  # строка не прошла разбор или проверку
+    errors: List[str]
@@ -1,6 +1,10 @@
 from datetime import datetime, timedelta
 from typing import List, Optional
+import hashlib
+import logging
 import os
+import time
+import uuid
 
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
@@ -10,23 +14,88 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.user import User, UserRole
 from src.schemas.auth import UserLogin, UserRegister
-from src.services.cache import SyncCacheService
+from src.metrics import register_collector
+from src.services.cache import AsyncCacheService
+from src.services.local_cache import LocalCache
+from src.services.password_hasher import (
+    PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_HASH_WORKERS,
+    PasswordHasher,
+    PasswordHasherBusy,
+)
 
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 30
+# Проверенные access-токены: claims хранятся в памяти процесса до exp (0 — отключить)
+ACCESS_TOKEN_CACHE_SIZE = int(os.getenv("ACCESS_TOKEN_CACHE_SIZE", "10000"))
+# Библиотека проверки JWT: jose (по умолчанию) или pyjwt — быстрее, ставится отдельно (pip install PyJWT)
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose").lower()
+
+# Параметры Argon2 (по умолчанию — значения passlib). После их изменения старые хэши
+# пересчитываются при следующем успешном входе пользователя (authenticate_user).
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+logger = logging.getLogger(__name__)
+
+try:
+    import jwt as pyjwt
+except ImportError:
+    pyjwt = None
+
+if JWT_BACKEND == "pyjwt" and pyjwt is None:
+    logger.warning("JWT_BACKEND=pyjwt, но PyJWT не установлен — используется python-jose")
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+password_hasher = PasswordHasher(pwd_context, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+register_collector("password_hasher", password_hasher.stats)
+
+_access_claims = LocalCache(ACCESS_TOKEN_CACHE_SIZE, ttl=0) if ACCESS_TOKEN_CACHE_SIZE > 0 else None
+register_collector(
+    "access_token_cache", _access_claims.stats if _access_claims is not None else lambda: {"enabled": False}
+)
+
+
+def _credentials_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent authentication requests, retry later",
+        headers={"Retry-After": "1"},
+    )
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 class AuthService:
+    # Argon2 выполняется в пуле password_hasher, не блокируя event loop
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        try:
+            return await password_hasher.verify(plain_password, hashed_password)
+        except PasswordHasherBusy:
+            raise _hasher_busy()
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(password: str) -> str:
+        try:
+            return await password_hasher.hash(password)
+        except PasswordHasherBusy:
+            raise _hasher_busy()
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -43,21 +112,42 @@ class AuthService:
     def create_refresh_token(data: dict) -> str:
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-        to_encode.update({"exp": expire, "type": "refresh"})
+        # jti различает токены, выданные одному пользователю в одну секунду
+        to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
     @staticmethod
     def decode_token(token: str) -> dict:
+        if JWT_BACKEND == "pyjwt" and pyjwt is not None:
+            try:
+                return pyjwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            except pyjwt.PyJWTError:
+                raise _credentials_error()
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             return payload
         except JWTError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            raise _credentials_error()
+
+    @staticmethod
+    def decode_access_token(token: str) -> dict:
+        """
+        decode_token с кэшем: повторный запрос с тем же bearer-токеном не проверяет
+        подпись заново. Ключ — sha256 токена, запись живёт до exp токена.
+        """
+        if _access_claims is None:
+            return AuthService.decode_token(token)
+        key = hashlib.sha256(token.encode()).hexdigest()
+        payload = _access_claims.get(key)
+        if payload is not None:
+            return payload
+        payload = AuthService.decode_token(token)
+        if payload.get("type") == "access":
+            ttl = payload.get("exp", 0) - time.time()
+            if ttl > 0:
+                _access_claims.set(key, payload, ttl)
+        return payload
 
     @staticmethod
     async def register_user(db: AsyncSession, name: str, email: str, password: str) -> User:
@@ -69,7 +159,7 @@ class AuthService:
                 detail="Email already registered"
             )
         
-        password_hash = AuthService.get_password_hash(password)
+        password_hash = await AuthService.get_password_hash(password)
         user = User(
             name=name,
             email=email,
@@ -87,36 +177,73 @@ class AuthService:
         user = result.scalar_one_or_none()
         if not user or not user.password_hash:
             return None
-        if not AuthService.verify_password(password, user.password_hash):
+        if not await AuthService.verify_password(password, user.password_hash):
             return None
+        if pwd_context.needs_update(user.password_hash):
+            await AuthService._rehash_password(db, user, password)
         return user
 
+    @staticmethod
+    async def _rehash_password(db: AsyncSession, user: User, password: str) -> None:
+        # Пароль известен только при входе — тогда и переводим хэш на текущие параметры
+        try:
+            password_hash = await AuthService.get_password_hash(password)
+        except HTTPException:
+            return  # пул хэширования перегружен — пересчитаем при следующем входе
+        user.password_hash = password_hash
+        try:
+            await db.commit()
+            logger.info("password_rehashed user_id=%s", user.id)
+        except Exception as exc:
+            await db.rollback()
+            await db.refresh(user)
+            logger.error("password_rehash_failed user_id=%s err=%s", user.id, exc)
+
+    @staticmethod
+    def session_id(refresh_token: str) -> str:
+        """
+        Идентификатор сессии в Redis. Первые символы JWT — это общий для всех токенов
+        заголовок, поэтому берём хэш всего токена.
+        """
+        return hashlib.sha256(refresh_token.encode()).hexdigest()[:32]
+
     @staticmethod
     async def create_tokens_for_user(
         db: AsyncSession, 
+        cache: AsyncCacheService,
         user: User, 
         user_agent: Optional[str] = None
     ) -> dict:
-        access_token = AuthService.create_access_token(data={"sub": str(user.id)})
-        refresh_token = AuthService.create_refresh_token(data={"sub": str(user.id)})
+        tokens = AuthService._issue_tokens(user.id)
         
         # Храним сессию в Redis
-        token_prefix = refresh_token[:16]
-        session_data = {
-            "user_id": user.id,
-            "user_agent": user_agent,
-            "created_at": datetime.utcnow().isoformat(),
-        }
-        SyncCacheService().set_session(user.id, token_prefix, session_data)
-        
+        token_prefix = AuthService.session_id(tokens["refresh_token"])
+        await cache.set_session(user.id, token_prefix, AuthService._session_data(user.id, user_agent))
+        return tokens
+
+    @staticmethod
+    def _issue_tokens(user_id: int) -> dict:
         return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
+            "access_token": AuthService.create_access_token(data={"sub": str(user_id)}),
+            "refresh_token": AuthService.create_refresh_token(data={"sub": str(user_id)}),
             "token_type": "bearer"
         }
 
     @staticmethod
-    async def refresh_tokens(db: AsyncSession, refresh_token: str, user_agent: Optional[str] = None) -> dict:
+    def _session_data(user_id: int, user_agent: Optional[str]) -> dict:
+        return {
+            "user_id": user_id,
+            "user_agent": user_agent,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+    @staticmethod
+    async def refresh_tokens(
+        db: AsyncSession,
+        cache: AsyncCacheService,
+        refresh_token: str,
+        user_agent: Optional[str] = None,
+    ) -> dict:
         payload = AuthService.decode_token(refresh_token)
         
         if payload.get("type") != "refresh":
@@ -126,48 +253,48 @@ class AuthService:
             )
         
         user_id = int(payload.get("sub"))
-        token_prefix = refresh_token[:16]
-        cache = SyncCacheService()
-        session = cache.get_session(user_id, token_prefix)
+        # Пользователь берётся из кэша, в БД идём только при промахе
+        if not await cache.get_user(user_id):
+            found = await db.scalar(select(User.id).where(User.id == user_id))
+            if found is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found"
+                )
         
-        if not session:
+        # Проверка старой сессии и замена её новой — один атомарный скрипт в Redis
+        tokens = AuthService._issue_tokens(user_id)
+        rotated = await cache.rotate_session(
+            user_id,
+            AuthService.session_id(refresh_token),
+            AuthService.session_id(tokens["refresh_token"]),
+            AuthService._session_data(user_id, user_agent),
+        )
+        if not rotated:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
-        
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        # Удаляем старую сессию и создаем новую
-        cache.delete_session(user_id, token_prefix)
-        return await AuthService.create_tokens_for_user(db, user, user_agent)
+        return tokens
 
     @staticmethod
-    async def logout(db: AsyncSession, refresh_token: str) -> bool:
+    async def logout(db: AsyncSession, cache: AsyncCacheService, refresh_token: str) -> bool:
         try:
             payload = AuthService.decode_token(refresh_token)
             user_id = int(payload.get("sub"))
-            token_prefix = refresh_token[:16]
-            SyncCacheService().delete_session(user_id, token_prefix)
+            token_prefix = AuthService.session_id(refresh_token)
+            await cache.delete_session(user_id, token_prefix)
             return True
         except Exception:
             return False
 
     @staticmethod
-    async def get_user_sessions(db: AsyncSession, user_id: int) -> List[dict]:
-        cache = SyncCacheService()
-        return cache.list_sessions(user_id)
+    async def get_user_sessions(db: AsyncSession, cache: AsyncCacheService, user_id: int) -> List[dict]:
+        return await cache.list_sessions(user_id)
 
     @staticmethod
-    async def logout_all_sessions(db: AsyncSession, user_id: int) -> int:
-        cache = SyncCacheService()
-        return cache.delete_sessions_for_user(user_id)
+    async def logout_all_sessions(db: AsyncSession, cache: AsyncCacheService, user_id: int) -> int:
+        return await cache.delete_sessions_for_user(user_id)
 
     @staticmethod
     async def get_or_create_github_user(db: AsyncSession, github_id: str, email: str, name: str, avatar: str) -> User:
@@ -201,12 +328,13 @@ class AuthService:
 
 
 class AuthApplicationService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, cache: AsyncCacheService):
         self.db = db
+        self.cache = cache
 
     async def register(self, payload: UserRegister, user_agent: Optional[str]) -> dict:
         user = await AuthService.register_user(self.db, payload.name, payload.email, payload.password)
-        return await AuthService.create_tokens_for_user(self.db, user, user_agent)
+        return await AuthService.create_tokens_for_user(self.db, self.cache, user, user_agent)
 
     async def login(self, payload: UserLogin, user_agent: Optional[str]) -> dict:
         user = await AuthService.authenticate_user(self.db, payload.email, payload.password)
@@ -216,19 +344,19 @@ class AuthApplicationService:
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return await AuthService.create_tokens_for_user(self.db, user, user_agent)
+        return await AuthService.create_tokens_for_user(self.db, self.cache, user, user_agent)
 
     async def refresh(self, refresh_token: str, user_agent: Optional[str]) -> dict:
-        return await AuthService.refresh_tokens(self.db, refresh_token, user_agent)
+        return await AuthService.refresh_tokens(self.db, self.cache, refresh_token, user_agent)
 
     async def logout(self, refresh_token: str) -> None:
-        await AuthService.logout(self.db, refresh_token)
+        await AuthService.logout(self.db, self.cache, refresh_token)
 
     async def list_sessions(self, user_id: int) -> List[dict]:
-        return await AuthService.get_user_sessions(self.db, user_id)
+        return await AuthService.get_user_sessions(self.db, self.cache, user_id)
 
     async def logout_all_sessions(self, user_id: int) -> int:
-        return await AuthService.logout_all_sessions(self.db, user_id)
+        return await AuthService.logout_all_sessions(self.db, self.cache, user_id)
 
     async def tokens_for_github_user(
         self,
@@ -246,5 +374,5 @@ class AuthApplicationService:
             name=name,
             avatar=avatar,
         )
-        return await AuthService.create_tokens_for_user(self.db, user, user_agent)
+        return await AuthService.create_tokens_for_user(self.db, self.cache, user, user_agent)
 
@@ -1,9 +1,18 @@
 from __future__ import annotations
+import asyncio
 import json
 import logging
-from typing import Any, List, Optional
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import os
-import redis
+from redis import asyncio as aioredis
+from redis.client import NEVER_DECODE
+
+from src.metrics import register_collector
+from src.services.local_cache import LocalCache
 
 logger = logging.getLogger(__name__)
 
@@ -11,101 +20,697 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "300"))  # 5 минут
 USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "600"))  # 10 минут
 SESSION_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", "2592000"))  # 30 дней
+COMMENT_CACHE_TTL = int(os.getenv("COMMENT_CACHE_TTL", "300"))  # 5 минут
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))  # ожидание свободного соединения, сек
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+# L1: in-process кэш горячих ключей (news:{id}, user:{id}) перед Redis
+L1_CACHE_ENABLED = os.getenv("L1_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+L1_CACHE_MAX_SIZE = int(os.getenv("L1_CACHE_MAX_SIZE", "10000"))
+L1_CACHE_TTL = float(os.getenv("L1_CACHE_TTL", "5"))  # секунды
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Поколение списков новостей: входит в ключи news_list, любая запись увеличивает его
+NEWS_LIST_GEN_KEY = "news_list_gen"
+# Защита от cache stampede (get_or_load)
+STAMPEDE_LOCK_TTL = float(os.getenv("STAMPEDE_LOCK_TTL", "5"))  # максимум на пересчёт значения, сек
+STAMPEDE_LOCK_WAIT = float(os.getenv("STAMPEDE_LOCK_WAIT", "2"))  # сколько ждать чужой пересчёт, сек
+STAMPEDE_BETA = float(os.getenv("STAMPEDE_BETA", "1.0"))  # >1 — обновлять раньше, 0 — отключить раннее обновление
+_LOCK_POLL_INTERVAL = 0.05
+
+# Снимаем блокировку, только если она всё ещё наша
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Ротация refresh-сессии: старая сессия должна существовать и не истечь,
+# тогда она заменяется новой. KEYS: хэш и sorted set сессий пользователя;
+# ARGV: старый id, новый id, данные, текущее время, истечение новой, TTL ключей
+_ROTATE_SESSION_SCRIPT = """
+local expires_at = redis.call('zscore', KEYS[2], ARGV[1])
+if not expires_at or tonumber(expires_at) <= tonumber(ARGV[4]) then
+    return 0
+end
+if redis.call('hdel', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('zrem', KEYS[2], ARGV[1])
+redis.call('hset', KEYS[1], ARGV[2], ARGV[3])
+redis.call('zadd', KEYS[2], ARGV[5], ARGV[2])
+redis.call('expire', KEYS[1], ARGV[6])
+redis.call('expire', KEYS[2], ARGV[6])
+return 1
+"""
+
+Loader = Callable[[], Awaitable[Any]]
+# Загрузчик пачки: id промахов -> найденные значения (отсутствующие id просто не возвращаются)
+BatchLoader = Callable[[List[int]], Awaitable[Dict[int, Any]]]
+
+
+class InstrumentedConnectionPool(aioredis.BlockingConnectionPool):
+    """
+    Пул с ограниченным размером (при исчерпании запросы ждут, а не открывают новые сокеты)
+    и счётчиками: сколько раз соединение выдавалось и сколько соединений реально создано.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.created = 0
+
+    def make_connection(self):
+        self.created += 1
+        return super().make_connection()
+
+    async def get_connection(self, command_name, *keys, **options):
+        self.checkouts += 1
+        # В redis-py 5.0.1 подключение выполняется под блокировкой пула, и при ошибке
+        # release() ждёт ту же блокировку — каждый запрос к недоступному Redis висит
+        # до REDIS_POOL_TIMEOUT. Забираем соединение под блокировкой, подключаем — вне её.
+        try:
+            connection = await asyncio.wait_for(self._checkout(), self.timeout)
+        except asyncio.TimeoutError as err:
+            raise aioredis.ConnectionError("No connection available.") from err
+        try:
+            await self.ensure_connection(connection)
+        except BaseException:
+            await self.release(connection)
+            raise
+        return connection
+
+    async def _checkout(self):
+        async with self._condition:
+            await self._condition.wait_for(self.can_get_connection)
+            try:
+                connection = self._available_connections.pop()
+            except IndexError:
+                connection = self.make_connection()
+            self._in_use_connections.add(connection)
+            return connection
+
+    def stats(self) -> dict:
+        in_use = len(self._in_use_connections)
+        return {
+            "max_connections": self.max_connections,
+            "created": self.created,
+            "open": in_use + len(self._available_connections),
+            "in_use": in_use,
+            "checkouts": self.checkouts,
+            # Доля выдач, обслуженных уже открытым соединением
+            "reuse_ratio": round(1 - self.created / self.checkouts, 4) if self.checkouts else 0.0,
+        }
+
 
-class SyncCacheService:
-    def __init__(self) -> None:
-        self.client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+RAW_BODY_FIELD = "body"
 
-    def get(self, key: str) -> Optional[Any]:
+
+def _pack_raw(envelope: dict) -> bytes:
+    # Заголовок get_or_load одной строкой JSON (переводы строк в нём экранированы), затем тело
+    value = envelope["v"]
+    meta = {name: item for name, item in value.items() if name != RAW_BODY_FIELD}
+    return json.dumps({**envelope, "v": meta}, default=str).encode() + b"\n" + value[RAW_BODY_FIELD]
+
+
+def _unpack_raw(packed: bytes) -> Optional[dict]:
+    header, _, body = packed.partition(b"\n")
+    try:
+        envelope = json.loads(header)
+    except ValueError:
+        return None
+    if not isinstance(envelope, dict) or not isinstance(envelope.get("v"), dict):
+        return None
+    envelope["v"][RAW_BODY_FIELD] = body
+    return envelope
+
+
+class AsyncCacheService:
+    def __init__(self, client: aioredis.Redis, local: Optional[LocalCache] = None) -> None:
+        self.client = client
+        self.local = local
+        self.hits = 0
+        self.misses = 0
+        # Запросы к одному ключу внутри воркера ждут один общий пересчёт
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.loads = 0
+        self.coalesced = 0
+        self.lock_waits = 0
+        self.early_refreshes = 0
+        self._release_lock = client.register_script(_RELEASE_LOCK_SCRIPT)
+        self._rotate_session = client.register_script(_ROTATE_SESSION_SCRIPT)
+
+    async def ping(self) -> bool:
+        try:
+            return bool(await self.client.ping())
+        except Exception as exc:
+            logger.error(f"cache_ping_error err={exc}")
+            return False
+
+    async def get(self, key: str, raw: bool = False) -> Optional[Any]:
+        """Значение из JSON; raw=True — байты как есть, без декодирования ответа клиентом."""
         try:
-            value = self.client.get(key)
+            if raw:
+                value = await self.client.execute_command("GET", key, **{NEVER_DECODE: []})
+            else:
+                value = await self.client.get(key)
             if value is None:
+                self.misses += 1
                 logger.info(f"cache_miss key={key}")
                 return None
+            self.hits += 1
             logger.info(f"cache_hit key={key}")
-            return json.loads(value)
+            return value if raw else json.loads(value)
         except Exception as exc:
             logger.error(f"cache_get_error key={key} err={exc}")
             return None
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, raw: bool = False) -> bool:
         try:
-            payload = json.dumps(value, default=str)
+            payload = value if raw else json.dumps(value, default=str)
             if ttl:
-                self.client.setex(key, ttl, payload)
+                await self.client.setex(key, ttl, payload)
             else:
-                self.client.set(key, payload)
+                await self.client.set(key, payload)
             logger.info(f"cache_set key={key} ttl={ttl}")
             return True
         except Exception as exc:
             logger.error(f"cache_set_error key={key} err={exc}")
             return False
 
-    def delete(self, key: str) -> bool:
+    async def delete(self, key: str) -> bool:
         try:
-            self.client.delete(key)
+            await self.client.delete(key)
             logger.info(f"cache_del key={key}")
             return True
         except Exception as exc:
             logger.error(f"cache_del_error key={key} err={exc}")
             return False
 
-    # Логические ключи
-    def get_news(self, news_id: int) -> Optional[dict]:
-        return self.get(f"news:{news_id}")
+    # Двухуровневый доступ: L1 (память процесса) -> L2 (Redis)
+    async def get_tiered(self, key: str) -> Optional[Any]:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not None:
+                return value
+        value = await self.get(key)
+        if value is not None and self.local is not None:
+            self.local.set(key, value)
+        return value
 
-    def set_news(self, news_id: int, data: dict) -> bool:
-        return self.set(f"news:{news_id}", data, NEWS_CACHE_TTL)
+    async def set_tiered(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        if self.local is not None:
+            self.local.set(key, value)
+        return await self.set(key, value, ttl)
 
-    def get_news_list(self, skip: int, limit: int) -> Optional[list]:
-        return self.get(f"news_list:{skip}:{limit}")
+    async def invalidate(self, key: str) -> bool:
+        """Удаляет ключ из Redis и рассылает событие, чтобы остальные воркеры сбросили свой L1."""
+        if self.local is not None:
+            self.local.delete(key)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.delete(key)
+                pipe.publish(INVALIDATION_CHANNEL, key)
+                await pipe.execute()
+            logger.info(f"cache_invalidate key={key}")
+            return True
+        except Exception as exc:
+            logger.error(f"cache_invalidate_error key={key} err={exc}")
+            return False
+
+    async def listen_invalidations(self) -> None:
+        """Фоновая задача воркера: применяет к L1 инвалидации, пришедшие от других процессов."""
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.local.delete(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Пока подписка потеряна, события пропускаются: сбрасываем L1 целиком
+                logger.error(f"cache_pubsub_error err={exc}")
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    # Чтение с пересчётом: single-flight в воркере, блокировка в Redis между воркерами
+    # и вероятностное раннее обновление (XFetch) до истечения TTL
+    # raw=True — значение словарь с готовыми байтами в RAW_BODY_FIELD: в Redis они лежат после
+    # строки JSON-заголовка и не проходят через json.dumps/loads
+    async def get_or_load(
+        self, key: str, ttl: int, loader: Loader, tiered: bool = False, raw: bool = False
+    ) -> Optional[Any]:
+        local = self.local if tiered else None
+        if local is not None:
+            value = local.get(key)
+            if value is not None:
+                return value
+        value = await self._get_or_load(key, ttl, loader, raw)
+        if value is not None and local is not None:
+            local.set(key, value)
+        return value
 
-    def set_news_list(self, skip: int, limit: int, data: list) -> bool:
-        return self.set(f"news_list:{skip}:{limit}", data, NEWS_CACHE_TTL)
+    async def _get_or_load(self, key: str, ttl: int, loader: Loader, raw: bool = False) -> Optional[Any]:
+        envelope = await self._get_envelope(key, raw)
+        if envelope is not None:
+            if key in self._inflight or not self._should_refresh_early(envelope):
+                return envelope["v"]
+            # Пересчитывает один запрос, остальные пока получают текущее значение
+            token = await self._acquire_lock(key)
+            if token is None:
+                return envelope["v"]
+            if key in self._inflight:
+                # Пока брали блокировку, пересчёт в этом воркере уже начал другой запрос:
+                # его _single_flight не вызовет наш _load_and_store, блокировку отпускаем сами
+                await self._unlock(key, token)
+                return envelope["v"]
+            self.early_refreshes += 1
+            return await self._single_flight(key, lambda: self._load_and_store(key, ttl, loader, token, raw))
+        return await self._single_flight(key, lambda: self._load_with_lock(key, ttl, loader, raw))
+
+    async def _single_flight(self, key: str, compute: Loader) -> Optional[Any]:
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            await asyncio.wait({future})
+            # Если лидер был отменён (клиент отключился), пробуем сами
+            if not future.cancelled():
+                return future.result()
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
 
-    def get_user(self, user_id: int) -> Optional[dict]:
-        return self.get(f"user:{user_id}")
+    async def _load_with_lock(self, key: str, ttl: int, loader: Loader, raw: bool = False) -> Optional[Any]:
+        token = await self._acquire_lock(key)
+        if token is None:
+            # Значение уже пересчитывает другой воркер — ждём его результат
+            self.lock_waits += 1
+            envelope = await self._wait_for_envelope(key, raw)
+            if envelope is not None:
+                return envelope["v"]
+            token = ""
+        return await self._load_and_store(key, ttl, loader, token, raw)
 
-    def set_user(self, user_id: int, data: dict) -> bool:
-        return self.set(f"user:{user_id}", data, USER_CACHE_TTL)
+    async def _load_and_store(
+        self, key: str, ttl: int, loader: Loader, token: str, raw: bool = False
+    ) -> Optional[Any]:
+        try:
+            started = time.monotonic()
+            value = await loader()
+            self.loads += 1
+            if value is not None:
+                envelope = {"v": value, "d": time.monotonic() - started, "e": time.time() + ttl}
+                if raw:
+                    await self.set(key, _pack_raw(envelope), ttl, raw=True)
+                else:
+                    await self.set(key, envelope, ttl)
+            return value
+        finally:
+            await self._unlock(key, token)
 
-    def set_session(self, user_id: int, token_prefix: str, data: dict) -> bool:
-        return self.set(f"session:{user_id}:{token_prefix}", data, SESSION_CACHE_TTL)
+    async def _unlock(self, key: str, token: str) -> None:
+        if token:
+            try:
+                await self._release_lock(keys=[f"lock:{key}"], args=[token])
+            except Exception as exc:
+                logger.error(f"cache_unlock_error key={key} err={exc}")
 
-    def get_session(self, user_id: int, token_prefix: str) -> Optional[dict]:
-        return self.get(f"session:{user_id}:{token_prefix}")
+    async def _get_envelope(self, key: str, raw: bool = False) -> Optional[dict]:
+        if raw:
+            packed = await self.get(key, raw=True)
+            return _unpack_raw(packed) if packed is not None else None
+        envelope = await self.get(key)
+        # Значения старого формата (без обёртки) считаем промахом
+        return envelope if isinstance(envelope, dict) and "v" in envelope else None
 
-    def delete_session(self, user_id: int, token_prefix: str) -> bool:
-        return self.delete(f"session:{user_id}:{token_prefix}")
+    @staticmethod
+    def _should_refresh_early(envelope: dict) -> bool:
+        # XFetch: чем дороже пересчёт (d) и ближе истечение (e), тем выше шанс обновить заранее
+        delta = float(envelope.get("d") or 0)
+        expiry = float(envelope.get("e") or 0)
+        return time.time() - delta * STAMPEDE_BETA * math.log(1.0 - random.random()) >= expiry
 
-    def list_sessions(self, user_id: int) -> List[dict]:
-        pattern = f"session:{user_id}:*"
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """Токен блокировки, None — если её держит другой воркер, "" — если Redis недоступен."""
+        token = uuid.uuid4().hex
         try:
-            keys = list(self.client.scan_iter(match=pattern))
-            if not keys:
-                return []
-            values = self.client.mget(keys)
-            sessions: List[dict] = []
-            for key, raw in zip(keys, values):
-                if not raw:
+            acquired = await self.client.set(f"lock:{key}", token, nx=True, px=int(STAMPEDE_LOCK_TTL * 1000))
+            return token if acquired else None
+        except Exception as exc:
+            logger.error(f"cache_lock_error key={key} err={exc}")
+            return ""
+
+    async def _wait_for_envelope(self, key: str, raw: bool = False) -> Optional[dict]:
+        deadline = time.monotonic() + STAMPEDE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            envelope = await self._get_envelope(key, raw)
+            if envelope is not None:
+                return envelope
+            try:
+                if not await self.client.exists(f"lock:{key}"):
+                    return None  # владелец блокировки закончил, но значения нет (например, 404)
+            except Exception:
+                return None
+        return None
+
+    async def get_many(
+        self, prefix: str, ids: List[int], ttl: int, loader: BatchLoader, envelope: bool = False, tiered: bool = False
+    ) -> Dict[int, Any]:
+        """
+        Значения ключей {prefix}:{id} для списка id в порядке ids: попадания читаются
+        одним MGET, промахи загружаются одним вызовом loader (один запрос к БД) и
+        записываются обратно одним пайплайном. envelope — ключи в формате get_or_load.
+        """
+        local = self.local if tiered else None
+        found: Dict[int, Any] = {}
+        if local is not None:
+            for item_id in ids:
+                value = local.get(f"{prefix}:{item_id}")
+                if value is not None:
+                    found[item_id] = value
+
+        pending = [item_id for item_id in ids if item_id not in found]
+        if pending:
+            try:
+                raw = await self.client.mget([f"{prefix}:{item_id}" for item_id in pending])
+            except Exception as exc:
+                logger.error(f"cache_mget_error prefix={prefix} count={len(pending)} err={exc}")
+                raw = [None] * len(pending)
+            for item_id, value in zip(pending, raw):
+                if value is None:
                     continue
-                data = json.loads(raw)
-                token_prefix = key.split(":")[-1]
-                sessions.append({**data, "token_prefix": token_prefix})
-            return sessions
+                try:
+                    value = json.loads(value)
+                except ValueError as exc:
+                    # Повреждённую запись считаем промахом: она перезапишется из БД
+                    logger.error(f"cache_get_error key={prefix}:{item_id} err={exc}")
+                    continue
+                if envelope:
+                    if not isinstance(value, dict) or "v" not in value:
+                        continue
+                    value = value["v"]
+                found[item_id] = value
+                if local is not None:
+                    local.set(f"{prefix}:{item_id}", value)
+
+        missing = [item_id for item_id in ids if item_id not in found]
+        self.hits += len(ids) - len(missing)
+        self.misses += len(missing)
+        if not missing:
+            return {item_id: found[item_id] for item_id in ids}
+
+        started = time.monotonic()
+        loaded = await loader(missing)
+        self.loads += 1
+        found.update(loaded)
+        if loaded:
+            delta = time.monotonic() - started
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for item_id, value in loaded.items():
+                        if envelope:
+                            value = {"v": value, "d": delta, "e": time.time() + ttl}
+                        pipe.setex(f"{prefix}:{item_id}", ttl, json.dumps(value, default=str))
+                    await pipe.execute()
+            except Exception as exc:
+                logger.error(f"cache_backfill_error prefix={prefix} count={len(loaded)} err={exc}")
+        if local is not None:
+            for item_id, value in loaded.items():
+                local.set(f"{prefix}:{item_id}", value)
+        logger.info(f"cache_get_many prefix={prefix} hits={len(ids) - len(missing)} misses={len(missing)}")
+        return {item_id: found[item_id] for item_id in ids if item_id in found}
+
+    def stats(self) -> dict:
+        return {
+            "l1": self.local.stats() if self.local is not None else {"enabled": False},
+            "l2": {"hits": self.hits, "misses": self.misses},
+            "stampede": {
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "lock_waits": self.lock_waits,
+                "early_refreshes": self.early_refreshes,
+            },
+        }
+
+    # Логические ключи
+    async def get_news(self, news_id: int, loader: Loader) -> Optional[dict]:
+        return await self.get_or_load(f"news:{news_id}", NEWS_CACHE_TTL, loader, tiered=True)
+
+    async def get_news_many(self, ids: List[int], loader: BatchLoader) -> Dict[int, dict]:
+        return await self.get_many("news", ids, NEWS_CACHE_TTL, loader, envelope=True, tiered=True)
+
+    async def delete_news(self, news_id: int) -> bool:
+        return await self.invalidate(f"news:{news_id}")
+
+    async def news_list_key(self, skip: int, limit: int) -> str:
+        try:
+            generation = await self.client.get(NEWS_LIST_GEN_KEY) or 0
+        except Exception as exc:
+            logger.error(f"cache_get_error key={NEWS_LIST_GEN_KEY} err={exc}")
+            generation = 0
+        return f"news_list:{generation}:{skip}:{limit}"
+
+    async def get_news_list(self, skip: int, limit: int, loader: Loader) -> Optional[list]:
+        return await self.get_or_load(await self.news_list_key(skip, limit), NEWS_CACHE_TTL, loader)
+
+    async def get_news_list_json(self, skip: int, limit: int, loader: Loader) -> Optional[dict]:
+        """
+        Страница списка, уже сериализованная в JSON ({"body": bytes, "next_cursor"}): тело
+        хранится в Redis байтами и при попадании отдаётся клиенту без разбора. Ключ в том же
+        поколении, что и обычные страницы; значение безопасно держать в L1 — новая запись
+        меняет поколение, а значит и ключ.
+        """
+        key = f"{await self.news_list_key(skip, limit)}:json"
+        return await self.get_or_load(key, NEWS_CACHE_TTL, loader, tiered=True, raw=True)
+
+    async def invalidate_news_lists(self) -> bool:
+        """Сбрасывает все страницы списка за O(1): старые ключи больше не читаются и истекут по TTL."""
+        try:
+            generation = await self.client.incr(NEWS_LIST_GEN_KEY)
+            logger.info(f"cache_invalidate key={NEWS_LIST_GEN_KEY} gen={generation}")
+            return True
+        except Exception as exc:
+            logger.error(f"cache_invalidate_error key={NEWS_LIST_GEN_KEY} err={exc}")
+            return False
+
+    async def get_user(self, user_id: int) -> Optional[dict]:
+        return await self.get_tiered(f"user:{user_id}")
+
+    async def set_user(self, user_id: int, data: dict) -> bool:
+        return await self.set_tiered(f"user:{user_id}", data, USER_CACHE_TTL)
+
+    async def get_users_many(self, ids: List[int], loader: BatchLoader) -> Dict[int, dict]:
+        return await self.get_many("user", ids, USER_CACHE_TTL, loader, tiered=True)
+
+    async def delete_user(self, user_id: int) -> bool:
+        return await self.invalidate(f"user:{user_id}")
+
+    # comment:{id} сбрасывают CommentService и удаление новости; комментарии, удалённые
+    # каскадом вместе с пользователем, остаются в кэше до COMMENT_CACHE_TTL
+    async def get_comments_many(self, ids: List[int], loader: BatchLoader) -> Dict[int, dict]:
+        return await self.get_many("comment", ids, COMMENT_CACHE_TTL, loader)
+
+    async def delete_comments(self, comment_ids: List[int]) -> bool:
+        if not comment_ids:
+            return True
+        try:
+            await self.client.delete(*(f"comment:{comment_id}" for comment_id in comment_ids))
+            logger.info(f"cache_del prefix=comment count={len(comment_ids)}")
+            return True
+        except Exception as exc:
+            logger.error(f"cache_del_error prefix=comment count={len(comment_ids)} err={exc}")
+            return False
+
+    # Сессии пользователя: хэш sessions:{user_id} (id сессии -> данные) и sorted set
+    # sessions:{user_id}:expiry (id сессии -> время истечения). Список и отзыв сессий
+    # читают только ключи пользователя; истёкшие записи удаляются при чтении.
+    @staticmethod
+    def _session_keys(user_id: int) -> tuple:
+        return f"sessions:{user_id}", f"sessions:{user_id}:expiry"
+
+    async def set_session(self, user_id: int, token_prefix: str, data: dict) -> bool:
+        index, expiry = self._session_keys(user_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.hset(index, token_prefix, json.dumps(data, default=str))
+                pipe.zadd(expiry, {token_prefix: time.time() + SESSION_CACHE_TTL})
+                # Ключи живут не дольше самой поздней сессии
+                pipe.expire(index, SESSION_CACHE_TTL)
+                pipe.expire(expiry, SESSION_CACHE_TTL)
+                await pipe.execute()
+            logger.info(f"cache_set_session user_id={user_id}")
+            return True
+        except Exception as exc:
+            logger.error(f"cache_set_session_error user_id={user_id} err={exc}")
+            return False
+
+    async def get_session(self, user_id: int, token_prefix: str) -> Optional[dict]:
+        index, expiry = self._session_keys(user_id)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hget(index, token_prefix)
+                pipe.zscore(expiry, token_prefix)
+                raw, expires_at = await pipe.execute()
+            if raw is None or expires_at is None or expires_at <= time.time():
+                return None
+            return json.loads(raw)
+        except Exception as exc:
+            logger.error(f"cache_get_session_error user_id={user_id} err={exc}")
+            return None
+
+    async def delete_session(self, user_id: int, token_prefix: str) -> bool:
+        index, expiry = self._session_keys(user_id)
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.hdel(index, token_prefix)
+                pipe.zrem(expiry, token_prefix)
+                await pipe.execute()
+            logger.info(f"cache_del_session user_id={user_id}")
+            return True
+        except Exception as exc:
+            logger.error(f"cache_del_session_error user_id={user_id} err={exc}")
+            return False
+
+    async def rotate_session(self, user_id: int, old_prefix: str, new_prefix: str, data: dict) -> bool:
+        """
+        Заменяет сессию old_prefix на new_prefix за один вызов Lua-скрипта. Из
+        параллельных обновлений одного refresh-токена успешно только одно.
+        """
+        now = time.time()
+        try:
+            rotated = await self._rotate_session(
+                keys=list(self._session_keys(user_id)),
+                args=[old_prefix, new_prefix, json.dumps(data, default=str), now,
+                      now + SESSION_CACHE_TTL, SESSION_CACHE_TTL],
+            )
+            logger.info(f"cache_rotate_session user_id={user_id} rotated={rotated}")
+            return bool(rotated)
+        except Exception as exc:
+            logger.error(f"cache_rotate_session_error user_id={user_id} err={exc}")
+            return False
+
+    async def list_sessions(self, user_id: int) -> List[dict]:
+        index, expiry = self._session_keys(user_id)
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.zrangebyscore(expiry, "-inf", time.time())
+                pipe.hgetall(index)
+                expired, stored = await pipe.execute()
+            if expired:
+                async with self.client.pipeline(transaction=True) as pipe:
+                    pipe.hdel(index, *expired)
+                    pipe.zrem(expiry, *expired)
+                    await pipe.execute()
+            expired = set(expired)
+            return [
+                {**json.loads(raw), "token_prefix": token_prefix}
+                for token_prefix, raw in stored.items()
+                if token_prefix not in expired
+            ]
         except Exception as exc:
             logger.error(f"cache_list_sessions_error user_id={user_id} err={exc}")
             return []
 
-    def delete_sessions_for_user(self, user_id: int) -> int:
-        pattern = f"session:{user_id}:*"
+    async def delete_sessions_for_user(self, user_id: int) -> int:
+        index, expiry = self._session_keys(user_id)
         try:
-            keys = list(self.client.scan_iter(match=pattern))
-            if not keys:
-                return 0
-            deleted = self.client.delete(*keys)
-            logger.info(f"cache_del_sessions user_id={user_id} count={deleted}")
-            return int(deleted or 0)
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.zcount(expiry, f"({time.time()}", "+inf")
+                pipe.delete(index, expiry)
+                active, _ = await pipe.execute()
+            logger.info(f"cache_del_sessions user_id={user_id} count={active}")
+            return int(active or 0)
         except Exception as exc:
             logger.error(f"cache_del_sessions_error user_id={user_id} err={exc}")
             return 0
+
+
+# Один пул и один клиент на процесс; жизненный цикл — init_cache/close_cache в main.py
+_pool: Optional[InstrumentedConnectionPool] = None
+_cache: Optional[AsyncCacheService] = None
+_listener: Optional[asyncio.Task] = None
+
+
+def _create_pool() -> InstrumentedConnectionPool:
+    return InstrumentedConnectionPool.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        max_connections=REDIS_POOL_SIZE,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+
+
+def get_cache() -> AsyncCacheService:
+    """FastAPI-зависимость: общий кэш процесса (создаётся лениво, если приложение не вызвало init_cache)."""
+    global _pool, _cache
+    if _cache is None:
+        _pool = _create_pool()
+        local = LocalCache(L1_CACHE_MAX_SIZE, L1_CACHE_TTL) if L1_CACHE_ENABLED else None
+        _cache = AsyncCacheService(aioredis.Redis(connection_pool=_pool), local)
+    return _cache
+
+
+async def init_cache() -> None:
+    global _listener
+    cache = get_cache()
+    if await cache.ping():
+        logger.info(f"cache_ready url={REDIS_URL} pool_size={REDIS_POOL_SIZE} l1={L1_CACHE_ENABLED}")
+    else:
+        logger.warning(f"cache_unavailable url={REDIS_URL}")
+    if cache.local is not None and _listener is None:
+        _listener = asyncio.create_task(cache.listen_invalidations())
+
+
+async def close_cache() -> None:
+    global _pool, _cache, _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
+    if _cache is not None:
+        await _cache.client.aclose()
+    if _pool is not None:
+        await _pool.disconnect()
+    _pool = None
+    _cache = None
+
+
+def pool_stats() -> dict:
+    return _pool.stats() if _pool is not None else {}
+
+
+def cache_stats() -> dict:
+    return _cache.stats() if _cache is not None else {}
+
+
+register_collector("redis_pool", pool_stats)
+register_collector("cache", cache_stats)
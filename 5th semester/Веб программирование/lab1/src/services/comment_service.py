@@ -1,15 +1,29 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.comment import Comment
+from src.pagination import decode_cursor
 from src.schemas.comment import CommentCreate, CommentUpdate
+from src.services.cache import AsyncCacheService
+from src.streaming import EXPORT_FETCH_SIZE, stream_partitions
+
+
+def _comment_payload(comment: Comment) -> dict:
+    return {
+        "id": comment.id,
+        "text": comment.text,
+        "news_id": comment.news_id,
+        "author_id": comment.author_id,
+        "publication_date": comment.publication_date,
+    }
 
 
 class CommentService:
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, cache: AsyncCacheService) -> None:
         self.db = db
+        self.cache = cache
 
     async def create_comment(self, comment: CommentCreate) -> Comment:
         db_comment = Comment(**comment.model_dump())
@@ -22,39 +36,61 @@ class CommentService:
         result = await self.db.execute(select(Comment).where(Comment.id == comment_id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: List[int]) -> List[dict]:
+        async def load(missing: List[int]) -> Dict[int, dict]:
+            result = await self.db.execute(select(Comment).where(Comment.id.in_(missing)))
+            return {c.id: _comment_payload(c) for c in result.scalars().all()}
+
+        found = await self.cache.get_comments_many(ids, load)
+        return [found[comment_id] for comment_id in ids if comment_id in found]
+
     async def get_comments(self, skip: int = 0, limit: int = 100) -> List[Comment]:
         result = await self.db.execute(
             select(Comment).order_by(Comment.id).offset(skip).limit(limit)
         )
         return list(result.scalars().all())
 
-    async def get_comments_by_news(self, news_id: int) -> List[Comment]:
-        result = await self.db.execute(select(Comment).where(Comment.news_id == news_id))
+    async def get_comments_after(self, cursor: str, limit: int = 100) -> List[Comment]:
+        (last_id,) = decode_cursor(cursor, 1)
+        if not isinstance(last_id, int):
+            raise ValueError("Invalid cursor")
+        result = await self.db.execute(
+            select(Comment).where(Comment.id > last_id).order_by(Comment.id).limit(limit)
+        )
         return list(result.scalars().all())
 
-    async def update_comment(
-        self,
-        comment_id: int,
-        comment_update: CommentUpdate,
-    ) -> Optional[Comment]:
-        db_comment = await self.get_comment(comment_id)
-        if not db_comment:
-            return None
+    def export(self, fetch_size: int = EXPORT_FETCH_SIZE) -> AsyncIterator[List[dict]]:
+        """Все комментарии по id порциями из серверного курсора."""
+        stmt = select(
+            Comment.id, Comment.text, Comment.news_id, Comment.author_id, Comment.publication_date
+        ).order_by(Comment.id)
+        return stream_partitions(self.db, stmt, fetch_size)
+
+    async def get_comments_by_news(
+        self, news_id: int, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Comment]:
+        # Индекс (news_id, id): страница читается с места курсора, без OFFSET
+        stmt = select(Comment).where(Comment.news_id == news_id).order_by(Comment.id).limit(limit)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            if not isinstance(last_id, int):
+                raise ValueError("Invalid cursor")
+            stmt = stmt.where(Comment.id > last_id)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
 
+    # Комментарий уже загружен и проверен get_comment_with_permission в той же сессии
+    async def update_comment(self, db_comment: Comment, comment_update: CommentUpdate) -> Comment:
         update_data = comment_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_comment, field, value)
 
         await self.db.commit()
-        await self.db.refresh(db_comment)
+        await self.cache.delete_comments([db_comment.id])
         return db_comment
 
-    async def delete_comment(self, comment_id: int) -> bool:
-        db_comment = await self.get_comment(comment_id)
-        if not db_comment:
-            return False
-
+    async def delete_comment(self, db_comment: Comment) -> None:
         await self.db.delete(db_comment)
         await self.db.commit()
-        return True
+        await self.cache.delete_comments([db_comment.id])
 
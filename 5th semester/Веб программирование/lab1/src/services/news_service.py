@@ -1,15 +1,71 @@
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from src.models.news import News
+from sqlalchemy import delete, func, literal_column, select, table, tuple_
+from src.database import on_replica
+from src.fast_json import dumps
+from src.models.comment import Comment
+from src.models.news import SEARCH_CONFIG, News
 from src.models.user import User
 from src.schemas.news import NewsCreate, NewsUpdate
-from typing import List, Optional
-from src.services.cache import SyncCacheService
+from typing import AsyncIterator, List, Optional
+from src.pagination import decode_cursor, next_cursor
+from src.services.cache import AsyncCacheService
+from src.streaming import EXPORT_FETCH_SIZE, stream_partitions
 from src.tasks.notifications import notify_new_news
 
+
+def _news_payload(news: News) -> dict:
+    return {
+        "id": news.id,
+        "title": news.title,
+        "content": news.content,
+        "publication_date": news.publication_date,
+        "author_id": news.author_id,
+        "cover": news.cover,
+    }
+
+
+def _feed_payload(news: News) -> dict:
+    return {**_news_payload(news), "comments_count": news.comments_count, "last_comment_at": news.last_comment_at}
+
+
+def _after_cursor(cursor: str):
+    """Условие keyset-страницы ленты после курсора (publication_date, id)."""
+    published, news_id = decode_cursor(cursor, 2)
+    try:
+        published = datetime.fromisoformat(published)
+        news_id = int(news_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    return tuple_(News.publication_date, News.id) < (published, news_id)
+
+
+# Колонки NewsResponse: выгрузка и быстрый путь списка читают строки без ORM-объектов
+NEWS_COLUMNS = (News.id, News.title, News.content, News.publication_date, News.author_id, News.cover)
+
+
+def _ordered():
+    # Лента от новых к старым; id делает порядок однозначным при равных датах
+    return select(News).order_by(News.publication_date.desc(), News.id.desc())
+
+
+def news_cursor(items: List[dict], limit: int) -> Optional[str]:
+    return next_cursor(items, limit, lambda n: (n["publication_date"], n["id"]))
+
+
+def search_cursor(items: List[dict], limit: int) -> Optional[str]:
+    return next_cursor(items, limit, lambda n: (n["rank"], n["id"]))
+
+
+def _fts5_query(q: str) -> str:
+    # Каждое слово — фраза в кавычках: операторы FTS5 из пользовательского ввода не работают
+    return " ".join('"' + word.replace('"', '""') + '"' for word in q.split())
+
+
 class NewsService:
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, cache: AsyncCacheService) -> None:
         self.db = db
+        self.cache = cache
 
     async def create(self, news: NewsCreate) -> Optional[News]:
         result = await self.db.execute(select(User).where(User.id == news.author_id))
@@ -28,75 +84,133 @@ class NewsService:
             # Не блокируем основной поток, если брокер недоступен
             import logging
             logging.getLogger(__name__).error("notify_new_news_enqueue_failed id=%s err=%s", db_news.id, exc)
-        # Инвалидация списков новостей: достаточно не делать ничего — TTL очистит. При желании можно чистить ключи по шаблону.
+        # Новая новость меняет все страницы списка — переходим на следующее поколение ключей
+        await self.cache.invalidate_news_lists()
         return db_news
 
     async def get(self, news_id: int):
-        cache = SyncCacheService()
-        cached = cache.get_news(news_id)
-        if cached:
-            return cached
-        result = await self.db.execute(select(News).where(News.id == news_id))
-        db_news = result.scalar_one_or_none()
-        if db_news:
-            payload = {
-                "id": db_news.id,
-                "title": db_news.title,
-                "content": db_news.content,
-                "publication_date": db_news.publication_date,
-                "author_id": db_news.author_id,
-                "cover": db_news.cover,
-            }
-            cache.set_news(news_id, payload)
-            return payload
-        return None
+        async def load() -> Optional[dict]:
+            result = await self.db.execute(on_replica(select(News).where(News.id == news_id)))
+            db_news = result.scalar_one_or_none()
+            return _news_payload(db_news) if db_news else None
+
+        return await self.cache.get_news(news_id, load)
+
+    async def get_many(self, ids: List[int]) -> List[dict]:
+        """Новости по списку id в том же порядке; несуществующие id пропускаются."""
+        async def load(missing: List[int]) -> dict:
+            result = await self.db.execute(on_replica(select(News).where(News.id.in_(missing))))
+            return {n.id: _news_payload(n) for n in result.scalars().all()}
+
+        found = await self.cache.get_news_many(ids, load)
+        return [found[news_id] for news_id in ids if news_id in found]
 
     async def list(self, skip: int = 0, limit: int = 100):
-        cache = SyncCacheService()
-        cached = cache.get_news_list(skip, limit)
-        if cached:
-            return cached
-        result = await self.db.execute(select(News).offset(skip).limit(limit))
-        items: List[News] = list(result.scalars().all())
-        payload = [
-            {
-                "id": n.id,
-                "title": n.title,
-                "content": n.content,
-                "publication_date": n.publication_date,
-                "author_id": n.author_id,
-                "cover": n.cover,
-            }
-            for n in items
-        ]
-        if payload:
-            cache.set_news_list(skip, limit, payload)
-        return payload
-
-    async def update(self, news_id: int, news_update: NewsUpdate) -> Optional[News]:
-        result = await self.db.execute(select(News).where(News.id == news_id))
-        db_news = result.scalar_one_or_none()
-        if not db_news:
-            return None
-        
+        async def load() -> list:
+            result = await self.db.execute(on_replica(_ordered().offset(skip).limit(limit)))
+            items: List[News] = list(result.scalars().all())
+            return [_news_payload(n) for n in items]
+
+        return await self.cache.get_news_list(skip, limit, load)
+
+    async def list_json(self, skip: int = 0, limit: int = 100) -> dict:
+        """
+        Страница списка как готовый JSON и курсор следующей страницы. Строки читаются
+        колонками и сериализуются один раз при промахе кэша; при попадании закэшированное
+        тело уходит клиенту как есть.
+        """
+        async def load() -> dict:
+            stmt = _ordered().with_only_columns(*NEWS_COLUMNS).offset(skip).limit(limit)
+            result = await self.db.execute(on_replica(stmt))
+            items = [dict(row._mapping) for row in result]
+            return {"body": dumps(items), "next_cursor": news_cursor(items, limit)}
+
+        return await self.cache.get_news_list_json(skip, limit, load)
+
+    async def list_after(self, cursor: str, limit: int = 100) -> List[dict]:
+        """Страница ленты после курсора (keyset). ValueError — если курсор некорректен."""
+        result = await self.db.execute(on_replica(_ordered().where(_after_cursor(cursor)).limit(limit)))
+        return [_news_payload(n) for n in result.scalars().all()]
+
+    async def feed(self, limit: int = 20, cursor: Optional[str] = None) -> List[dict]:
+        """
+        Лента с числом комментариев и временем последнего: счётчики хранятся в самой
+        новости, поэтому страница — один запрос без обращений к comments.
+        """
+        stmt = _ordered().limit(limit)
+        if cursor:
+            stmt = stmt.where(_after_cursor(cursor))
+        result = await self.db.execute(on_replica(stmt))
+        return [_feed_payload(n) for n in result.scalars().all()]
+
+    async def search(self, q: str, limit: int = 20, cursor: Optional[str] = None) -> List[dict]:
+        """
+        Полнотекстовый поиск по заголовку и строкам content, от релевантных к менее
+        релевантным. Курсор — (rank, id) последней строки; ValueError, если он некорректен.
+        """
+        after = None
+        if cursor:
+            rank, news_id = decode_cursor(cursor, 2)
+            if not isinstance(rank, (int, float)) or not isinstance(news_id, int):
+                raise ValueError("Invalid cursor")
+            after = (rank, news_id)
+
+        # Диалект берём у движка, не открывая соединение с основной БД: сам поиск идёт в реплику
+        if self.db.get_bind().dialect.name == "postgresql":
+            query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+            vector = literal_column("news.search_vector")
+            matches = select(News.id, func.ts_rank_cd(vector, query).label("rank")).where(vector.op("@@")(query))
+        else:
+            match = _fts5_query(q)
+            if not match:
+                return []
+            fts = table("news_fts")
+            # bm25 меньше у более релевантных строк; заголовок весит в 10 раз больше текста
+            matches = (
+                select(
+                    literal_column("news_fts.rowid").label("id"),
+                    (-func.bm25(literal_column("news_fts"), 10.0, 1.0)).label("rank"),
+                )
+                .select_from(fts)
+                .where(literal_column("news_fts").op("MATCH")(match))
+            )
+        ranked = matches.subquery()
+        stmt = (
+            select(News, ranked.c.rank)
+            .join(ranked, ranked.c.id == News.id)
+            .order_by(ranked.c.rank.desc(), News.id.desc())
+            .limit(limit)
+        )
+        if after:
+            stmt = stmt.where(tuple_(ranked.c.rank, News.id) < after)
+        result = await self.db.execute(on_replica(stmt))
+        return [{**_news_payload(news), "rank": rank} for news, rank in result.all()]
+
+    def export(self, fetch_size: int = EXPORT_FETCH_SIZE) -> AsyncIterator[List[dict]]:
+        """Все новости по id порциями из серверного курсора, без ORM-объектов и кэша."""
+        return stream_partitions(self.db, select(*NEWS_COLUMNS).order_by(News.id), fetch_size)
+
+    # update/delete получают новость, уже загруженную и проверенную get_news_with_permission
+    # в той же сессии, поэтому повторно её не выбирают
+    async def update(self, db_news: News, news_update: NewsUpdate) -> News:
         update_data = news_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_news, field, value)
-        
+
+        # expire_on_commit=False: атрибуты остаются актуальными, refresh не нужен
         await self.db.commit()
-        await self.db.refresh(db_news)
-        # Инвалидируем кэш конкретной новости
-        SyncCacheService().delete(f"news:{news_id}")
+        # Инвалидируем кэш конкретной новости и страницы списка
+        await self.cache.delete_news(db_news.id)
+        await self.cache.invalidate_news_lists()
         return db_news
 
-    async def delete(self, news_id: int) -> bool:
-        result = await self.db.execute(select(News).where(News.id == news_id))
-        db_news = result.scalar_one_or_none()
-        if not db_news:
-            return False
-        
-        await self.db.delete(db_news)
+    async def delete(self, db_news: News) -> None:
+        # Каскад одним запросом вместо загрузки комментариев и удаления по одному
+        result = await self.db.execute(delete(Comment).where(Comment.news_id == db_news.id).returning(Comment.id))
+        comment_ids = list(result.scalars())
+        await self.db.execute(delete(News).where(News.id == db_news.id))
         await self.db.commit()
-        SyncCacheService().delete(f"news:{news_id}")
-        return True
+        await self.cache.delete_news(db_news.id)
+        await self.cache.delete_comments(comment_ids)
+        await self.cache.invalidate_news_lists()
 
@@ -0,0 +1,106 @@
+"""
+Хэширование паролей вне event loop.
+
+Argon2 занимает десятки миллисекунд CPU; вызванный прямо в корутине, он
+останавливает обработку всех остальных запросов воркера. Здесь хэширование и
+проверка выполняются в отдельном пуле потоков ограниченного размера (argon2-cffi
+отпускает GIL, так что потоки работают параллельно). Запросы сверх размера пула
+ждут своей очереди, а если очередь длиннее PASSWORD_HASH_MAX_QUEUE — отклоняются
+сразу (PasswordHasherBusy), чтобы всплеск логинов не копил бесконечные ожидания.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Optional, TypeVar
+
+from passlib.context import CryptContext
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))  # ожидающих сверх занятых потоков
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(Exception):
+    """Очередь на хэширование переполнена."""
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, workers: int, max_queue: int) -> None:
+        self.context = context
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self.completed = 0
+        # Последние замеры, мс: время в очереди и время самого хэширования
+        self._wait_ms: Deque[float] = deque(maxlen=1000)
+        self._hash_ms: Deque[float] = deque(maxlen=1000)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(self.context.verify, password, password_hash)
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        if self._loop is not loop:
+            # Семафор привязан к event loop, в котором его впервые ждали
+            self._slots, self._loop = asyncio.Semaphore(self.workers), loop
+        if self._slots.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        enqueued = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        started = time.perf_counter()
+        self._wait_ms.append((started - enqueued) * 1000)
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+            self.completed += 1
+            self._hash_ms.append((time.perf_counter() - started) * 1000)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor, self._slots, self._loop = None, None, None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_ms": _summary(self._wait_ms),
+            "hash_ms": _summary(self._hash_ms),
+        }
+
+
+def _summary(samples: Deque[float]) -> dict:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": round(ordered[len(ordered) // 2], 2),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max": round(ordered[-1], 2),
+    }
@@ -0,0 +1,146 @@
+"""
+Массовый импорт и выгрузка пользователей.
+
+Импорт разбирает NDJSON/CSV из тела запроса по мере поступления и пишет пачками
+по USER_IMPORT_BATCH_SIZE: в PostgreSQL — COPY во временную таблицу и
+INSERT ... ON CONFLICT (email) DO NOTHING, в SQLite — пакетный INSERT OR IGNORE.
+Открытые пароли хэшируются в пуле процессов (USER_IMPORT_HASH_WORKERS). Argon2
+остаётся самой дорогой частью импорта, поэтому при переносе из другой системы
+лучше передавать готовый password_hash: он сохраняется как есть и пересчитывается
+с текущими параметрами при первом входе пользователя.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.user import User
+from src.schemas.user import UserImport
+from src.services.auth_service import pwd_context
+from src.streaming import EXPORT_FETCH_SIZE, read_records, stream_partitions
+
+USER_IMPORT_BATCH_SIZE = int(os.getenv("USER_IMPORT_BATCH_SIZE", "5000"))
+USER_IMPORT_HASH_WORKERS = int(os.getenv("USER_IMPORT_HASH_WORKERS", str(os.cpu_count() or 1)))
+MAX_REPORTED_ERRORS = 20
+
+IMPORT_COLUMNS = ("name", "email", "password_hash", "registration_date", "is_verified_author", "avatar", "role")
+EXPORT_COLUMNS = ("id", "name", "email", "role", "is_verified_author", "avatar", "registration_date")
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _hash_passwords(passwords: List[str]) -> List[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """Хэширует пароли, разделив их поровну между процессами пула."""
+    global _hash_pool
+    if not passwords:
+        return []
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=USER_IMPORT_HASH_WORKERS)
+    loop = asyncio.get_running_loop()
+    size = -(-len(passwords) // USER_IMPORT_HASH_WORKERS)
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(_hash_pool, _hash_passwords, passwords[i:i + size])
+        for i in range(0, len(passwords), size)
+    ))
+    return [password_hash for part in parts for password_hash in part]
+
+
+def close_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+class UserBulkService:
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def import_users(self, chunks: AsyncIterator[bytes], fmt: str) -> dict:
+        report = {"imported": 0, "skipped": 0, "rejected": 0, "errors": []}
+        batch: List[UserImport] = []
+        async for line_no, record, error in read_records(chunks, fmt):
+            user = None
+            if error is None:
+                try:
+                    user = UserImport.model_validate(record)
+                    if user.password_hash and not user.password and not pwd_context.identify(user.password_hash):
+                        error = "неизвестный формат password_hash"
+                except ValidationError as exc:
+                    error = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors())
+            if error is not None:
+                report["rejected"] += 1
+                if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                    report["errors"].append(f"строка {line_no}: {error}")
+                continue
+            batch.append(user)
+            if len(batch) >= USER_IMPORT_BATCH_SIZE:
+                await self._write_batch(batch, report)
+                batch = []
+        if batch:
+            await self._write_batch(batch, report)
+        return report
+
+    async def _write_batch(self, batch: List[UserImport], report: dict) -> None:
+        hashes = iter(await hash_passwords([user.password for user in batch if user.password]))
+        now = datetime.utcnow()
+        rows = [
+            {
+                "name": user.name,
+                "email": user.email,
+                "password_hash": next(hashes) if user.password else user.password_hash,
+                "registration_date": now,
+                "is_verified_author": user.is_verified_author,
+                "avatar": user.avatar,
+                "role": user.role,
+            }
+            for user in batch
+        ]
+        conn = await self.db.connection()
+        if conn.dialect.name == "postgresql":
+            inserted = await self._copy_rows(rows)
+        else:
+            stmt = sqlite_insert(User.__table__).on_conflict_do_nothing(index_elements=["email"])
+            inserted = (await conn.execute(stmt, rows)).rowcount
+        await self.db.commit()
+        report["imported"] += inserted
+        report["skipped"] += len(rows) - inserted
+
+    async def _copy_rows(self, rows: List[dict]) -> int:
+        conn = await self.db.connection()
+        # Временная таблица без ограничений: COPY не прерывается на повторяющемся email,
+        # дубликаты отбрасывает INSERT ... ON CONFLICT. Строки очищаются при commit.
+        await conn.exec_driver_sql(
+            "CREATE TEMP TABLE IF NOT EXISTS users_import ON COMMIT DELETE ROWS AS "
+            f"SELECT {', '.join(IMPORT_COLUMNS)} FROM users WITH NO DATA"
+        )
+        raw = await conn.get_raw_connection()
+        # Enum userrole в PostgreSQL хранит имена (USER, AUTHOR, ADMIN)
+        records = [tuple(row[c].name if c == "role" else row[c] for c in IMPORT_COLUMNS) for row in rows]
+        await raw.driver_connection.copy_records_to_table("users_import", records=records, columns=IMPORT_COLUMNS)
+        columns = ", ".join(IMPORT_COLUMNS)
+        result = await conn.exec_driver_sql(
+            f"INSERT INTO users ({columns}) SELECT {columns} FROM users_import ON CONFLICT (email) DO NOTHING"
+        )
+        return result.rowcount
+
+    def export_users(self, fetch_size: int = EXPORT_FETCH_SIZE) -> AsyncIterator[List[dict]]:
+        stmt = select(*(getattr(User, column) for column in EXPORT_COLUMNS)).order_by(User.id)
+        return _with_role_values(stream_partitions(self.db, stmt, fetch_size))
+
+
+async def _with_role_values(partitions: AsyncIterator[List[dict]]) -> AsyncIterator[List[dict]]:
+    async for rows in partitions:
+        for row in rows:
+            row["role"] = row["role"].value
+        yield rows
@@ -1,15 +1,33 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.user import User
+from src.pagination import decode_cursor
 from src.schemas.user import UserCreate, UserUpdate
+from src.services.cache import AsyncCacheService
+
+
+def cached_user_payload(user: User) -> dict:
+    """Запись user:{id} в кэше: её читают get_current_user и пакетный GET /users/?ids=."""
+    return {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role": user.role.value,
+        "is_verified_author": user.is_verified_author,
+        "avatar": user.avatar,
+        "registration_date": user.registration_date.isoformat()
+        if user.registration_date
+        else None,
+    }
 
 
 class UserService:
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, cache: AsyncCacheService) -> None:
         self.db = db
+        self.cache = cache
 
     async def create_user(self, user: UserCreate) -> User:
         db_user = User(**user.model_dump())
@@ -22,8 +40,23 @@ class UserService:
         result = await self.db.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: List[int]) -> List[dict]:
+        async def load(missing: List[int]) -> Dict[int, dict]:
+            result = await self.db.execute(select(User).where(User.id.in_(missing)))
+            return {u.id: cached_user_payload(u) for u in result.scalars().all()}
+
+        found = await self.cache.get_users_many(ids, load)
+        return [found[user_id] for user_id in ids if user_id in found]
+
     async def get_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        result = await self.db.execute(select(User).offset(skip).limit(limit))
+        result = await self.db.execute(select(User).order_by(User.id).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_users_after(self, cursor: str, limit: int = 100) -> List[User]:
+        (last_id,) = decode_cursor(cursor, 1)
+        if not isinstance(last_id, int):
+            raise ValueError("Invalid cursor")
+        result = await self.db.execute(select(User).where(User.id > last_id).order_by(User.id).limit(limit))
         return list(result.scalars().all())
 
     async def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[User]:
@@ -37,6 +70,8 @@ class UserService:
 
         await self.db.commit()
         await self.db.refresh(db_user)
+        # Кэш пользователя читается в get_current_user — сбрасываем во всех воркерах
+        await self.cache.delete_user(user_id)
         return db_user
 
     async def delete_user(self, user_id: int) -> bool:
@@ -46,5 +81,6 @@ class UserService:
 
         await self.db.delete(db_user)
         await self.db.commit()
+        await self.cache.delete_user(user_id)
         return True
 
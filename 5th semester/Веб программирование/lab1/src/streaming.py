@@ -0,0 +1,102 @@
+"""
+Потоковые выгрузки и загрузки построчных форматов (NDJSON, CSV).
+
+Выгрузка читает строки серверным курсором (AsyncSession.stream) порциями по
+EXPORT_FETCH_SIZE и отдаёт каждую порцию клиенту сразу, поэтому память не
+зависит от размера таблицы. Загрузка разбирает тело запроса по строкам по мере
+его поступления.
+"""
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+async def stream_partitions(
+    db: AsyncSession, stmt: Select, fetch_size: int = EXPORT_FETCH_SIZE
+) -> AsyncIterator[List[dict]]:
+    """Строки запроса порциями по fetch_size, каждая строка — словарь колонок."""
+    result = await db.stream(stmt.execution_options(yield_per=fetch_size))
+    async for partition in result.partitions():
+        yield [dict(row._mapping) for row in partition]
+
+
+async def ndjson_stream(partitions: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    async for rows in partitions:
+        yield "".join(json.dumps(row, default=str, ensure_ascii=False) + "\n" for row in rows).encode()
+
+
+async def csv_stream(partitions: AsyncIterator[List[dict]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    async for rows in partitions:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Строки тела запроса байтами по мере поступления кусков (многострочные поля CSV
+    не поддерживаются). Декодирует read_records, чтобы ошибка кодировки в одной
+    строке не обрывала весь импорт.
+    """
+    tail = b""
+    async for chunk in chunks:
+        *lines, tail = (tail + chunk).split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if tail:
+        yield tail.rstrip(b"\r")
+
+
+async def read_records(
+    chunks: AsyncIterator[bytes], fmt: str
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Записи NDJSON или CSV (первая строка — заголовок) из тела запроса:
+    (номер строки, запись, ошибка разбора). Пустые строки пропускаются.
+    """
+    header: Optional[List[str]] = None
+    line_no = 0
+    async for raw in read_lines(chunks):
+        line_no += 1
+        try:
+            line = raw.decode()
+        except UnicodeDecodeError:
+            yield line_no, None, "не UTF-8"
+            continue
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = values
+                continue
+            if len(values) != len(header):
+                yield line_no, None, f"ожидалось {len(header)} полей, получено {len(values)}"
+                continue
+            # Пустая ячейка CSV — отсутствующее значение
+            yield line_no, {key: value for key, value in zip(header, values) if value != ""}, None
+        else:
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_no, None, f"некорректный JSON: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "ожидался JSON-объект"
+                continue
+            yield line_no, record, None
@@ -1,36 +1,83 @@
 from __future__ import annotations
-import asyncio
+import hashlib
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional, Tuple
 
 import redis
+from celery import chord
 
 from src.celery_app import celery_app, logger as notif_logger
-from src.database import SessionLocal
-from sqlalchemy import select
+from src.tasks import runtime
+from sqlalchemy import func, select
 from src.models.user import User
 from src.models.news import News
 
-REDIS_URL = redis.Redis.from_url
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+# Сколько пользователей обрабатывает одна подзадача рассылки
+NOTIFY_CHUNK_SIZE = int(os.getenv("NOTIFY_CHUNK_SIZE", "1000"))
+NEW_NEWS_IDEMPOTENCY_TTL = 7 * 24 * 3600
+DIGEST_IDEMPOTENCY_TTL = 10 * 24 * 3600
+PROGRESS_TTL = 7 * 24 * 3600
 
-_redis = redis.Redis.from_url(
-    # Reuse same REDIS_URL env as cache
-    # Default DB 0 for idempotency flags
-    # decode_responses for str keys
-    connection_pool=redis.ConnectionPool.from_url(
-        __import__("os").getenv("REDIS_URL", "redis://localhost:6379"), decode_responses=True
-    )
-)
+# Один пул соединений на процесс воркера (DB 0 — флаги идемпотентности)
+_redis = redis.Redis(connection_pool=redis.ConnectionPool.from_url(REDIS_URL, decode_responses=True))
 
 
-def _idempotent_once(key: str, ttl_seconds: int) -> bool:
+def _idempotent_many(keys: List[str], ttl_seconds: int) -> List[bool]:
+    """SET NX для пачки ключей за один round trip; True — ключ поставлен впервые."""
     try:
-        return _redis.set(name=key, value="1", nx=True, ex=ttl_seconds) is True
+        with _redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(name=key, value="1", nx=True, ex=ttl_seconds)
+            return [result is True for result in pipe.execute()]
     except Exception as exc:
-        notif_logger.error("idempotency_error key=%s err=%s", key, exc)
+        notif_logger.error("idempotency_error keys=%s err=%s", len(keys), exc)
         # Fail-open to avoid blocking notifications entirely
-        return True
+        return [True] * len(keys)
+
+
+def _progress_key(news_id: int) -> str:
+    return f"notif:progress:new_news:{news_id}"
+
+
+def _track_progress(news_id: int, **increments: int) -> None:
+    try:
+        with _redis.pipeline(transaction=False) as pipe:
+            for field, amount in increments.items():
+                pipe.hincrby(_progress_key(news_id), field, amount)
+            pipe.expire(_progress_key(news_id), PROGRESS_TTL)
+            pipe.execute()
+    except Exception as exc:
+        notif_logger.error("progress_error news_id=%s err=%s", news_id, exc)
+
+
+def notification_progress(news_id: int) -> dict:
+    """Прогресс рассылки о новости: status, chunks, chunks_done, sent, skipped."""
+    return _redis.hgetall(_progress_key(news_id))
+
+
+async def _plan_user_ranges(session, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Делит пользователей на диапазоны id (lo, hi] примерно по chunk_size строк.
+    Границы ищутся по индексу первичного ключа, сами строки в память не загружаются.
+    """
+    ranges: List[Tuple[int, int]] = []
+    last_id = 0
+    while True:
+        upper: Optional[int] = (
+            await session.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id).offset(chunk_size - 1).limit(1)
+            )
+        ).scalar_one_or_none()
+        if upper is None:
+            upper = (await session.execute(select(func.max(User.id)).where(User.id > last_id))).scalar()
+            if upper is not None:
+                ranges.append((last_id, upper))
+            return ranges
+        ranges.append((last_id, upper))
+        last_id = upper
 
 
 def _format_news(news: News) -> str:
@@ -43,72 +90,174 @@ def _format_news(news: News) -> str:
 def notify_new_news(news_id: int) -> int:
     """
     Мок-уведомления всем пользователям о новой новости. Логируем в файл вместо email.
-    Идемпотентность: не дублировать отправку одной и той же новости одному и тому же пользователю.
+    Задача только планирует рассылку: делит пользователей на диапазоны id и запускает
+    по подзадаче notify_new_news_chunk на диапазон (chord), итог — в notify_new_news_done.
+    Прогресс — в Redis-хэше notif:progress:new_news:{news_id}. Возвращает число подзадач.
     """
     notif_logger.info("task_start name=notify_new_news news_id=%s", news_id)
 
-    async def _run() -> int:
-        async with SessionLocal() as session:
-            news = (await session.execute(select(News).where(News.id == news_id))).scalar_one_or_none()
-            if not news:
+    async def _run() -> Optional[List[Tuple[int, int]]]:
+        async with runtime.session() as session:
+            news_exists = (await session.execute(select(News.id).where(News.id == news_id))).scalar_one_or_none()
+            if news_exists is None:
                 notif_logger.warning("news_not_found id=%s", news_id)
-                return 0
-            users: List[User] = list((await session.execute(select(User))).scalars().all())
-            sent = 0
-            for user in users:
-                idem_key = f"notif:new_news:{news.id}:{user.id}"
-                if not _idempotent_once(idem_key, ttl_seconds=7 * 24 * 3600):
-                    continue
-                notif_logger.info(
-                    "send_new_news to=%s user_id=%s news=%s",
-                    user.email,
-                    user.id,
-                    _format_news(news),
+                return None
+            return await _plan_user_ranges(session, NOTIFY_CHUNK_SIZE)
+
+    ranges = runtime.run(_run())
+    if ranges is None:
+        return 0
+    with _redis.pipeline() as pipe:
+        pipe.delete(_progress_key(news_id))
+        pipe.hset(
+            _progress_key(news_id),
+            mapping={"status": "running" if ranges else "done", "chunks": len(ranges), "chunks_done": 0, "sent": 0},
+        )
+        pipe.expire(_progress_key(news_id), PROGRESS_TTL)
+        pipe.execute()
+    if not ranges:
+        return 0
+    chord(notify_new_news_chunk.s(news_id, lo, hi) for lo, hi in ranges)(notify_new_news_done.s(news_id))
+    notif_logger.info("notify_new_news_planned news_id=%s chunks=%s", news_id, len(ranges))
+    return len(ranges)
+
+
+@celery_app.task(
+    autoretry_for=(Exception,), retry_backoff=5, retry_jitter=True, retry_kwargs={"max_retries": 5}, acks_late=True
+)
+def notify_new_news_chunk(news_id: int, after_id: int, until_id: int) -> int:
+    """
+    Рассылка о новости пользователям с after_id < id <= until_id.
+    Идемпотентность: не дублировать отправку одной и той же новости одному и тому же пользователю
+    (SET NX по всем пользователям диапазона одним pipeline). Возвращает число отправленных.
+    """
+
+    async def _run():
+        async with runtime.session() as session:
+            news = (await session.execute(select(News).where(News.id == news_id))).scalar_one_or_none()
+            users = (
+                await session.execute(
+                    select(User.id, User.email)
+                    .where(User.id > after_id, User.id <= until_id)
+                    .order_by(User.id)
                 )
-                sent += 1
-            return sent
+            ).all()
+            return news, users
+
+    news, users = runtime.run(_run())
+    if not news:
+        notif_logger.warning("news_not_found id=%s", news_id)
+        return 0
+    fresh = _idempotent_many(
+        [f"notif:new_news:{news_id}:{user_id}" for user_id, _ in users], ttl_seconds=NEW_NEWS_IDEMPOTENCY_TTL
+    )
+    sent = 0
+    formatted = _format_news(news)
+    for (user_id, email), is_new in zip(users, fresh):
+        if not is_new:
+            continue
+        notif_logger.info("send_new_news to=%s user_id=%s news=%s", email, user_id, formatted)
+        sent += 1
+    _track_progress(news_id, chunks_done=1, sent=sent, skipped=len(users) - sent)
+    return sent
+
+
+@celery_app.task(acks_late=True)
+def notify_new_news_done(results: List[int], news_id: int) -> int:
+    sent = sum(results)
+    try:
+        _redis.hset(_progress_key(news_id), mapping={"status": "done", "finished_at": datetime.now().isoformat()})
+    except Exception as exc:
+        notif_logger.error("progress_error news_id=%s err=%s", news_id, exc)
+    notif_logger.info("task_done name=notify_new_news news_id=%s sent=%s chunks=%s", news_id, sent, len(results))
+    return sent
 
-    return asyncio.run(_run())
+
+def _render_digest(titles: List[str]) -> str:
+    return ", ".join(titles) if titles else "(нет новостей)"
 
 
 @celery_app.task(
     autoretry_for=(Exception,), retry_backoff=10, retry_jitter=True, retry_kwargs={"max_retries": 5}, acks_late=True
 )
-def send_weekly_digest() -> int:
+def send_weekly_digest(dry_run: bool = False) -> int:
     """
     Еженедельный дайджест: собираем новости за последнюю неделю и логируем, как будто рассылаем.
+    Текст дайджеста собирается один раз и кладётся в Redis под своим sha256; рассылку по
+    диапазонам id пользователей выполняют параллельные подзадачи send_weekly_digest_chunk.
     Идемпотентность: один дайджест на пользователя в рамках недели (по ISO-неделе).
+    dry_run — пройти всех пользователей, ничего не отправляя и не помечая. Возвращает число подзадач.
     """
     now = datetime.now()
     start = now - timedelta(days=7)
     week_tag = f"{now.isocalendar().year}-W{now.isocalendar().week}"
-    notif_logger.info("task_start name=send_weekly_digest week=%s", week_tag)
+    notif_logger.info("task_start name=send_weekly_digest week=%s dry_run=%s", week_tag, dry_run)
 
-    async def _run() -> int:
-        async with SessionLocal() as session:
-            news_list: List[News] = list(
-                (await session.execute(select(News).where(News.publication_date >= start))).scalars().all()
+    async def _run() -> Tuple[List[str], List[Tuple[int, int]]]:
+        async with runtime.session() as session:
+            titles = list(
+                (
+                    await session.execute(
+                        select(News.title).where(News.publication_date >= start).order_by(News.publication_date)
+                    )
+                ).scalars()
             )
-            users: List[User] = list((await session.execute(select(User))).scalars().all())
-            if not news_list:
-                notif_logger.info("weekly_digest_empty week=%s", week_tag)
-            sent = 0
-            for user in users:
-                idem_key = f"digest:{week_tag}:user:{user.id}"
-                if not _idempotent_once(idem_key, ttl_seconds=10 * 24 * 3600):
-                    continue
-                titles = ", ".join([n.title for n in news_list]) if news_list else "(нет новостей)"
-                notif_logger.info(
-                    "send_weekly_digest to=%s user_id=%s week=%s count=%s titles=%s",
-                    user.email,
-                    user.id,
-                    week_tag,
-                    len(news_list),
-                    titles,
+            return titles, await _plan_user_ranges(session, NOTIFY_CHUNK_SIZE)
+
+    titles, ranges = runtime.run(_run())
+    if not titles:
+        notif_logger.info("weekly_digest_empty week=%s", week_tag)
+    body = _render_digest(titles)
+    digest_hash = hashlib.sha256(body.encode()).hexdigest()
+    _redis.set(f"digest:body:{digest_hash}", body, ex=DIGEST_IDEMPOTENCY_TTL)
+    notif_logger.info(
+        "weekly_digest_rendered week=%s digest=%s count=%s titles=%s", week_tag, digest_hash, len(titles), body
+    )
+    if ranges:
+        chord(
+            send_weekly_digest_chunk.s(week_tag, digest_hash, lo, hi, dry_run) for lo, hi in ranges
+        )(send_weekly_digest_done.s(week_tag))
+    return len(ranges)
+
+
+@celery_app.task(
+    autoretry_for=(Exception,), retry_backoff=10, retry_jitter=True, retry_kwargs={"max_retries": 5}, acks_late=True
+)
+def send_weekly_digest_chunk(week_tag: str, digest_hash: str, after_id: int, until_id: int, dry_run: bool = False) -> int:
+    """Дайджест пользователям с after_id < id <= until_id. Возвращает число отправленных (в dry_run — обработанных)."""
+
+    async def _run():
+        async with runtime.session() as session:
+            return (
+                await session.execute(
+                    select(User.id, User.email)
+                    .where(User.id > after_id, User.id <= until_id)
+                    .order_by(User.id)
                 )
-                sent += 1
-            return sent
+            ).all()
 
-    return asyncio.run(_run())
+    users = runtime.run(_run())
+    if dry_run:
+        return len(users)
+    if _redis.get(f"digest:body:{digest_hash}") is None:
+        notif_logger.warning("weekly_digest_body_missing week=%s digest=%s", week_tag, digest_hash)
+        return 0
+    fresh = _idempotent_many(
+        [f"digest:{week_tag}:user:{user_id}" for user_id, _ in users], ttl_seconds=DIGEST_IDEMPOTENCY_TTL
+    )
+    sent = 0
+    for (user_id, email), is_new in zip(users, fresh):
+        if not is_new:
+            continue
+        notif_logger.info(
+            "send_weekly_digest to=%s user_id=%s week=%s digest=%s", email, user_id, week_tag, digest_hash
+        )
+        sent += 1
+    return sent
 
 
+@celery_app.task(acks_late=True)
+def send_weekly_digest_done(results: List[int], week_tag: str) -> int:
+    sent = sum(results)
+    notif_logger.info("task_done name=send_weekly_digest week=%s sent=%s chunks=%s", week_tag, sent, len(results))
+    return sent
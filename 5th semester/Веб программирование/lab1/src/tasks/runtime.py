@@ -0,0 +1,71 @@
+"""
+Асинхронная среда процесса Celery-воркера.
+
+Задачи синхронные, а работа с БД — асинхронная. Вместо asyncio.run() на каждую
+задачу (новый event loop и соединения движка, привязанные к уже закрытому циклу)
+воркер держит один event loop и свой движок с пулом на всё время жизни процесса:
+они создаются на worker_process_init и закрываются при остановке процесса.
+В режиме -P solo и в eager-режиме сигнал init не приходит — среда создаётся лениво.
+"""
+import asyncio
+from typing import Awaitable, Optional, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.celery_app import logger
+from src.database import DATABASE_URL, engine_options
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def start() -> None:
+    global _loop, _engine, _sessionmaker
+    if _loop is not None:
+        return
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _engine = create_async_engine(DATABASE_URL, future=True, **engine_options(DATABASE_URL))
+    _sessionmaker = async_sessionmaker(bind=_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    logger.info("worker_runtime_started")
+
+
+def stop() -> None:
+    global _loop, _engine, _sessionmaker
+    if _loop is None:
+        return
+    try:
+        if _engine is not None:
+            _loop.run_until_complete(_engine.dispose())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
+        _loop, _engine, _sessionmaker = None, None, None
+        logger.info("worker_runtime_stopped")
+
+
+def run(coro: Awaitable[T]) -> T:
+    """Выполняет корутину задачи в event loop воркера."""
+    start()
+    return _loop.run_until_complete(coro)
+
+
+def session() -> AsyncSession:
+    """Сессия на движке воркера; использовать только внутри run()."""
+    start()
+    return _sessionmaker()
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs) -> None:
+    start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _shutdown_worker(**kwargs) -> None:
+    stop()
@@ -0,0 +1,101 @@
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import AsyncGenerator, Iterator, List, Optional
+
+# Отдельная SQLite-БД для тестов; задаём до импорта src.database
+TEST_DB_PATH = os.path.join(tempfile.gettempdir(), "news_api_test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DB_PATH}"
+
+import pytest
+import pytest_asyncio
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from main import app
+from src.database import Base, SessionLocal, engine
+from src.models.user import User, UserRole
+from src.services.auth_service import AuthService
+from src.services import cache as cache_module
+from src.services.cache import AsyncCacheService, close_cache
+from src.services.local_cache import LocalCache
+
+
+class QueryLog(list):
+    """SQL-запросы, выполненные внутри count_queries()."""
+
+    def on(self, table: str) -> List[str]:
+        """Глаголы (SELECT/UPDATE/...) запросов к таблице, в порядке выполнения."""
+        pattern = re.compile(rf"\b(FROM|INTO|UPDATE|JOIN)\s+{table}\b")
+        return [statement.split(None, 1)[0].upper() for statement in self if pattern.search(statement)]
+
+
+@contextmanager
+def _count_queries() -> Iterator[QueryLog]:
+    log = QueryLog()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield log
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def count_queries():
+    return _count_queries
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def database() -> AsyncGenerator[None, None]:
+    """Чистая схема на каждый тест."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    # Пулы БД и Redis привязаны к event loop теста
+    await close_cache()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client() -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def redis_server() -> FakeServer:
+    """Один Redis (fakeredis с Lua) на тест: несколько клиентов видят одни и те же ключи."""
+    return FakeServer()
+
+
+def fake_cache(server: FakeServer, local: Optional[LocalCache] = None) -> AsyncCacheService:
+    return AsyncCacheService(FakeRedis(server=server, decode_responses=True), local)
+
+
+@pytest.fixture
+def redis_cache(redis_server, monkeypatch) -> AsyncCacheService:
+    """Кэш процесса на fakeredis: эндпоинты и сервисы получают его через get_cache()."""
+    cache = fake_cache(redis_server)
+    monkeypatch.setattr(cache_module, "_cache", cache)
+    return cache
+
+
+async def create_user(email: str, role: UserRole = UserRole.AUTHOR) -> User:
+    async with SessionLocal() as db:
+        user = User(name=email.split("@")[0], email=email, role=role, is_verified_author=role != UserRole.USER)
+        db.add(user)
+        await db.commit()
+        return user
+
+
+def auth_headers(user: User) -> dict:
+    token = AuthService.create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,175 @@
+"""
+Слоистое приложение app/: сколько SQL-запросов и коммитов стоит запись.
+
+Репозитории пишут через INSERT/UPDATE ... RETURNING, поэтому сама запись —
+один запрос без последующего SELECT/refresh; сервис фиксирует UnitOfWork
+один раз на запрос. Middleware приложения отдаёт число запросов в заголовке
+X-SQL-Statements.
+
+Модели app/ используют типы PostgreSQL (JSONB, UUID); для тестовой SQLite
+они компилируются в JSON и CHAR(32). Отдельный файл БД, чтобы таблицы не
+пересекались с таблицами src/.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import AsyncGenerator, Iterator, List
+from unittest import mock
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+
+APP_DB_PATH = os.path.join(tempfile.gettempdir(), "news_api_test_app.db")
+
+# Settings приложения читаются при импорте; окружение src/ не трогаем
+with mock.patch.dict(os.environ, {"DATABASE_URL": f"sqlite+aiosqlite:///{APP_DB_PATH}", "DATABASE_REPLICA_URLS": ""}):
+    import app.models  # noqa: F401
+    from app.db.session import Base, engine
+    from app.main import app as layered_app
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw) -> str:
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw) -> str:
+    return "CHAR(32)"
+
+
+@contextmanager
+def statements() -> Iterator[List[str]]:
+    """Глаголы SQL-запросов (SELECT/INSERT/...) к движку app/ внутри блока."""
+    log: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield log
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def transactions() -> Iterator[dict]:
+    """Сколько раз движок app/ зафиксировал и откатил транзакцию внутри блока."""
+    counts = {"commit": 0, "rollback": 0}
+
+    def on_commit(conn):
+        counts["commit"] += 1
+
+    def on_rollback(conn):
+        counts["rollback"] += 1
+
+    event.listen(engine.sync_engine, "commit", on_commit)
+    event.listen(engine.sync_engine, "rollback", on_rollback)
+    try:
+        yield counts
+    finally:
+        event.remove(engine.sync_engine, "commit", on_commit)
+        event.remove(engine.sync_engine, "rollback", on_rollback)
+
+
+@pytest_asyncio.fixture
+async def app_client() -> AsyncGenerator[AsyncClient, None]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncClient(transport=ASGITransport(app=layered_app), base_url="http://test") as ac:
+        yield ac
+    await engine.dispose()
+
+
+async def create_author(client: AsyncClient, email: str = "author@example.com") -> dict:
+    response = await client.post("/api/v1/users/", json={"name": "Author", "email": email, "is_verified_author": True})
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_create_user_is_one_insert(app_client):
+    with statements() as log:
+        response = await app_client.post("/api/v1/users/", json={"name": "User", "email": "user@example.com"})
+
+    assert response.status_code == 201
+    # id и registered_at пришли из RETURNING, без refresh
+    assert response.json()["registered_at"]
+    assert log == ["INSERT"]
+    assert response.headers["X-SQL-Statements"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_create_news_writes_once(app_client):
+    author = await create_author(app_client)
+
+    with statements() as log:
+        response = await app_client.post(
+            "/api/v1/news/", json={"title": "Title", "content": {"text": "body"}, "author_id": author["id"]}
+        )
+
+    assert response.status_code == 201
+    assert response.json()["author"]["id"] == author["id"]
+    # Проверка автора и одна запись; автор ответа — уже загруженный объект
+    assert log == ["SELECT", "INSERT"]
+    assert response.headers["X-SQL-Statements"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_update_news_writes_once(app_client):
+    author = await create_author(app_client)
+    news = (
+        await app_client.post("/api/v1/news/", json={"title": "Title", "content": {"text": "body"}, "author_id": author["id"]})
+    ).json()
+
+    with statements() as log:
+        response = await app_client.patch(f"/api/v1/news/{news['id']}", json={"title": "New title"})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "New title"
+    assert response.json()["published_at"] == news["published_at"]
+    assert log == ["SELECT", "UPDATE"]
+    assert response.headers["X-SQL-Statements"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_create_comment_looks_up_once_and_commits_once(app_client):
+    author = await create_author(app_client)
+    news = (
+        await app_client.post("/api/v1/news/", json={"title": "Title", "content": {"text": "body"}, "author_id": author["id"]})
+    ).json()
+
+    with statements() as log, transactions() as tx:
+        response = await app_client.post(
+            "/api/v1/comments/", json={"text": "text", "author_id": author["id"], "news_id": news["id"]}
+        )
+
+    assert response.status_code == 201
+    assert response.json()["author"]["id"] == author["id"]
+    assert response.json()["news"]["title"] == "Title"
+    # Автор и новость одним get_author_and_news, затем одна запись
+    assert log == ["SELECT", "INSERT"]
+    assert tx == {"commit": 1, "rollback": 0}
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_rolls_back_and_returns_400(app_client):
+    await create_author(app_client, "same@example.com")
+
+    with statements() as log, transactions() as tx:
+        response = await app_client.post("/api/v1/users/", json={"name": "Twin", "email": "same@example.com"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User with this email already exists"
+    # Уникальность проверяет индекс: без предварительного SELECT, транзакция откатана
+    assert log == ["INSERT"]
+    assert tx == {"commit": 0, "rollback": 1}
+
+    users = await app_client.get("/api/v1/users/")
+    assert [user["email"] for user in users.json()] == ["same@example.com"]
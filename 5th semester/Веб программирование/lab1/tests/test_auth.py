@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+from passlib.hash import argon2
+from sqlalchemy import select
+
+from src.database import SessionLocal
+from src.models.user import User
+from src.services.auth_service import AuthService, pwd_context
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(client):
+    response = await client.post("/auth/register", json={"name": "a", "email": "a@example.com", "password": "secret"})
+    assert response.status_code == 201
+
+    # Пользователь, зарегистрированный до смены параметров Argon2
+    outdated_hash = argon2.using(time_cost=1, memory_cost=8, parallelism=1).hash("secret")
+    async with SessionLocal() as db:
+        user = (await db.execute(select(User).where(User.email == "a@example.com"))).scalar_one()
+        user.password_hash = outdated_hash
+        await db.commit()
+
+    response = await client.post("/auth/login", json={"email": "a@example.com", "password": "secret"})
+    assert response.status_code == 200
+
+    async with SessionLocal() as db:
+        stored_hash = (await db.execute(select(User.password_hash).where(User.email == "a@example.com"))).scalar_one()
+    assert stored_hash != outdated_hash
+    assert not pwd_context.needs_update(stored_hash)
+
+
+async def register(client, email: str = "a@example.com") -> dict:
+    response = await client.post("/auth/register", json={"name": "a", "email": email, "password": "secret"})
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotates_once(client, redis_cache):
+    tokens = await register(client)
+
+    response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    rotated = response.json()
+
+    # Старый токен уже заменён: повторное использование отклоняется
+    reused = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Invalid refresh token"
+
+    sessions = await client.get("/auth/sessions", headers={"Authorization": f"Bearer {rotated['access_token']}"})
+    assert [session["token_prefix"] for session in sessions.json()] == [
+        AuthService.session_id(rotated["refresh_token"])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refresh_of_one_token_succeeds_once(client, redis_cache):
+    tokens = await register(client)
+
+    responses = await asyncio.gather(
+        *(client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}) for _ in range(2))
+    )
+
+    assert sorted(response.status_code for response in responses) == [200, 401]
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_expired_session(client, redis_cache):
+    tokens = await register(client)
+    user_id = int(AuthService.decode_token(tokens["refresh_token"])["sub"])
+    # JWT ещё действителен, но сессия в Redis истекла
+    await redis_cache.client.zadd(
+        f"sessions:{user_id}:expiry", {AuthService.session_id(tokens["refresh_token"]): time.time() - 1}
+    )
+
+    response = await client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 401
+    assert await redis_cache.list_sessions(user_id) == []
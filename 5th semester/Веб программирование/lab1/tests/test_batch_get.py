@@ -0,0 +1,40 @@
+import pytest
+
+from src.database import SessionLocal
+from src.models.comment import Comment
+from src.models.news import News
+
+from conftest import create_user
+
+
+@pytest.mark.asyncio
+async def test_batch_get_keeps_order_and_loads_misses_in_one_query(client, count_queries):
+    author = await create_user("author@example.com")
+    async with SessionLocal() as db:
+        news = [News(title=f"t{i}", content={"text": "body"}, author_id=author.id) for i in range(3)]
+        db.add_all(news)
+        await db.flush()
+        comments = [Comment(text=f"c{i}", news_id=news[0].id, author_id=author.id) for i in range(2)]
+        db.add_all(comments)
+        await db.commit()
+
+    ids = [news[2].id, 999, news[0].id, news[2].id]
+    with count_queries() as queries:
+        response = await client.get("/news/", params={"ids": ",".join(map(str, ids))})
+    assert response.status_code == 200
+    # Несуществующий id пропущен, повтор схлопнут, порядок — как в запросе
+    assert [n["title"] for n in response.json()] == ["t2", "t0"]
+    assert queries.on("news") == ["SELECT"]
+
+    response = await client.get("/comments/", params={"ids": f"{comments[1].id},{comments[0].id}"})
+    assert [c["text"] for c in response.json()] == ["c1", "c0"]
+
+    response = await client.get("/users/", params={"ids": str(author.id)})
+    assert [u["email"] for u in response.json()] == ["author@example.com"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ids", ["", "1,x", ",".join(str(i) for i in range(101))])
+async def test_batch_get_rejects_invalid_ids(client, ids):
+    response = await client.get("/news/", params={"ids": ids})
+    assert response.status_code == 400
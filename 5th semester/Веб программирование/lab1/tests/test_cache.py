@@ -0,0 +1,246 @@
+"""
+AsyncCacheService поверх fakeredis: L1 и его инвалидация между воркерами,
+защита от cache stampede (get_or_load), пакетное чтение (get_many), поколения
+страниц списка новостей, индекс сессий пользователя.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.database import SessionLocal
+from src.schemas.news import NewsCreate, NewsUpdate
+from src.services.cache import INVALIDATION_CHANNEL
+from src.services.local_cache import LocalCache
+from src.services import news_service
+from src.services.news_service import NewsService
+
+from conftest import create_user, fake_cache
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "условие не выполнилось"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_delete_evicts_l1_in_every_worker(redis_server):
+    # Два воркера: у каждого свой L1, Redis общий
+    worker_a = fake_cache(redis_server, LocalCache(100, 60))
+    worker_b = fake_cache(redis_server, LocalCache(100, 60))
+    listener = asyncio.create_task(worker_b.listen_invalidations())
+    try:
+        # Ждём подписку: сообщения, опубликованные до неё, не доставляются
+        while (await worker_a.client.pubsub_numsub(INVALIDATION_CHANNEL))[0][1] == 0:
+            await asyncio.sleep(0.01)
+
+        await worker_a.set_tiered("news:1", {"title": "old"})
+        assert await worker_b.get_tiered("news:1") == {"title": "old"}
+        assert worker_b.local.get("news:1") is not None
+
+        await worker_a.delete_news(1)
+
+        assert worker_a.local.get("news:1") is None
+        await wait_for(lambda: worker_b.local.get("news:1") is None)
+        assert await worker_b.get_tiered("news:1") is None
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+
+
+class CountingLoader:
+    """Загрузчик из «БД»: считает вызовы и отвечает с задержкой, чтобы запросы успели совпасть."""
+
+    def __init__(self, value=None, error: Exception = None, delay: float = 0.05) -> None:
+        self.value = value
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once(redis_cache):
+    loader = CountingLoader({"id": 1, "title": "Title"})
+
+    results = await asyncio.gather(*(redis_cache.get_news(1, loader) for _ in range(50)))
+
+    assert loader.calls == 1
+    assert results == [{"id": 1, "title": "Title"}] * 50
+    assert redis_cache.stats()["stampede"]["coalesced"] == 49
+    assert await redis_cache.client.get("lock:news:1") is None
+
+
+@pytest.mark.asyncio
+async def test_waits_for_lock_holder_and_reads_its_value(redis_server, redis_cache):
+    # Значение пересчитывает другой процесс: блокировка его, а не наша
+    other = fake_cache(redis_server)
+    await other.client.set("lock:news:1", "other-worker")
+    loader = CountingLoader({"title": "own"})
+
+    reader = asyncio.create_task(redis_cache.get_news(1, loader))
+    await wait_for(lambda: redis_cache.lock_waits == 1)
+    await other.set("news:1", {"v": {"title": "from other"}, "d": 0.01, "e": time.time() + 60}, 60)
+
+    assert await reader == {"title": "from other"}
+    assert loader.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_loader_error_reaches_waiters_and_frees_lock(redis_cache):
+    loader = CountingLoader(error=RuntimeError("db down"))
+
+    results = await asyncio.gather(*(redis_cache.get_news(1, loader) for _ in range(10)), return_exceptions=True)
+
+    assert loader.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await redis_cache.client.get("lock:news:1") is None
+    # Следующий запрос сразу пересчитывает сам, без ожидания чужой блокировки
+    assert await redis_cache.get_news(1, CountingLoader({"title": "ok"})) == {"title": "ok"}
+    assert redis_cache.lock_waits == 0
+
+
+async def cached_pages(service: NewsService, count_queries) -> tuple:
+    """Первая страница через list и list_json; второй вызов каждого должен прийти из Redis."""
+    await service.list(0, 10)
+    await service.list_json(0, 10)
+    with count_queries() as queries:
+        page = await service.list(0, 10)
+        raw = await service.list_json(0, 10)
+    assert queries.on("news") == []
+    return page, json.loads(raw["body"])
+
+
+async def fresh_pages(service: NewsService, count_queries) -> tuple:
+    """Страница после записи: обе формы заново читаются из БД."""
+    with count_queries() as queries:
+        page = await service.list(0, 10)
+        raw = await service.list_json(0, 10)
+    assert queries.on("news") == ["SELECT", "SELECT"]
+    return page, json.loads(raw["body"])
+
+
+@pytest.mark.asyncio
+async def test_news_writes_move_list_to_next_generation(redis_cache, count_queries, monkeypatch):
+    # Без брокера постановка уведомления ждёт повторных подключений Celery
+    monkeypatch.setattr(news_service.notify_new_news, "delay", lambda news_id: None)
+    author = await create_user("author@example.com")
+    async with SessionLocal() as db:
+        service = NewsService(db, redis_cache)
+        first = await service.create(NewsCreate(title="First", content={"text": "a"}, author_id=author.id))
+        await cached_pages(service, count_queries)
+
+        second = await service.create(NewsCreate(title="Second", content={"text": "b"}, author_id=author.id))
+        for page in await fresh_pages(service, count_queries):
+            assert {news["id"] for news in page} == {first.id, second.id}
+
+        await cached_pages(service, count_queries)
+        await service.update(second, NewsUpdate(title="Second, edited"))
+        for page in await fresh_pages(service, count_queries):
+            assert "Second, edited" in [news["title"] for news in page]
+
+        await cached_pages(service, count_queries)
+        await service.delete(first)
+        for page in await fresh_pages(service, count_queries):
+            assert [news["id"] for news in page] == [second.id]
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_prunes_expired_from_index(redis_cache):
+    await redis_cache.set_session(1, "live", {"user_agent": "a"})
+    await redis_cache.set_session(1, "stale", {"user_agent": "b"})
+    # Истечение задаёт оценка в sorted set: сдвигаем её в прошлое
+    await redis_cache.client.zadd("sessions:1:expiry", {"stale": time.time() - 1})
+
+    sessions = await redis_cache.list_sessions(1)
+
+    assert [session["token_prefix"] for session in sessions] == ["live"]
+    assert await redis_cache.client.zrange("sessions:1:expiry", 0, -1) == ["live"]
+    assert await redis_cache.client.hkeys("sessions:1") == ["live"]
+    assert await redis_cache.get_session(1, "stale") is None
+
+
+@pytest.mark.asyncio
+async def test_delete_sessions_for_user_removes_both_keys(redis_cache):
+    await redis_cache.set_session(1, "first", {"user_agent": "a"})
+    await redis_cache.set_session(1, "second", {"user_agent": "b"})
+    await redis_cache.set_session(2, "other", {"user_agent": "c"})
+
+    assert await redis_cache.delete_sessions_for_user(1) == 2
+
+    assert await redis_cache.client.exists("sessions:1", "sessions:1:expiry") == 0
+    assert await redis_cache.list_sessions(1) == []
+    assert [session["token_prefix"] for session in await redis_cache.list_sessions(2)] == ["other"]
+
+
+class CountingBatchLoader:
+    """Пакетный загрузчик: запоминает, какие id у него запросили."""
+
+    def __init__(self, rows: dict) -> None:
+        self.rows = rows
+        self.requested = []
+
+    async def __call__(self, ids):
+        self.requested.append(list(ids))
+        return {item_id: self.rows[item_id] for item_id in ids if item_id in self.rows}
+
+
+def count_pipelines(cache, monkeypatch) -> list:
+    """Пайплайны, открытые клиентом кэша: в списке — число команд каждого."""
+    opened = []
+    pipeline = cache.client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counting_execute(*a, **kw):
+            opened.append(len(pipe.command_stack))
+            return await execute(*a, **kw)
+
+        pipe.execute = counting_execute
+        return pipe
+
+    monkeypatch.setattr(cache.client, "pipeline", counting_pipeline)
+    return opened
+
+
+@pytest.mark.asyncio
+async def test_get_many_loads_only_misses_and_keeps_order(redis_cache, monkeypatch):
+    rows = {i: {"id": i, "title": f"n{i}"} for i in (1, 2, 3)}
+    for i in (1, 3):
+        await redis_cache.set(f"news:{i}", {"v": rows[i], "d": 0.01, "e": time.time() + 60}, 60)
+    loader = CountingBatchLoader(rows)
+    pipelines = count_pipelines(redis_cache, monkeypatch)
+
+    found = await redis_cache.get_news_many([3, 2, 1], loader)
+
+    assert loader.requested == [[2]]
+    assert list(found.items()) == [(3, rows[3]), (2, rows[2]), (1, rows[1])]
+    # Дозапись промахов — один пайплайн с одним SETEX на каждый загруженный id
+    assert pipelines == [1]
+    assert await redis_cache.client.ttl("news:2") > 0
+    assert await redis_cache.get_news_many([1, 2, 3], CountingBatchLoader({})) == rows
+
+
+@pytest.mark.asyncio
+async def test_get_many_treats_undecodable_entries_as_misses(redis_cache):
+    rows = {i: {"id": i, "title": f"n{i}"} for i in (1, 2)}
+    await redis_cache.client.set("news:1", "{not json")
+    await redis_cache.client.set("news:2", json.dumps({"id": 2}))  # без конверта get_or_load
+    loader = CountingBatchLoader(rows)
+
+    assert await redis_cache.get_news_many([1, 2], loader) == rows
+    assert loader.requested == [[1, 2]]
+    # Повреждённые записи перезаписаны из «БД»
+    assert json.loads(await redis_cache.client.get("news:1"))["v"] == rows[1]
+    assert await redis_cache.get_news_many([1, 2], CountingBatchLoader({})) == rows
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database import SessionLocal
+from src.models.comment import Comment
+from src.models.news import News
+
+from conftest import auth_headers, create_user
+
+
+async def create_news(author_id: int, title: str = "Title") -> News:
+    async with SessionLocal() as db:
+        news = News(title=title, content={"text": "body"}, author_id=author_id)
+        db.add(news)
+        await db.commit()
+        return news
+
+
+async def feed_item(client, news_id: int) -> dict:
+    response = await client.get("/news/feed")
+    return next(item for item in response.json() if item["id"] == news_id)
+
+
+@pytest.mark.asyncio
+async def test_comment_counters_follow_create_and_delete(client):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id)
+
+    created = []
+    for i in range(3):
+        response = await client.post("/comments/", json={"text": f"c{i}", "news_id": news.id}, headers=auth_headers(author))
+        created.append(response.json())
+    item = await feed_item(client, news.id)
+    assert item["comments_count"] == 3
+    assert item["last_comment_at"] == created[-1]["publication_date"]
+
+    await client.delete(f"/comments/{created[-1]['id']}", headers=auth_headers(author))
+    item = await feed_item(client, news.id)
+    assert item["comments_count"] == 2
+    assert item["last_comment_at"] == created[1]["publication_date"]
+
+    for comment in created[:2]:
+        await client.delete(f"/comments/{comment['id']}", headers=auth_headers(author))
+    item = await feed_item(client, news.id)
+    assert (item["comments_count"], item["last_comment_at"]) == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_deleting_newest_comment_restores_latest_date_not_latest_id(client):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id)
+    now = datetime.utcnow().replace(microsecond=0)
+    # Порядок id не совпадает с порядком дат (например, импорт задним числом)
+    dates = [now - timedelta(hours=1), now - timedelta(hours=2), now]
+    async with SessionLocal() as db:
+        comments = [Comment(text=f"c{i}", news_id=news.id, author_id=author.id, publication_date=d) for i, d in enumerate(dates)]
+        for comment in comments:
+            db.add(comment)
+            await db.flush()
+        await db.commit()
+
+    await client.delete(f"/comments/{comments[-1].id}", headers=auth_headers(author))
+    item = await feed_item(client, news.id)
+    assert item["comments_count"] == 2
+    assert item["last_comment_at"] == dates[0].isoformat()
+
+
+@pytest.mark.asyncio
+async def test_feed_page_is_one_query(client, count_queries):
+    author = await create_user("author@example.com")
+    for i in range(5):
+        news = await create_news(author.id, f"n{i}")
+        await client.post("/comments/", json={"text": "c", "news_id": news.id}, headers=auth_headers(author))
+
+    with count_queries() as queries:
+        response = await client.get("/news/feed", params={"limit": 3})
+    assert [item["comments_count"] for item in response.json()] == [1, 1, 1]
+    assert queries.on("news") == ["SELECT"]
+    assert queries.on("comments") == []
+
+    response = await client.get("/news/feed", params={"limit": 3, "cursor": response.headers["X-Next-Cursor"]})
+    assert [item["title"] for item in response.json()] == ["n1", "n0"]
+
+
+@pytest.mark.asyncio
+async def test_comments_by_news_are_paginated(client):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id)
+    for i in range(5):
+        await client.post("/comments/", json={"text": f"c{i}", "news_id": news.id}, headers=auth_headers(author))
+
+    response = await client.get(f"/comments/news/{news.id}", params={"limit": 3})
+    assert [c["text"] for c in response.json()] == ["c0", "c1", "c2"]
+    response = await client.get(
+        f"/comments/news/{news.id}", params={"limit": 3, "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert [c["text"] for c in response.json()] == ["c3", "c4"]
+    assert "X-Next-Cursor" not in response.headers
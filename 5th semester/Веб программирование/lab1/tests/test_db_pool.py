@@ -0,0 +1,18 @@
+import pytest
+
+from src.database import InstrumentedPool, SessionLocal, engine
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_in_use_connections_and_checkout_wait(client):
+    assert isinstance(engine.pool, InstrumentedPool)
+
+    async with SessionLocal() as db:
+        await db.connection()
+        assert engine.pool.stats()["in_use"] == 1
+
+    response = await client.get("/metrics")
+    pool = response.json()["db_pool"]
+    assert pool["in_use"] == 0
+    assert pool["checkouts"] >= 1
+    assert pool["wait_max_ms"] >= pool["wait_avg_ms"] >= 0
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from src.database import SessionLocal
+from src.models.comment import Comment
+from src.models.news import News
+from src.models.user import UserRole
+
+from conftest import auth_headers, create_user
+
+
+@pytest.mark.asyncio
+async def test_news_and_comments_export_ndjson(client):
+    admin = await create_user("admin@example.com", UserRole.ADMIN)
+    async with SessionLocal() as db:
+        news = [News(title=f"t{i}", content={"text": f"body {i}"}, author_id=admin.id) for i in range(5)]
+        db.add_all(news)
+        await db.flush()
+        db.add_all(Comment(text=f"c{i}", news_id=news[0].id, author_id=admin.id) for i in range(3))
+        await db.commit()
+
+    # fetch_size меньше числа строк: выгрузка идёт несколькими порциями курсора
+    response = await client.get("/news/export", params={"fetch_size": 2}, headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"t{i}" for i in range(5)]
+    assert rows[0]["content"] == {"text": "body 0"}
+
+    response = await client.get("/comments/export", headers=auth_headers(admin))
+    assert [json.loads(line)["text"] for line in response.text.splitlines()] == ["c0", "c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_export_requires_admin(client):
+    author = await create_user("author@example.com")
+    response = await client.get("/news/export", headers=auth_headers(author))
+    assert response.status_code == 403
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src import database
+from src.database import Base, ReplicaSet, SessionLocal, on_replica
+from src.models.news import News
+from src.services.news_service import NewsService
+
+from conftest import create_user
+
+REPLICA_DB_PATH = os.path.join(tempfile.gettempdir(), "news_api_test_replica.db")
+
+
+@pytest_asyncio.fixture
+async def replica(monkeypatch):
+    """Отдельная SQLite-БД в роли реплики: видно, куда ушёл запрос."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{REPLICA_DB_PATH}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    replicas = ReplicaSet([engine])
+    monkeypatch.setattr(database, "replicas", replicas)
+    yield replicas
+    await engine.dispose()
+
+
+async def count_news(db, replica: bool) -> int:
+    stmt = select(func.count()).select_from(News)
+    return await db.scalar(on_replica(stmt) if replica else stmt)
+
+
+@pytest.mark.asyncio
+async def test_marked_reads_use_replica_until_first_write(replica):
+    author = await create_user("author@example.com")
+
+    async with SessionLocal() as db:
+        assert await count_news(db, replica=False) == 0
+        db.add(News(title="Title", content={"text": "body"}, author_id=author.id))
+        await db.commit()
+        # Реплика пуста, основная БД уже нет — но после записи сессия читает только основную
+        assert await count_news(db, replica=True) == 1
+
+    async with SessionLocal() as db:
+        assert await count_news(db, replica=True) == 0
+        assert await count_news(db, replica=False) == 1
+        # Сервисы помечают чтения списка и новости по id сами
+        assert await NewsService(db, None).feed() == []
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary(replica):
+    author = await create_user("author@example.com")
+    async with SessionLocal() as db:
+        db.add(News(title="Title", content={"text": "body"}, author_id=author.id))
+        await db.commit()
+
+    broken = create_async_engine("sqlite+aiosqlite:///" + os.path.join(REPLICA_DB_PATH, "missing", "db.sqlite"))
+    replica.engines.append(broken)
+    await replica.check()
+    assert replica.stats()["healthy"] == 1
+
+    # Круговой выбор пропускает недоступную реплику
+    for _ in range(3):
+        assert replica.choose() is replica.engines[0]
+
+    replica.mark_down(0)
+    async with SessionLocal() as db:
+        assert await count_news(db, replica=True) == 1
+    assert replica.stats()["fallbacks"] == 1
+    await broken.dispose()
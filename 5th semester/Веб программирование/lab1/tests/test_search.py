@@ -0,0 +1,57 @@
+import pytest
+
+from src.database import SessionLocal
+from src.models.news import News
+
+from conftest import auth_headers, create_user
+
+
+async def create_news(author_id: int, title: str, text: str) -> News:
+    async with SessionLocal() as db:
+        news = News(title=title, content={"text": text}, author_id=author_id)
+        db.add(news)
+        await db.commit()
+        return news
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_title_matches_first(client):
+    author = await create_user("author@example.com")
+    in_text = await create_news(author.id, "Погода", "Новый релиз python вышел вчера")
+    in_title = await create_news(author.id, "Релиз python 3.13", "Подробности внутри")
+    await create_news(author.id, "Спорт", "Матч перенесли")
+
+    response = await client.get("/news/search", params={"q": "python"})
+    assert response.status_code == 200
+    assert [n["id"] for n in response.json()] == [in_title.id, in_text.id]
+    assert response.json()[0]["rank"] > response.json()[1]["rank"]
+
+    # Операторы FTS5 в запросе не ломают поиск
+    response = await client.get("/news/search", params={"q": 'python" OR'})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_search_keyset_pages_and_follows_updates(client):
+    author = await create_user("author@example.com")
+    for i in range(5):
+        await create_news(author.id, f"Новость {i}", "курсор")
+
+    seen = []
+    params = {"q": "курсор", "limit": 2}
+    while True:
+        response = await client.get("/news/search", params=params)
+        seen += [n["id"] for n in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert sorted(seen) == sorted(set(seen)) and len(seen) == 5
+
+    news_id = seen[0]
+    response = await client.put(f"/news/{news_id}", json={"content": {"text": "другое"}}, headers=auth_headers(author))
+    assert response.status_code == 200
+    response = await client.get("/news/search", params={"q": "курсор"})
+    assert news_id not in [n["id"] for n in response.json()]
+
+    response = await client.get("/news/search", params={"q": "курсор", "cursor": "broken"})
+    assert response.status_code == 400
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from src.database import SessionLocal
+from src.models.user import User, UserRole
+from src.services.auth_service import pwd_context
+
+from conftest import auth_headers, create_user
+
+
+@pytest.mark.asyncio
+async def test_import_then_export_users(client):
+    admin = await create_user("admin@example.com", UserRole.ADMIN)
+    existing_hash = pwd_context.hash("migrated")
+    body = "\n".join([
+        json.dumps({"name": "Plain", "email": "plain@example.com", "password": "secret"}),
+        json.dumps({"name": "Migrated", "email": "migrated@example.com", "password_hash": existing_hash}),
+        json.dumps({"name": "Author", "email": "author@example.com", "role": "author", "is_verified_author": True}),
+        json.dumps({"name": "Duplicate", "email": "admin@example.com"}),
+        "not json",
+        json.dumps({"name": "No email"}),
+    ])
+
+    response = await client.post("/users/import", content=body, headers=auth_headers(admin))
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["skipped"], report["rejected"]) == (3, 1, 2)
+    assert [error.split(":")[0] for error in report["errors"]] == ["строка 5", "строка 6"]
+
+    async with SessionLocal() as db:
+        users = {u.email: u for u in (await db.execute(select(User))).scalars()}
+    assert pwd_context.verify("secret", users["plain@example.com"].password_hash)
+    assert users["migrated@example.com"].password_hash == existing_hash
+    assert users["author@example.com"].role == UserRole.AUTHOR
+
+    response = await client.get("/users/export", params={"format": "csv"}, headers=auth_headers(admin))
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,name,email,role,is_verified_author,avatar,registration_date"
+    assert len(lines) == 1 + 4
+
+    # Выгрузка CSV загружается обратно: все email уже есть
+    response = await client.post("/users/import", params={"format": "csv"}, content=response.text, headers=auth_headers(admin))
+    assert response.json()["skipped"] == 4
+
+
+@pytest.mark.asyncio
+async def test_import_requires_admin(client):
+    author = await create_user("author@example.com")
+    response = await client.post("/users/import", content="{}", headers=auth_headers(author))
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_non_utf8_line_and_continues(client):
+    admin = await create_user("admin@example.com", UserRole.ADMIN)
+    body = b"\n".join([
+        json.dumps({"name": "First", "email": "first@example.com"}).encode(),
+        json.dumps({"name": "Кириллица", "email": "cp1251@example.com"}, ensure_ascii=False).encode("cp1251"),
+        json.dumps({"name": "Last", "email": "last@example.com"}).encode(),
+    ])
+
+    response = await client.post("/users/import", content=body, headers=auth_headers(admin))
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["skipped"], report["rejected"]) == (2, 0, 1)
+    assert report["errors"] == ["строка 2: не UTF-8"]
@@ -0,0 +1,99 @@
+"""
+Сколько SQL-запросов стоит изменение новости или комментария.
+
+Зависимости get_news_with_permission / get_comment_with_permission загружают
+строку один раз, сервисы работают с этим же объектом — повторного SELECT нет.
+"""
+import pytest
+
+from src.database import SessionLocal
+from src.models.comment import Comment
+from src.models.news import News
+
+from conftest import auth_headers, create_user
+
+
+async def create_news(author_id: int, comments: int = 0) -> News:
+    async with SessionLocal() as db:
+        news = News(title="Title", content={"text": "body"}, author_id=author_id)
+        db.add(news)
+        await db.flush()
+        db.add_all(Comment(text=f"c{i}", news_id=news.id, author_id=author_id) for i in range(comments))
+        await db.commit()
+        return news
+
+
+async def create_comment(news_id: int, author_id: int) -> Comment:
+    async with SessionLocal() as db:
+        comment = Comment(text="text", news_id=news_id, author_id=author_id)
+        db.add(comment)
+        await db.commit()
+        return comment
+
+
+@pytest.mark.asyncio
+async def test_update_news_selects_once(client, count_queries):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id)
+
+    with count_queries() as queries:
+        response = await client.put(f"/news/{news.id}", json={"title": "New"}, headers=auth_headers(author))
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "New"
+    assert queries.on("news") == ["SELECT", "UPDATE"]
+
+
+@pytest.mark.asyncio
+async def test_delete_news_removes_comments_in_one_statement(client, count_queries):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id, comments=5)
+
+    with count_queries() as queries:
+        response = await client.delete(f"/news/{news.id}", headers=auth_headers(author))
+
+    assert response.status_code == 204
+    assert queries.on("news") == ["SELECT", "DELETE"]
+    assert queries.on("comments") == ["DELETE"]
+
+
+@pytest.mark.asyncio
+async def test_update_foreign_news_is_forbidden_without_write(client, count_queries):
+    author = await create_user("author@example.com")
+    other = await create_user("other@example.com")
+    news = await create_news(author.id)
+
+    with count_queries() as queries:
+        response = await client.put(f"/news/{news.id}", json={"title": "New"}, headers=auth_headers(other))
+
+    assert response.status_code == 403
+    assert queries.on("news") == ["SELECT"]
+
+
+@pytest.mark.asyncio
+async def test_update_comment_selects_once(client, count_queries):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id)
+    comment = await create_comment(news.id, author.id)
+
+    with count_queries() as queries:
+        response = await client.put(f"/comments/{comment.id}", json={"text": "edited"}, headers=auth_headers(author))
+
+    assert response.status_code == 200
+    assert response.json()["text"] == "edited"
+    assert queries.on("comments") == ["SELECT", "UPDATE"]
+
+
+@pytest.mark.asyncio
+async def test_delete_comment_selects_once(client, count_queries):
+    author = await create_user("author@example.com")
+    news = await create_news(author.id)
+    comment = await create_comment(news.id, author.id)
+
+    with count_queries() as queries:
+        response = await client.delete(f"/comments/{comment.id}", headers=auth_headers(author))
+
+    assert response.status_code == 204
+    # UPDATE — пересчёт счётчиков новости (подзапрос к comments за last_comment_at)
+    assert queries.on("comments") == ["SELECT", "DELETE", "UPDATE"]
+    assert queries.on("news") == ["UPDATE"]
@@ -0,0 +1,147 @@
+"""
+Калибровка параметров Argon2id под конкретный хост.
+
+Подбирает самые стойкие ARGON2_MEMORY_COST / ARGON2_TIME_COST, при которых
+проверка пароля укладывается в целевое время, когда одновременно выполняется
+N проверок (N одновременных логинов). Сначала выбирается память (главная
+защита от GPU/ASIC), затем, в оставшемся запасе времени, число итераций.
+
+Запуск (внутри контейнера backend):
+
+    python -m app.core.argon2_calibration --target-ms 50 --concurrency 4
+
+Результат печатается в формате .env. Менять параметры можно в любой момент:
+существующие хэши пересчитываются с новыми параметрами при следующем успешном
+входе пользователя (см. UserService.authenticate_user).
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.hash import argon2
+
+# Нижняя граница памяти — минимум OWASP для Argon2id (19 MiB)
+MIN_MEMORY_COST = 19456
+SAMPLE_PASSWORD = "Calibration-Password-123!"
+
+
+def measure_verify_ms(
+    time_cost: int, memory_cost: int, parallelism: int, concurrency: int, rounds: int
+) -> float:
+    """
+    Медианное время одной проверки пароля (мс), когда concurrency проверок
+    выполняются одновременно. argon2-cffi отпускает GIL, поэтому потоки
+    конкурируют за ядра так же, как конкурентные логины.
+    """
+    hasher = argon2.using(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    password_hash = hasher.hash(SAMPLE_PASSWORD)
+
+    def verify_once(_) -> float:
+        started = time.perf_counter()
+        hasher.verify(SAMPLE_PASSWORD, password_hash)
+        return (time.perf_counter() - started) * 1000
+
+    samples = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(rounds):
+            samples.extend(pool.map(verify_once, range(concurrency)))
+    return statistics.median(samples)
+
+
+def calibrate(
+    target_ms: float,
+    concurrency: int,
+    parallelism: int,
+    max_memory_cost: int,
+    max_time_cost: int,
+    rounds: int,
+) -> dict:
+    """Возвращает подобранные параметры и измеренное время проверки."""
+
+    def measure(time_cost: int, memory_cost: int) -> float:
+        elapsed = measure_verify_ms(
+            time_cost, memory_cost, parallelism, concurrency, rounds
+        )
+        print(
+            f"  t={time_cost} m={memory_cost} KiB p={parallelism}: {elapsed:.1f} ms"
+        )
+        return elapsed
+
+    # 1. Память: максимум, при котором одна итерация укладывается в цель
+    memory_cost = max_memory_cost
+    elapsed = measure(1, memory_cost)
+    while elapsed > target_ms and memory_cost > MIN_MEMORY_COST:
+        memory_cost = max(MIN_MEMORY_COST, memory_cost // 2)
+        elapsed = measure(1, memory_cost)
+
+    # 2. Итерации: добавляем, пока остаёмся в пределах цели
+    time_cost = 1
+    while elapsed <= target_ms and time_cost < max_time_cost:
+        candidate = measure(time_cost + 1, memory_cost)
+        if candidate > target_ms:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+
+    return {
+        "time_cost": time_cost,
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+        "verify_ms": elapsed,
+        "within_target": elapsed <= target_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=50.0, help="целевое время проверки, мс"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="одновременных проверок"
+    )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=int(os.getenv("ARGON2_PARALLELISM", "1")),
+        help="потоков Argon2 на один хэш",
+    )
+    parser.add_argument(
+        "--max-memory-cost", type=int, default=262144, help="верхняя граница, KiB"
+    )
+    parser.add_argument("--max-time-cost", type=int, default=10)
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="серий замеров на кандидата"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"Калибровка Argon2id: цель {args.target_ms} мс при {args.concurrency} одновременных проверках"
+    )
+    result = calibrate(
+        args.target_ms,
+        args.concurrency,
+        args.parallelism,
+        args.max_memory_cost,
+        args.max_time_cost,
+        args.rounds,
+    )
+    if not result["within_target"]:
+        print(
+            "Внимание: даже минимальные параметры не укладываются в цель — "
+            "уменьшите число одновременных логинов или увеличьте целевое время."
+        )
+    print(f"\n# Argon2id: ~{result['verify_ms']:.0f} ms на проверку")
+    print(f"ARGON2_TIME_COST={result['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={result['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={result['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
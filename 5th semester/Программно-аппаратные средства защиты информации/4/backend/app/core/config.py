@@ -12,6 +12,15 @@ class Settings(BaseSettings):
 
     # --- Database Settings ---
     DATABASE_URL: str
+    # Пул соединений на процесс uvicorn: всего к БД открывается
+    # до workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) соединений.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # ожидание свободного соединения, сек
+    DB_POOL_RECYCLE: int = 1800  # пересоздавать соединения старше, сек
+    DB_POOL_PRE_PING: bool = True
+    # Кэш подготовленных запросов asyncpg на соединение; 0 — за PgBouncer.
+    DB_STATEMENT_CACHE_SIZE: int = 100
 
     # --- Security & JWT Configuration ---
     # Схема хеширования паролей.
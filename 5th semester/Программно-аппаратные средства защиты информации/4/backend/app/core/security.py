@@ -31,6 +31,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Проверяет пароль и, если хеш создан с устаревшими параметрами, сразу
+    возвращает новый хеш: (верен ли пароль, новый хеш или None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Проверяет, создан ли хеш с устаревшими параметрами (ARGON2_* изменились
+    после калибровки) и его следует пересчитать.
+    """
+    return pwd_context.needs_update(hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     """
     Создает JWT access токен.
@@ -1,21 +1,88 @@
+import time
 from typing import AsyncGenerator
 
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL)
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений со счётчиками: сколько раз выдавалось соединение,
+    сколько запрос ждал выдачи и сколько раз не дождался за DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": (
+                round(self.wait_total / self.checkouts * 1000, 3)
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    # Кэш asyncpg и кэш подготовленных запросов диалекта SQLAlchemy
+    connect_args={
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
+)
 
 AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+def pool_stats() -> dict:
+    """
+    Снимок пула. engine.pool читается при каждом вызове: dispose() заменяет пул.
+    """
+    return engine.pool.stats()
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Зависимость FastAPI для получения сессии базы данных.
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 
 from app.api.v1_router import api_v1_router
 from app.core.config import settings
+from app.db.session import pool_stats
 
 # Безопасность: Отключаем Swagger и ReDoc в production-окружении.
 docs_url = "/docs" if settings.APP_ENV == "development" else None
@@ -24,3 +25,19 @@ def health_check():
     Эндпоинт для проверки работоспособности сервиса (Health Check).
     """
     return {"status": "ok", "environment": settings.APP_ENV}
+
+
+def db_pool_metrics():
+    """
+    Состояние пула соединений с БД в этом процессе: занятые и свободные
+    соединения, среднее и максимальное ожидание выдачи, таймауты.
+    """
+    return pool_stats()
+
+
+# Безопасность: метрики пула раскрывают нагрузку на сервис, поэтому, как и
+# документация, доступны только в development-окружении.
+if settings.APP_ENV == "development":
+    app.add_api_route(
+        "/metrics/db-pool", db_pool_metrics, methods=["GET"], tags=["Health Check"]
+    )
@@ -29,3 +29,8 @@ class UserRepository:
         await self.session.commit()
         await self.session.refresh(new_user)
         return new_user
+
+    async def update_password_hash(self, user: User, password_hash: str) -> None:
+        """Сохраняет пересчитанный хеш пароля пользователя."""
+        user.password_hash = password_hash
+        await self.session.commit()
@@ -1,8 +1,13 @@
 import structlog
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import (
+    create_access_token,
+    hash_password,
+    verify_and_update,
+)
 from app.db.models import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreateInternal, UserCreateRequest
@@ -46,9 +51,19 @@ class UserService:
         """Аутентифицирует пользователя и возвращает токен."""
         user = await self.repo.get_by_login(login)
 
+        # Argon2 занимает десятки миллисекунд CPU: проверка (и пересчёт хеша со
+        # старыми параметрами) идёт в пуле потоков, не блокируя event loop.
+        # Пароль известен только в момент входа — это единственная возможность
+        # пересчитать хеш с новыми параметрами без массовой миграции.
+        verified, new_hash = (
+            await run_in_threadpool(verify_and_update, password, user.password_hash)
+            if user
+            else (False, None)
+        )
+
         # Безопасность: Проверка пользователя и пароля выполняется в одной условной
         # конструкции. Это усложняет атаки по времени (timing attacks).
-        if not user or not verify_password(password, user.password_hash):
+        if not verified:
             log.warn("authentication_failed", reason="invalid_credentials", login=login)
             # Безопасность: Сообщение об ошибке должно быть общим, чтобы не дать
             # злоумышленнику понять, что именно неверно: логин или пароль.
@@ -60,8 +75,24 @@ class UserService:
 
         log.info("user_authenticated", user_id=str(user.id), login=user.login)
 
-        # Создаем JWT токен с информацией о пользователе.
+        # Создаем JWT токен с информацией о пользователе. До пересчёта хеша:
+        # после отката неудачного пересчёта атрибуты user уже не загружены.
         access_token = create_access_token(
             data={"sub": user.login, "user_id": str(user.id)}
         )
+
+        if new_hash:
+            await self._save_rehashed_password(user, new_hash)
+
         return {"access_token": access_token, "token_type": "bearer"}
+
+    async def _save_rehashed_password(self, user: User, new_hash: str) -> None:
+        """Сохраняет пересчитанный хеш пароля; ошибка не должна мешать входу."""
+        user_id = str(user.id)
+        try:
+            await self.repo.update_password_hash(user, new_hash)
+            log.info("password_rehashed", user_id=user_id)
+        except Exception as exc:
+            # Без отката сессия запроса остаётся в состоянии PendingRollbackError
+            await self.repo.session.rollback()
+            log.error("password_rehash_failed", user_id=user_id, error=str(exc))
@@ -0,0 +1,33 @@
+from app.core.argon2_calibration import MIN_MEMORY_COST, calibrate
+
+
+def test_calibrate_stays_within_target_and_bounds():
+    """С запасом по времени подбираются параметры внутри заданных границ."""
+    result = calibrate(
+        target_ms=1000.0,
+        concurrency=2,
+        parallelism=1,
+        max_memory_cost=1024,
+        max_time_cost=3,
+        rounds=1,
+    )
+    assert result["within_target"]
+    assert result["verify_ms"] <= 1000.0
+    assert result["memory_cost"] == 1024
+    assert 1 <= result["time_cost"] <= 3
+    assert result["parallelism"] == 1
+
+
+def test_calibrate_does_not_go_below_owasp_minimum():
+    """Недостижимая цель: память уменьшается только до минимума OWASP, итерация одна."""
+    result = calibrate(
+        target_ms=0.0,
+        concurrency=1,
+        parallelism=1,
+        max_memory_cost=MIN_MEMORY_COST * 2,
+        max_time_cost=3,
+        rounds=1,
+    )
+    assert not result["within_target"]
+    assert result["memory_cost"] == MIN_MEMORY_COST
+    assert result["time_cost"] == 1
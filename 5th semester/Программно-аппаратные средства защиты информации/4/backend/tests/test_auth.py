@@ -2,6 +2,7 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from jose import jwt
+from passlib.hash import argon2
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
@@ -13,6 +14,7 @@ from typing import AsyncGenerator
 
 from app.api.dependencies import get_db_session
 from app.core.config import settings
+from app.core.security import needs_rehash
 from app.db.models import Base
 from app.main import app
 
@@ -190,3 +192,37 @@ class TestAuth:
             "/api/v1/auth/login", json={"login": login, "password": password}
         )
         assert response.status_code == 401
+
+    async def test_rehash_on_login(self, async_client: AsyncClient):
+        """Хеш со старыми параметрами Argon2 пересчитывается при успешном входе."""
+        login = f"rehash_{self.short_uuid()}"
+        password = "TestPassword123!"
+        await async_client.post(
+            "/api/v1/auth/register", json={"login": login, "password": password}
+        )
+        # Имитируем пользователя, зарегистрированного до смены параметров
+        outdated_hash = argon2.using(time_cost=1, memory_cost=8, parallelism=1).hash(
+            password
+        )
+        engine = create_async_engine(TEST_DATABASE_URL)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("UPDATE users SET password_hash = :hash WHERE login = :login"),
+                {"hash": outdated_hash, "login": login},
+            )
+
+        response = await async_client.post(
+            "/api/v1/auth/login", json={"login": login, "password": password}
+        )
+        assert response.status_code == 200
+
+        async with engine.connect() as conn:
+            stored_hash = (
+                await conn.execute(
+                    text("SELECT password_hash FROM users WHERE login = :login"),
+                    {"login": login},
+                )
+            ).scalar_one()
+        await engine.dispose()
+        assert stored_hash != outdated_hash
+        assert not needs_rehash(stored_hash)
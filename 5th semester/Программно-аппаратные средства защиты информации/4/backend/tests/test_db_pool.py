@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.db.session import InstrumentedPool
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkouts_and_timeouts():
+    """Пул на одно соединение: второй запрос не дожидается выдачи за pool_timeout."""
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            stats = engine.pool.stats()
+            assert (stats["in_use"], stats["checkouts"]) == (1, 1)
+            assert stats["timeouts"] == 0
+
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        assert (stats["in_use"], stats["idle"]) == (0, 1)
+        assert (stats["checkouts"], stats["timeouts"]) == (2, 1)
+    finally:
+        await engine.dispose()